@@ -625,6 +625,27 @@ class IsVerifiedFilter(admin.SimpleListFilter):
             return queryset.filter(verified_at__isnull=True)
 
 
+class QualityScoreFilter(admin.SimpleListFilter):
+    title = "quality score"
+
+    parameter_name = "quality_score"
+
+    def lookups(self, request, model_admin):
+        return (
+            ("low", "Low (< 25)"),
+            ("medium", "Medium (25-29)"),
+            ("high", "High (30+)"),
+        )
+
+    def queryset(self, request, queryset):
+        if self.value() == "low":
+            return queryset.filter(quality_score__lt=25)
+        elif self.value() == "medium":
+            return queryset.filter(quality_score__gte=25, quality_score__lt=30)
+        elif self.value() == "high":
+            return queryset.filter(quality_score__gte=30)
+
+
 class CrawlSingleEventForm(forms.Form):
     """Form for crawling a single event asynchronously"""
 
@@ -651,10 +672,11 @@ class EventAdmin(CloneModelAdmin):
         "created_at",
     )
     list_display_links = ("eventstr",)
-    sortable_by = ("date_start", "verified_at", "created_at")
+    sortable_by = ("date_start", "entry_quality", "verified_at", "created_at")
     list_filter = (
         IsUpcomingFilter,
         "entry_quality",
+        QualityScoreFilter,
         IsVerifiedFilter,
         "created_by",
         ("organizer", RelatedDropdownFilter),
@@ -747,8 +769,16 @@ class EventAdmin(CloneModelAdmin):
         if obj.location:
             return f"{obj.location.city}, {obj.location.country}"
 
+    def get_queryset(self, request):
+        # locationstr shows the location of every row
+        return super().get_queryset(request).select_related("location")
+
     def entry_quality(self, obj):
-        rating = obj.get_quality_rating()
+        # Precomputed by the post_save signals (see EventChecker), so the
+        # changelist does not rate every row on render
+        rating = obj.quality_score
+        if rating is None:
+            return "-"
         if rating < 25:
             color = "rgba(244, 0, 0, 0.5)"
         elif rating < 30:
@@ -759,9 +789,12 @@ class EventAdmin(CloneModelAdmin):
         return format_html(
             f'<span style="background-color: {color};'
             f'padding:2px">'
-            f"{obj.get_quality_rating()}</span>"
+            f"{rating}</span>"
         )
 
+    entry_quality.short_description = "Entry quality"
+    entry_quality.admin_order_field = "quality_score"
+
     def public_url(self, obj):
         url = settings.FRONTEND_URL + "?" + urlencode({"event": obj.slug})
         return format_html(f'<a target="_blank" href="{url}">{url}</a>')
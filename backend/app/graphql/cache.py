@@ -0,0 +1,124 @@
+"""
+Versioned cache for GraphQL resolver results.
+
+Every cached entry is keyed by the current generation of the entity families
+it depends on (e.g. "events", "locations"). Invalidating a family bumps its
+generation counter, which makes all entries built from an older generation
+unreachable without touching the rest of the cache. The counters live in the
+configured Django cache, so they are shared between workers as long as the
+backend is (see CACHE_URL in settings).
+
+During bulk imports, wrap the work in ``deferred_invalidation()`` so that the
+hundreds of Event saves of a crawl run result in a single bump per family.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+EVENTS = "events"
+LOCATIONS = "locations"
+ORGANIZERS = "organizers"
+
+DEFAULT_TIMEOUT = 3600  # 1 hour
+
+# Inside deferred_invalidation(), flush pending bumps at most this often so
+# long crawl runs still publish their changes while they are running.
+DEBOUNCE_SECONDS = 300
+
+_state = threading.local()
+
+
+def _generation_key(family):
+    return f"graphql_cache:gen:{family}"
+
+
+def _new_generation():
+    """
+    Start value of a generation counter. Counters are ordinary cache entries
+    that the backend may cull even without a timeout (MAX_ENTRIES, Redis
+    eviction policies), so a recreated counter must not repeat an earlier
+    value, or entries of that old generation would become reachable again.
+    """
+    return time.time_ns()
+
+
+def get_generation(family):
+    """Return the current generation counter of an entity family."""
+    generation = cache.get(_generation_key(family))
+    if generation is None:
+        cache.add(_generation_key(family), _new_generation(), timeout=None)
+        generation = cache.get(_generation_key(family))
+        if generation is None:
+            # The cache did not keep the counter (e.g. a dummy backend)
+            generation = _new_generation()
+    return generation
+
+
+def _bump(family):
+    key = _generation_key(family)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Counter missing (evicted or never read)
+        cache.set(key, _new_generation(), timeout=None)
+
+
+def invalidate(*families):
+    """
+    Invalidate all cached entries depending on one of the given families.
+
+    Inside a ``deferred_invalidation()`` block the bump is postponed until the
+    outermost block exits.
+    """
+    if getattr(_state, "depth", 0):
+        _state.pending.update(families)
+        if time.monotonic() - _state.flushed_at >= DEBOUNCE_SECONDS:
+            _flush_pending()
+        return
+    for family in families:
+        _bump(family)
+
+
+def _flush_pending():
+    pending, _state.pending = _state.pending, set()
+    _state.flushed_at = time.monotonic()
+    if pending:
+        logger.info(f"Flushing deferred GraphQL cache invalidation: {sorted(pending)}")
+    for family in sorted(pending):
+        _bump(family)
+
+
+@contextmanager
+def deferred_invalidation():
+    """
+    Coalesce invalidations inside the block: pending bumps are flushed at most
+    every DEBOUNCE_SECONDS and once more when the outermost block exits.
+    """
+    if not getattr(_state, "depth", 0):
+        _state.depth = 0
+        _state.pending = set()
+        _state.flushed_at = time.monotonic()
+    _state.depth += 1
+    try:
+        yield
+    finally:
+        _state.depth -= 1
+        if _state.depth == 0:
+            _flush_pending()
+
+
+def make_key(namespace, params, families):
+    """
+    Build a cache key for ``namespace`` from the (JSON serializable) query
+    parameters and the current generations of the families it depends on.
+    """
+    generations = ":".join(f"{f}{get_generation(f)}" for f in sorted(families))
+    digest = hashlib.md5(json.dumps(params, sort_keys=True).encode()).hexdigest()
+    return f"graphql_cache:{namespace}:{generations}:{digest}"
@@ -0,0 +1,214 @@
+"""
+Per-request batch loaders for the relations of EventNode and LocationNode.
+
+Resolving ``location``, ``organizer``, ``races`` or ``reviews`` on every edge
+of an event connection used to cost one query per edge (two for nested
+connections, which also count). The schema is executed synchronously, so
+instead of promise-based DataLoaders the loaders here batch over keys that
+are queued up front: when a connection page or a list of nodes has been
+resolved, the keys of all its nodes are queued, and the first load() of any
+of them fetches the whole batch in one query. A page of events with its
+locations, organizers and races therefore costs a constant number of
+queries.
+
+Loaders live on the request (see get_loaders), so nothing is shared between
+requests and no invalidation is needed.
+"""
+from collections import defaultdict
+from typing import Callable, Dict, Hashable, Iterable, List
+
+from graphene_django.filter import DjangoFilterConnectionField
+from graphene_django_optimizer.hints import OptimizationHints
+
+from app.models import Event, Location, Organizer, Race, Review
+from .optimizer import optimize
+
+
+class BatchLoader:
+    """
+    Synchronous keyed loader. ``batch_load_fn`` receives a list of keys and
+    the resolve info of the field that triggered the batch, and returns a
+    dict of key -> value; keys missing from it resolve to ``default``.
+    """
+
+    def __init__(self, batch_load_fn: Callable[[List, object], Dict], default=None):
+        self.batch_load_fn = batch_load_fn
+        self.default = default
+        self._cache: Dict[Hashable, object] = {}
+        self._queue = set()
+
+    def queue(self, keys: Iterable[Hashable]):
+        """Queue keys to be fetched together with the next load()"""
+        self._queue.update(
+            key for key in keys if key is not None and key not in self._cache
+        )
+
+    def load(self, key: Hashable, info=None):
+        if key is None:
+            return self.default
+        if key not in self._cache:
+            self._queue.add(key)
+            keys, self._queue = list(self._queue), set()
+            results = self.batch_load_fn(keys, info)
+            for k in keys:
+                self._cache[k] = results.get(k, self.default)
+        return self._cache[key]
+
+
+def _group_by(objects, attname: str) -> Dict[Hashable, list]:
+    grouped = defaultdict(list)
+    for obj in objects:
+        grouped[getattr(obj, attname)].append(obj)
+    return grouped
+
+
+def _loaded_values(objects, attname: str) -> Iterable:
+    # Reading a column left out by only() would cost a query per object
+    for obj in objects:
+        if attname not in obj.get_deferred_fields():
+            yield getattr(obj, attname)
+
+
+def _narrow(queryset, info, *columns):
+    """
+    Narrow a batch query to the selection set of the field that triggered
+    it, keeping the columns the loader groups by. Instances are cached for
+    the rest of the request; a later selection needing more columns still
+    works, it just loads them per object.
+    """
+    if info is None:
+        return queryset
+    return optimize(queryset, info, keep=columns)
+
+
+class Loaders:
+    def __init__(self):
+        self.location = BatchLoader(self._load_locations)
+        self.organizer = BatchLoader(self._load_organizers)
+        self.races_by_event = BatchLoader(self._load_races, default=[])
+        self.reviews_by_event = BatchLoader(self._load_reviews, default=[])
+        self.events_by_location = BatchLoader(self._load_events, default=[])
+
+    def _load_locations(self, ids, info):
+        return _narrow(Location.objects.all(), info).in_bulk(ids)
+
+    def _load_organizers(self, ids, info):
+        queryset = Organizer.objects.with_future_event_count()
+        return _narrow(queryset, info).in_bulk(ids)
+
+    def _load_races(self, event_ids, info):
+        races = _narrow(Race.objects.filter(event_id__in=event_ids), info, "event")
+        return _group_by(races, "event_id")
+
+    def _load_reviews(self, event_ids, info):
+        reviews = _narrow(Review.objects.filter(event_id__in=event_ids), info, "event")
+        return _group_by(reviews, "event_id")
+
+    def _load_events(self, location_ids, info):
+        events = _narrow(
+            Event.objects.filter(location_id__in=location_ids), info, "location"
+        )
+        events = list(events)
+        # The events' own relations are usually selected next
+        self.queue_events(events)
+        return _group_by(events, "location_id")
+
+    def queue_events(self, events: Iterable[Event]):
+        events = list(events)
+        self.location.queue(_loaded_values(events, "location_id"))
+        self.organizer.queue(_loaded_values(events, "organizer_id"))
+        self.races_by_event.queue(event.pk for event in events)
+        self.reviews_by_event.queue(event.pk for event in events)
+
+    def queue_locations(self, locations: Iterable[Location]):
+        self.events_by_location.queue(location.pk for location in locations)
+
+    def queue(self, model, instances: Iterable):
+        if model is Event:
+            self.queue_events(instances)
+        elif model is Location:
+            self.queue_locations(instances)
+
+
+def get_loaders(info) -> Loaders:
+    """Return the loaders of the current request, creating them on first use"""
+    context = info.context
+    loaders = getattr(context, "_graphql_loaders", None)
+    if loaders is None:
+        loaders = Loaders()
+        context._graphql_loaders = loaders
+    return loaders
+
+
+PAGINATION_ARGS = ("first", "last", "before", "after", "offset")
+
+
+def has_filter_args(field_args: dict) -> bool:
+    """Whether a connection field was given any argument besides pagination"""
+    return any(
+        value is not None
+        for name, value in field_args.items()
+        if name not in PAGINATION_ARGS
+    )
+
+
+class BatchedConnectionField(DjangoFilterConnectionField):
+    """
+    Filter connection field that works with the batch loaders.
+
+    Querysets are narrowed to the selection set (see optimizer.py).
+    The nodes of every resolved page are queued with the request's loaders,
+    so their relations load in one query per relation. A resolver may return
+    a list from a loader instead of a queryset; lists are paginated as they
+    are and skip the filterset, so resolvers must only do that when no
+    filter argument was given.
+    """
+
+    def wrap_resolve(self, parent_resolver):
+        resolver = super().wrap_resolve(parent_resolver)
+        # Nested under another node, the connection is resolved by a loader
+        # keyed by the parent's id and needs no other parent column
+        resolver.optimization_hints = OptimizationHints(only="id")
+        return resolver
+
+    @classmethod
+    def resolve_queryset(
+        cls, connection, iterable, info, args, filtering_args, filterset_class, keep=()
+    ):
+        if isinstance(iterable, list):
+            return iterable
+        qs = super().resolve_queryset(
+            connection, iterable, info, args, filtering_args, filterset_class
+        )
+        return optimize(qs, info, keep=keep)
+
+    @classmethod
+    def connection_resolver(
+        cls,
+        resolver,
+        connection,
+        default_manager,
+        queryset_resolver,
+        max_limit,
+        enforce_first_or_last,
+        root,
+        info,
+        **args,
+    ):
+        result = super().connection_resolver(
+            resolver,
+            connection,
+            default_manager,
+            queryset_resolver,
+            max_limit,
+            enforce_first_or_last,
+            root,
+            info,
+            **args,
+        )
+        if hasattr(result, "edges"):
+            get_loaders(info).queue(
+                connection._meta.node._meta.model,
+                (edge.node for edge in result.edges),
+            )
+        return result
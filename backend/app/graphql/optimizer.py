@@ -0,0 +1,39 @@
+"""
+Selection-set-aware queryset narrowing for the GraphQL list fields.
+
+Thin layer over graphene-django-optimizer: the queryset of a list or
+connection field gets only() for the columns the query selects and
+select_related for plain foreign keys. Custom resolvers declare the columns
+they read with ``gql_optimizer.resolver_hints``; a field the optimizer cannot
+map to a column makes it fall back to loading whole rows.
+"""
+import inspect
+
+from graphene_django_optimizer.query import QueryOptimizer
+
+
+class _QueryOptimizer(QueryOptimizer):
+    def _get_name_from_resolver(self, resolver):
+        # graphene-django wraps the resolvers of choice fields (blank values,
+        # enums) with functools.wraps; look at the default resolver inside
+        if not self._get_optimization_hints(resolver):
+            resolver = inspect.unwrap(resolver)
+        return super()._get_name_from_resolver(resolver)
+
+
+def optimize(queryset, info, keep=()):
+    """
+    Narrow ``queryset`` to what the selection set of ``info`` needs, plus the
+    columns in ``keep``
+    """
+    queryset = _QueryOptimizer(info).optimize(queryset)
+    fields, defer = queryset.query.deferred_loading
+    if not fields or defer:
+        return queryset
+    # A related manager's queryset reads the foreign key back to the parent
+    # of every row
+    keep = [*keep, *(field.name for field in queryset._known_related_objects)]
+    if keep:
+        # only() replaces the previous set of fields
+        queryset = queryset.only(*fields, *keep)
+    return queryset
@@ -0,0 +1,194 @@
+"""
+Keyset pagination for the allEvents and allLocations connections.
+
+graphene-django paginates by offset: every page counts the whole filtered
+queryset and slices it, so deep pages get slower and the count re-runs the
+(often DISTINCT) joins of the filters. KeysetConnectionField instead orders
+the queryset by a unique sort key, e.g. (date_start, id), and its cursors
+encode the sort key of an edge. The next page is a ``WHERE (date_start, id) >
+cursor ... LIMIT first + 1`` query, which costs the same on every page.
+
+The total count is only computed when ``totalCount`` is selected and is
+cached per filter arguments with the versioned GraphQL cache.
+
+Sort key fields must be non-null. ``offset`` arguments and lists returned by
+a loader still use graphene-django's offset pagination, as do the offset
+cursors handed out before keyset pagination, so clients holding one still
+get their next page.
+"""
+import json
+from functools import partial
+
+import graphene
+from django.core.cache import cache
+from django.db.models import Q, QuerySet
+from graphene.relay import PageInfo
+from graphql import GraphQLError
+from graphql_relay import cursor_to_offset
+from graphql_relay.utils import base64, unbase64
+
+from . import cache as graphql_cache
+from .loaders import PAGINATION_ARGS, BatchedConnectionField
+
+CURSOR_PREFIX = "keyset:"
+
+# A count may depend on events, locations and organizers through the filters
+COUNT_FAMILIES = (
+    graphql_cache.EVENTS,
+    graphql_cache.LOCATIONS,
+    graphql_cache.ORGANIZERS,
+)
+
+
+class CountedConnection(graphene.relay.Connection):
+    """Connection with a ``totalCount`` of all nodes matching the filters"""
+
+    class Meta:
+        abstract = True
+
+    total_count = graphene.Int()
+
+    def resolve_total_count(root, info):
+        count_total = getattr(root, "count_total", None)
+        if count_total is not None:
+            return count_total()
+        return root.length
+
+
+def _sort_key(node, order):
+    return [getattr(node, name) for name in order]
+
+
+def encode_cursor(node, order) -> str:
+    values = [
+        value.isoformat() if hasattr(value, "isoformat") else value
+        for value in _sort_key(node, order)
+    ]
+    return base64(CURSOR_PREFIX + json.dumps(values))
+
+
+def decode_cursor(cursor: str, model, order) -> list:
+    try:
+        text = unbase64(cursor)
+        if not text.startswith(CURSOR_PREFIX):
+            raise ValueError
+        values = json.loads(text[len(CURSOR_PREFIX):])
+        if len(values) != len(order):
+            raise ValueError
+        return [
+            model._meta.get_field(name).to_python(value)
+            for name, value in zip(order, values)
+        ]
+    except Exception:
+        raise GraphQLError(f"Invalid cursor: {cursor}")
+
+
+def is_offset_cursor(cursor: str) -> bool:
+    """Whether ``cursor`` is one of graphene's ``arrayconnection:`` cursors"""
+    return bool(cursor) and cursor_to_offset(cursor) is not None
+
+
+def _keyset_q(order, values, forward: bool) -> Q:
+    """Rows after (forward) or before the sort key ``values``"""
+    lookup = "gt" if forward else "lt"
+    q = Q()
+    for i, name in enumerate(order):
+        row = Q(**{f"{name}__{lookup}": values[i]})
+        for prev_name, prev_value in zip(order[:i], values[:i]):
+            row &= Q(**{prev_name: prev_value})
+        q |= row
+    return q
+
+
+def cached_count(queryset: QuerySet, args: dict) -> int:
+    filters = {
+        name: value if isinstance(value, (str, int, float, bool, list)) else str(value)
+        for name, value in args.items()
+        if name not in PAGINATION_ARGS and value is not None
+    }
+    cache_key = graphql_cache.make_key(
+        f"count:{queryset.model._meta.label_lower}", filters, COUNT_FAMILIES
+    )
+    count = cache.get(cache_key)
+    if count is None:
+        count = queryset.count()
+        cache.set(cache_key, count, graphql_cache.DEFAULT_TIMEOUT)
+    return count
+
+
+class KeysetConnectionField(BatchedConnectionField):
+    """
+    Batched filter connection paginated by the ``order`` fields, the last of
+    which must be unique (the primary key).
+    """
+
+    def __init__(self, type_, *args, order=("id",), **kwargs):
+        self.order = tuple(order)
+        super().__init__(type_, *args, **kwargs)
+
+    def get_queryset_resolver(self):
+        return partial(self.resolve_ordered_queryset, order=self.order)
+
+    def resolve_ordered_queryset(self, connection, iterable, info, args, order):
+        qs = super().get_queryset_resolver()(
+            connection, iterable, info, args, keep=order
+        )
+        if isinstance(qs, QuerySet):
+            qs = qs.order_by(*order)
+        return qs
+
+    @classmethod
+    def resolve_connection(cls, connection, args, iterable, max_limit=None):
+        if (
+            not isinstance(iterable, QuerySet)
+            or args.get("offset")
+            or is_offset_cursor(args.get("after"))
+            or is_offset_cursor(args.get("before"))
+        ):
+            return super().resolve_connection(connection, args, iterable, max_limit)
+
+        order = iterable.query.order_by
+        first, last = args.get("first"), args.get("last")
+        after, before = args.get("after"), args.get("before")
+        if max_limit is not None and first is None and last is None:
+            first = max_limit
+
+        qs = iterable
+        if after:
+            after = decode_cursor(after, qs.model, order)
+            qs = qs.filter(_keyset_q(order, after, True))
+        if before:
+            before = decode_cursor(before, qs.model, order)
+            qs = qs.filter(_keyset_q(order, before, False))
+
+        if first is None and last is not None:
+            # Paging backwards: the rows just before `before`
+            nodes = list(qs.reverse()[: last + 1])
+            has_previous_page = len(nodes) > last
+            nodes = nodes[:last][::-1]
+            has_next_page = bool(before)
+        else:
+            nodes = list(qs[: first + 1] if first is not None else qs)
+            has_next_page = first is not None and len(nodes) > first
+            nodes = nodes[:first]
+            has_previous_page = bool(after)
+            if last is not None and len(nodes) > last:
+                nodes = nodes[-last:]
+                has_previous_page = True
+
+        edges = [
+            connection.Edge(node=node, cursor=encode_cursor(node, order))
+            for node in nodes
+        ]
+        result = connection(
+            edges=edges,
+            page_info=PageInfo(
+                start_cursor=edges[0].cursor if edges else None,
+                end_cursor=edges[-1].cursor if edges else None,
+                has_previous_page=has_previous_page,
+                has_next_page=has_next_page,
+            ),
+        )
+        result.iterable = iterable
+        result.count_total = partial(cached_count, iterable, args)
+        return result
@@ -1,20 +1,24 @@
 import django_filters
 import graphene
-import hashlib
-import json
+import graphene_django_optimizer as gql_optimizer
 from django.core.cache import cache
-from django.db import connection
-from django.db.models import Q
 from graphene import Node, relay
 from graphene_django import DjangoObjectType
 from graphene_django.debug import DjangoDebug
-from graphene_django.filter import DjangoFilterConnectionField
+from graphene_django.utils import bypass_get_queryset
 from graphql_auth.schema import UserQuery, MeQuery
 from graphql_jwt.decorators import login_required
 
 from app.models import Organizer, Location, Race, Event, Review, ApiToken
+from app.services import statistics_service
+from app.services.map_markers import location_filter_q
+from . import cache as graphql_cache
+from .loaders import BatchedConnectionField, get_loaders, has_filter_args
+from .optimizer import optimize
+from .pagination import CountedConnection, KeysetConnectionField
 
 
+@gql_optimizer.resolver_hints(only="logo")
 def get_organization_logo_url(obj, resolve_obj):
     if obj.logo:
         try:
@@ -34,9 +38,19 @@ class OrganizerNode(DjangoObjectType):
         interfaces = (Node,)
 
     logo = graphene.String(resolver=get_organization_logo_url)
-    number_of_events = graphene.Int(source="number_of_events")
+    number_of_events = graphene.Int()
 
+    @classmethod
+    def get_queryset(cls, queryset, info):
+        return queryset.with_future_event_count()
 
+    # future_event_count is annotated by get_queryset, no column needed
+    @gql_optimizer.resolver_hints(only=())
+    def resolve_number_of_events(self, info):
+        return self.number_of_events()
+
+
+@gql_optimizer.resolver_hints(only="header_photo")
 def get_header_photo_url(obj, resolve_obj):
     if obj.header_photo:
         try:
@@ -64,12 +78,20 @@ class LocationNode(DjangoObjectType):
             "average_rating",
         )
         interfaces = (Node,)
+        connection_class = CountedConnection
 
     # returns the URL of the header photo
     # see # see https://stackoverflow.com/questions/52767366/ \
     # how-can-i-resolve-custom-fields-for-django-models-using-django-graphene
     header_photo = graphene.String(resolver=get_header_photo_url)
 
+    events = BatchedConnectionField(lambda: EventNode, required=True)
+
+    def resolve_events(self, info, **kwargs):
+        if has_filter_args(kwargs):
+            return self.events.all()
+        return get_loaders(info).events_by_location.load(self.pk, info)
+
 
 class LocationNodeFilter(django_filters.FilterSet):
     race_distance_gte = django_filters.NumberFilter(
@@ -106,9 +128,14 @@ class RaceNode(DjangoObjectType):
         )
         interfaces = (Node,)
 
-    price_value = graphene.String(resolver=lambda obj, resolve_obj: str(obj.price))
+    price_value = graphene.String()
+
+    @gql_optimizer.resolver_hints(only=("price", "price_currency"))
+    def resolve_price_value(self, info):
+        return str(self.price)
 
 
+@gql_optimizer.resolver_hints(only="flyer_image")
 def get_flyer_image_url(obj, resolve_obj):
     if obj.flyer_image:
         try:
@@ -134,9 +161,33 @@ class EventNode(DjangoObjectType):
         }
         fields = "__all__"
         interfaces = (Node,)
+        connection_class = CountedConnection
 
     flyer_image = graphene.String(resolver=get_flyer_image_url)
 
+    races = BatchedConnectionField(RaceNode, required=True)
+    reviews = BatchedConnectionField(lambda: ReviewNode, required=True)
+
+    @gql_optimizer.resolver_hints(only="location")
+    def resolve_location(self, info):
+        return get_loaders(info).location.load(self.location_id, info)
+
+    # The loader already applies OrganizerNode.get_queryset's annotation
+    @bypass_get_queryset
+    @gql_optimizer.resolver_hints(only="organizer")
+    def resolve_organizer(self, info):
+        return get_loaders(info).organizer.load(self.organizer_id, info)
+
+    def resolve_races(self, info, **kwargs):
+        if has_filter_args(kwargs):
+            return self.races.all()
+        return get_loaders(info).races_by_event.load(self.pk, info)
+
+    def resolve_reviews(self, info, **kwargs):
+        if has_filter_args(kwargs):
+            return self.reviews.all()
+        return get_loaders(info).reviews_by_event.load(self.pk, info)
+
 
 class EventNodeFilter(django_filters.FilterSet):
     race_distance_gte = django_filters.NumberFilter(
@@ -174,35 +225,33 @@ class EventNodeFilter(django_filters.FilterSet):
         )
 
 
+class CountryStatistics(graphene.ObjectType):
+    country = graphene.String()
+    event_count = graphene.Int()
+    race_count = graphene.Int()
+
+
+class MonthStatistics(graphene.ObjectType):
+    month = graphene.Date(description="First day of the month")
+    event_count = graphene.Int()
+    race_count = graphene.Int()
+
+
 class Statistics(graphene.ObjectType):
     event_count = graphene.Int()
     race_count = graphene.Int()
     countries_count = graphene.Int()
+    countries = graphene.List(CountryStatistics)
+    months = graphene.List(MonthStatistics)
+    computed_at = graphene.DateTime()
 
 
 class StatisticsQuery(graphene.ObjectType):
     statistics = graphene.Field(Statistics)
 
     def resolve_statistics(root, info):
-        sql = """
-SELECT count(distinct app_event.id) as event_count,
-       count(distinct ar.id)        as race_count,
-       count(distinct al.country)   as country_count
-FROM app_event
-         LEFT JOIN app_race ar on app_event.id = ar.event_id
-         INNER JOIN app_location al on al.id = app_event.location_id
-WHERE ("app_event"."date_start" >= now()
-    AND app_event.invisible = 'f'
-          )"""
-
-        with connection.cursor() as c:
-            c.execute(sql)
-            (event_count, race_cont, countries_count) = c.fetchone()
-        return Statistics(
-            event_count=event_count,
-            race_count=race_cont,
-            countries_count=countries_count,
-        )
+        # Upcoming events only, read from the snapshot (statistics_service.py)
+        return statistics_service.get_snapshot()
 
 
 class LocationsFilteredQuery(graphene.ObjectType):
@@ -248,45 +297,42 @@ class LocationsFilteredQuery(graphene.ObjectType):
             ),
             "organizer_id": str(organizer_id) if organizer_id is not None else None,
         }
-        cache_key = f"locations_filtered:{hashlib.md5(json.dumps(cache_key_data, sort_keys=True).encode()).hexdigest()}"
+        # Only the columns the query selects are loaded, so they are part of
+        # the key
+        queryset = optimize(Location.objects.all(), info)
+        cache_key_data["columns"] = sorted(queryset.query.deferred_loading[0])
+        cache_key = graphql_cache.make_key(
+            "locations_filtered",
+            cache_key_data,
+            (graphql_cache.EVENTS, graphql_cache.LOCATIONS, graphql_cache.ORGANIZERS),
+        )
 
         # Try to get from cache first
         cached_result = cache.get(cache_key)
         if cached_result is not None:
+            get_loaders(info).queue_locations(cached_result)
             return cached_result
 
         # If not in cache, run the original query
-        q = Q(
-            events__races__distance__gte=race_distance_gte,
-            events__races__distance__lte=race_distance_lte,
-            events__date_start__gte=date_from,
-            events__date_start__lte=date_to,
-            events__invisible=False,
+        q = location_filter_q(
+            race_distance_gte=race_distance_gte,
+            race_distance_lte=race_distance_lte,
+            date_from=date_from,
+            date_to=date_to,
+            keyword=keyword,
+            organizer_slug=organizer_slug,
+            organizer_id=organizer_id,
         )
 
-        if len(keyword) >= 3:
-            q = q & (
-                Q(events__name__istartswith=keyword) | Q(city__istartswith=keyword)
-            )
-
-        if organizer_slug:
-            q = q & Q(events__organizer__slug=organizer_slug)
-
-        if organizer_id:
-            from base64 import b64decode
-
-            model_with_pk = b64decode(organizer_id).decode("utf-8")
-            model_name, pk = model_with_pk.split(":")
-            q = q & Q(events__organizer__id=pk)
-
         # Get the result and store it in cache
-        queryset = Location.objects.filter(q).distinct().all()
+        queryset = queryset.filter(q).distinct()
 
         # Django querysets are not directly serializable for caching
         # Convert to a list before caching as that's what GraphQL expects anyway
         result = list(queryset)
-        cache.set(cache_key, result, 3600)  # Cache for 1 hour
+        cache.set(cache_key, result, graphql_cache.DEFAULT_TIMEOUT)
 
+        get_loaders(info).queue_locations(result)
         return result
 
 
@@ -312,48 +358,27 @@ class Query(
     UserQuery, MeQuery, LocationsFilteredQuery, StatisticsQuery, graphene.ObjectType
 ):
     location = relay.Node.Field(LocationNode)
-    all_locations = DjangoFilterConnectionField(
-        LocationNode, filterset_class=LocationNodeFilter
+    all_locations = KeysetConnectionField(
+        LocationNode, filterset_class=LocationNodeFilter, order=("city", "id")
     )
     event = relay.Node.Field(EventNode)
-    all_events = DjangoFilterConnectionField(EventNode, filterset_class=EventNodeFilter)
+    all_events = KeysetConnectionField(
+        EventNode, filterset_class=EventNodeFilter, order=("date_start", "id")
+    )
 
     race = relay.Node.Field(RaceNode)
 
     organizer = relay.Node.Field(OrganizerNode)
-    all_organizers = DjangoFilterConnectionField(
+    all_organizers = BatchedConnectionField(
         OrganizerNode, number_of_events_gt=graphene.Int()
     )
 
     def resolve_all_organizers(self, info, number_of_events_gt=None, **kwargs):
-        # Create a cache key from the query parameters
-        # Extract only serializable kwargs for the cache key
-        serializable_kwargs = {}
-        for key, value in kwargs.items():
-            # Include only primitive types that can be safely serialized
-            if isinstance(value, (str, int, float, bool, type(None))):
-                serializable_kwargs[key] = value
-
-        cache_key_data = {
-            "number_of_events_gt": number_of_events_gt,
-            "kwargs": serializable_kwargs,
-        }
-        cache_key = f"all_organizers:{hashlib.md5(json.dumps(cache_key_data, sort_keys=True).encode()).hexdigest()}"
-
-        # Try to get from cache first
-        cached_result = cache.get(cache_key)
-        if cached_result is not None:
-            return cached_result
-
-        # If not in cache, run the original query
-        qs = Organizer.objects.all()
+        # Not cached: the connection filters and narrows the queryset again,
+        # so a cached (pickled, hence fully loaded) queryset is never reused
+        qs = Organizer.objects.with_future_event_count()
         if number_of_events_gt is not None:
-            ids = [org.id for org in qs if org.number_of_events() > number_of_events_gt]
-            qs = Organizer.objects.filter(id__in=ids)
-
-        # Cache the QuerySet and return it (don't convert to list)
-        cache.set(cache_key, qs, 3600)  # Cache for 1 hour
-
+            qs = qs.filter(future_event_count__gt=number_of_events_gt)
         return qs
 
     # API Token fields
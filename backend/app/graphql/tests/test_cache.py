@@ -0,0 +1,68 @@
+"""
+Tests for the versioned GraphQL cache (no DB, uses the configured cache).
+"""
+import pytest
+from django.core.cache import cache
+
+from app.graphql import cache as graphql_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _key(params=None):
+    return graphql_cache.make_key(
+        "test", params or {}, (graphql_cache.EVENTS, graphql_cache.LOCATIONS)
+    )
+
+
+class TestMakeKey:
+    def test_stable_for_same_params(self):
+        assert _key({"a": 1, "b": 2}) == _key({"b": 2, "a": 1})
+
+    def test_differs_by_params(self):
+        assert _key({"a": 1}) != _key({"a": 2})
+
+
+class TestInvalidate:
+    def test_invalidating_a_family_changes_the_key(self):
+        before = _key()
+        graphql_cache.invalidate(graphql_cache.EVENTS)
+        assert _key() != before
+
+    def test_other_families_are_unaffected(self):
+        key = graphql_cache.make_key("test", {}, (graphql_cache.ORGANIZERS,))
+        graphql_cache.invalidate(graphql_cache.EVENTS)
+        assert graphql_cache.make_key("test", {}, (graphql_cache.ORGANIZERS,)) == key
+
+    def test_evicted_counter_does_not_revive_old_entries(self):
+        first = _key()
+        cache.set(first, "stale")
+        graphql_cache.invalidate(graphql_cache.EVENTS)
+        # The backend culls the counters, e.g. under MAX_ENTRIES
+        cache.delete(graphql_cache._generation_key(graphql_cache.EVENTS))
+        cache.delete(graphql_cache._generation_key(graphql_cache.LOCATIONS))
+        assert _key() != first
+        assert cache.get(_key()) is None
+
+    def test_bump_of_a_missing_counter_starts_a_new_generation(self):
+        first = _key()
+        cache.delete(graphql_cache._generation_key(graphql_cache.EVENTS))
+        graphql_cache.invalidate(graphql_cache.EVENTS)
+        assert _key() != first
+
+
+class TestDeferredInvalidation:
+    def test_bumps_once_when_the_block_exits(self):
+        generation = graphql_cache.get_generation(graphql_cache.EVENTS)
+        with graphql_cache.deferred_invalidation():
+            for _ in range(5):
+                graphql_cache.invalidate(graphql_cache.EVENTS)
+            with graphql_cache.deferred_invalidation():
+                graphql_cache.invalidate(graphql_cache.EVENTS)
+            assert graphql_cache.get_generation(graphql_cache.EVENTS) == generation
+        assert graphql_cache.get_generation(graphql_cache.EVENTS) == generation + 1
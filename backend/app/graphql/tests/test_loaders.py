@@ -0,0 +1,149 @@
+"""
+Tests for the per-request batch loaders of event and location relations.
+
+The number of queries of a page must not depend on its size.
+"""
+from datetime import date
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from app.graphql.schema import schema
+from app.models import Event, Location, Organizer, Race, Review
+
+pytestmark = pytest.mark.django_db
+
+DAY = date(2030, 7, 1)
+
+EVENTS = """{
+  allEvents(first: %d) {
+    edges { node {
+      name
+      location { city }
+      organizer { name }
+      races { edges { node { distance } } }
+      reviews { edges { node { rating } } }
+    } }
+  }
+}"""
+
+LOCATIONS = """{
+  allLocations(first: %d) {
+    edges { node { city events { edges { node { name } } } } }
+  }
+}"""
+
+LOCATIONS_FILTERED = """{
+  locationsFiltered(
+    raceDistanceGte: 0, raceDistanceLte: 100
+    dateFrom: "2030-01-01", dateTo: "2030-12-31"
+  ) {
+    city
+    events { edges { node { name races { edges { node { distance } } } } } }
+  }
+}"""
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _create(count, start=0):
+    for i in range(start, start + count):
+        location = Location.objects.create(city=f"City {i}", country="CH")
+        organizer = Organizer.objects.create(name=f"Club {i}", website="https://x")
+        for j in range(2):
+            event = Event.objects.create(
+                name=f"Swim {i}-{j}",
+                website="https://x",
+                location=location,
+                organizer=organizer,
+                date_start=DAY,
+                date_end=DAY,
+            )
+            Race.objects.create(event=event, date=DAY, distance=1 + j)
+            Race.objects.create(event=event, date=DAY, distance=5)
+            Review.objects.create(event=event, rating=4, created_at=timezone.now())
+
+
+def _execute(query):
+    request = RequestFactory().post("/graphql")
+    request.user = AnonymousUser()
+    with CaptureQueriesContext(connection) as queries:
+        result = schema.execute(query, context_value=request)
+    assert not result.errors, result.errors
+    return result.data, len(queries)
+
+
+class TestEventLoaders:
+    def test_query_count_independent_of_page_size(self):
+        _create(4)
+
+        _, small_count = _execute(EVENTS % 2)
+        large, large_count = _execute(EVENTS % 8)
+
+        assert len(large["allEvents"]["edges"]) == 8
+        assert small_count == large_count
+
+    def test_relations_belong_to_their_event(self):
+        _create(3)
+
+        data, _ = _execute(EVENTS % 6)
+
+        for edge in data["allEvents"]["edges"]:
+            node = edge["node"]
+            i, j = node["name"].split()[1].split("-")
+            assert node["location"]["city"] == f"City {i}"
+            assert node["organizer"]["name"] == f"Club {i}"
+            distances = [race["node"]["distance"] for race in node["races"]["edges"]]
+            assert sorted(distances) == [1 + int(j), 5]
+            assert [r["node"]["rating"] for r in node["reviews"]["edges"]] == [4]
+
+
+class TestLocationLoaders:
+    def test_query_count_independent_of_page_size(self):
+        _create(4)
+
+        _, small_count = _execute(LOCATIONS % 1)
+        large, large_count = _execute(LOCATIONS % 4)
+
+        assert small_count == large_count
+        for edge in large["allLocations"]["edges"]:
+            node = edge["node"]
+            names = [event["node"]["name"] for event in node["events"]["edges"]]
+            assert len(names) == 2
+            assert all(name.startswith(f"Swim {node['city'][5:]}-") for name in names)
+
+    def test_filtered_nested_connection(self):
+        _create(2)
+
+        data, _ = _execute(
+            '{allLocations(first: 2) {edges {node {city '
+            'events(name: "Swim 1-1") {edges {node {name}}}}}}}'
+        )
+
+        events = {
+            edge["node"]["city"]: [
+                event["node"]["name"] for event in edge["node"]["events"]["edges"]
+            ]
+            for edge in data["allLocations"]["edges"]
+        }
+        assert events == {"City 0": [], "City 1": ["Swim 1-1"]}
+
+    def test_locations_filtered_query_count(self):
+        _create(1)
+        _, small_count = _execute(LOCATIONS_FILTERED)
+
+        _create(3, start=1)
+        data, large_count = _execute(LOCATIONS_FILTERED)
+
+        assert len(data["locationsFiltered"]) == 4
+        assert small_count == large_count
@@ -0,0 +1,141 @@
+"""
+Tests for the keyset pagination of allEvents and allLocations.
+"""
+from datetime import date
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import RequestFactory
+from graphql_relay import offset_to_cursor, to_global_id
+
+from app.graphql.schema import schema
+from app.models import Event, Location, Organizer
+
+pytestmark = pytest.mark.django_db
+
+EVENTS = """query ($first: Int, $last: Int, $after: String, $before: String,
+                   $organizer: ID) {
+  allEvents(first: $first, last: $last, after: $after, before: $before,
+            organizer: $organizer) {
+    totalCount
+    pageInfo { hasNextPage hasPreviousPage startCursor endCursor }
+    edges { cursor node { name } }
+  }
+}"""
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def events():
+    """Seven events; two share each start date so the id breaks the tie"""
+    location = Location.objects.create(city="Zurich", country="CH")
+    clubs = [
+        Organizer.objects.create(name=name, website="https://x")
+        for name in ("Swim Club", "Lake Club")
+    ]
+    names = []
+    for i in range(7):
+        day = date(2030, 7, 1 + i // 2)
+        event = Event.objects.create(
+            name=f"Swim {i}",
+            website="https://x",
+            location=location,
+            organizer=clubs[i % 2],
+            date_start=day,
+            date_end=day,
+        )
+        names.append(event.name)
+    return names
+
+
+def _run(query, variables):
+    request = RequestFactory().post("/graphql")
+    request.user = AnonymousUser()
+    return schema.execute(query, variable_values=variables, context_value=request)
+
+
+def _execute(**variables):
+    result = _run(EVENTS, variables)
+    if result.errors:
+        return result.errors
+    return result.data["allEvents"]
+
+
+def _names(connection):
+    return [edge["node"]["name"] for edge in connection["edges"]]
+
+
+class TestKeysetPagination:
+    def test_pages_forward(self, events):
+        names, after = [], None
+        while True:
+            page = _execute(first=3, after=after)
+            names += _names(page)
+            after = page["pageInfo"]["endCursor"]
+            assert page["pageInfo"]["hasPreviousPage"] == (len(names) > 3)
+            if not page["pageInfo"]["hasNextPage"]:
+                break
+
+        assert names == events
+        assert page["totalCount"] == 7
+
+    def test_pages_backward(self, events):
+        names, before = [], None
+        while True:
+            page = _execute(last=3, before=before)
+            names = _names(page) + names
+            before = page["pageInfo"]["startCursor"]
+            if not page["pageInfo"]["hasPreviousPage"]:
+                break
+
+        assert names == events
+
+    def test_filtered(self, events):
+        organizer = to_global_id(
+            "OrganizerNode", Organizer.objects.get(name="Lake Club").pk
+        )
+
+        first = _execute(first=2, organizer=organizer)
+        second = _execute(
+            first=2, organizer=organizer, after=first["pageInfo"]["endCursor"]
+        )
+
+        assert _names(first) + _names(second) == events[1::2]
+        assert not second["pageInfo"]["hasNextPage"]
+        assert first["totalCount"] == 3
+
+    def test_offset_cursor_still_pages(self, events):
+        page = _execute(first=2, after=offset_to_cursor(1))
+
+        assert _names(page) == events[2:4]
+
+    def test_invalid_cursor(self, events):
+        [error] = _execute(first=2, after="bm90IGEgY3Vyc29y")
+
+        assert "Invalid cursor" in error.message
+
+    def test_locations_by_city(self):
+        for city in ("Lugano", "Basel", "Zurich", "Basel"):
+            Location.objects.create(city=city, country="CH")
+        query = """query ($after: String) {
+          allLocations(first: 2, after: $after) {
+            pageInfo { endCursor }
+            edges { node { city } }
+          }
+        }"""
+
+        pages = []
+        after = None
+        for _ in range(2):
+            data = _run(query, {"after": after}).data
+            pages.append([e["node"]["city"] for e in data["allLocations"]["edges"]])
+            after = data["allLocations"]["pageInfo"]["endCursor"]
+
+        assert pages == [["Basel", "Basel"], ["Lugano", "Zurich"]]
@@ -1,11 +1,16 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 from django.core.management.base import BaseCommand
 import dotenv
 
+from app.graphql import cache as graphql_cache
 from app.models import CrawlSource
 from app.services.event_processor import EventProcessor
+from app.services.extraction_cache import get_extraction_cache
 from app.services.event_crawler import EventCrawler
+from app.services.scrape_cache import get_scrape_cache, set_scrape_cache_ttl
+from app.services.scraping_service import DomainRateLimiter
 from app.utils.url_utils import URLUtils
 
 
@@ -69,12 +74,41 @@ class Command(BaseCommand):
             action="store_true",
             help="Update existing events instead of skipping them when a duplicate is found (same location and date)",
         )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=1,
+            help="Number of events to scrape and extract in parallel (default: 1). "
+            "Database writes stay serial and in input order.",
+        )
+        parser.add_argument(
+            "--per-domain-concurrency",
+            type=int,
+            default=2,
+            help="Maximum parallel scrapes per domain when --concurrency > 1 "
+            "(default: 2)",
+        )
+        parser.add_argument(
+            "--per-domain-delay",
+            type=float,
+            default=1.0,
+            help="Minimum seconds between scrapes of the same domain when "
+            "--concurrency > 1 (default: 1.0)",
+        )
+        parser.add_argument(
+            "--scrape-cache-ttl",
+            type=float,
+            help="Hours a cached scrape stays fresh before Firecrawl is asked again "
+            "(default: SCRAPE_CACHE_TTL_HOURS, 24). Use 0 to always re-scrape.",
+        )
 
     def handle(self, *args, **options):
         dotenv.load_dotenv()
         api_key = os.environ["FIRECRAWL_API_KEY"]
         dry_run = options.get("dry_run", False)
         update_existing = options.get("update_existing", False)
+        if options.get("scrape_cache_ttl") is not None:
+            set_scrape_cache_ttl(options["scrape_cache_ttl"])
 
         if dry_run:
             self.stdout.write(
@@ -114,6 +148,18 @@ class Command(BaseCommand):
                 )
                 return
 
+        self.concurrency = max(options.get("concurrency") or 1, 1)
+        rate_limiter = None
+        if self.concurrency > 1:
+            rate_limiter = DomainRateLimiter(
+                max_concurrent=options["per_domain_concurrency"],
+                min_interval=options["per_domain_delay"],
+            )
+            self.stdout.write(
+                f"Extracting up to {self.concurrency} events in parallel "
+                f"(max {rate_limiter.max_concurrent} per domain)"
+            )
+
         processor = EventProcessor(
             firecrawl_api_key=api_key,
             stdout=self.stdout,
@@ -121,36 +167,40 @@ class Command(BaseCommand):
             dry_run=dry_run,
             update_existing=update_existing,
             crawl_source=crawl_source,
+            rate_limiter=rate_limiter,
         )
 
-        if options["event"]:
-            # Process single event mode
-            result = self._process_single_event(processor, options["event"])
-            # Add a reminder about dry run mode if applicable
-            if dry_run and result:
-                self.stdout.write(
-                    self.style.WARNING(
-                        "No database changes were made. Run without --dry-run to save events to the database."
+        # Publish cache invalidations in batches instead of once per saved event
+        with graphql_cache.deferred_invalidation():
+            if options["event"]:
+                # Process single event mode
+                result = self._process_single_event(processor, options["event"])
+                # Add a reminder about dry run mode if applicable
+                if dry_run and result:
+                    self.stdout.write(
+                        self.style.WARNING(
+                            "No database changes were made. "
+                            "Run without --dry-run to save events to the database."
+                        )
                     )
+            elif options["profile"]:
+                # Profile-based crawling mode
+                self._crawl_with_profile(
+                    processor, api_key, options["profile"], options=options
+                )
+            elif options["discovered"]:
+                # Process events from discovered_event_urls.json file
+                self._process_discovered_events(
+                    processor, options["discovered"], limit=options.get("limit")
+                )
+            elif options["file"]:
+                # Process events from a text file
+                self._process_file_events(processor, options["file"])
+            elif crawl_url:
+                # Crawl multiple events mode (from --crawl or --crawl-source)
+                self._crawl_multiple_events(
+                    processor, api_key, crawl_url, limit=options.get("limit")
                 )
-        elif options["profile"]:
-            # Profile-based crawling mode
-            self._crawl_with_profile(
-                processor, api_key, options["profile"], options=options
-            )
-        elif options["discovered"]:
-            # Process events from discovered_event_urls.json file
-            self._process_discovered_events(
-                processor, options["discovered"], limit=options.get("limit")
-            )
-        elif options["file"]:
-            # Process events from a text file
-            self._process_file_events(processor, options["file"])
-        elif crawl_url:
-            # Crawl multiple events mode (from --crawl or --crawl-source)
-            self._crawl_multiple_events(
-                processor, api_key, crawl_url, limit=options.get("limit")
-            )
 
     def _process_event_url_sets(
         self,
@@ -159,6 +209,11 @@ class Command(BaseCommand):
         source_description: str = "event",
     ) -> tuple:
         """Process a list of event URL sets and return (successful, failed) counts."""
+        if getattr(self, "concurrency", 1) > 1 and len(event_url_sets) > 1:
+            return self._process_event_url_sets_concurrently(
+                processor, event_url_sets, source_description
+            )
+
         successful = 0
         failed = 0
         for i, urls in enumerate(event_url_sets, 1):
@@ -177,6 +232,43 @@ class Command(BaseCommand):
                 failed += 1
         return successful, failed
 
+    def _process_event_url_sets_concurrently(
+        self,
+        processor: EventProcessor,
+        event_url_sets: List[List[str]],
+        source_description: str = "event",
+    ) -> tuple:
+        """
+        Scrape and extract up to self.concurrency URL sets in parallel, then save
+        the results one by one in input order on the calling thread.
+        """
+        successful = 0
+        failed = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [
+                executor.submit(
+                    processor.extract_event_data, urls, filter_future_only=True
+                )
+                for urls in event_url_sets
+            ]
+            for i, (urls, future) in enumerate(zip(event_url_sets, futures), 1):
+                self.stdout.write(
+                    f"Processing {source_description} {i}/{len(event_url_sets)}"
+                )
+                self.stdout.write(f"Processing event URLs: {', '.join(urls)}")
+                try:
+                    event = processor.save_extracted_event(future.result(), urls)
+                    if self._report_processed_event(processor, event):
+                        successful += 1
+                    else:
+                        failed += 1
+                except Exception as e:
+                    self.stderr.write(
+                        self.style.ERROR(f"Failed to process event: {str(e)}")
+                    )
+                    failed += 1
+        return successful, failed
+
     def _print_summary(
         self,
         processor: EventProcessor,
@@ -195,6 +287,12 @@ class Command(BaseCommand):
         if extra_lines:
             summary += f"\n{extra_lines}"
         summary += f"\n- Total: {total}"
+        scrape_cache = get_scrape_cache()
+        if scrape_cache:
+            summary += f"\n- Scrape cache: {scrape_cache.stats()}"
+        extraction_cache = get_extraction_cache()
+        if extraction_cache:
+            summary += f"\n- Extraction cache: {extraction_cache.stats()}"
         self.stdout.write(self.style.SUCCESS(summary))
 
         if processor.dry_run:
@@ -208,7 +306,10 @@ class Command(BaseCommand):
         """Process a single event from provided URLs"""
         self.stdout.write(f"Processing event URLs: {', '.join(urls)}")
         event = processor.process_event_urls(urls)
+        return self._report_processed_event(processor, event)
 
+    def _report_processed_event(self, processor: EventProcessor, event) -> bool:
+        """Write the outcome for one processed event and return whether it succeeded"""
         if event:
             if processor.dry_run:
                 self.stdout.write(
@@ -413,28 +514,14 @@ class Command(BaseCommand):
                     event_url_sets = filtered_event_url_sets
 
                     # Process each extracted event
-                    multiple_successful = 0
-                    multiple_failed = 0
-
-                    for j, urls in enumerate(event_url_sets, 1):
-                        self.stdout.write(
-                            f"Processing extracted event {j}/{len(event_url_sets)} from {url}"
-                        )
-                        try:
-                            if self._process_single_event(processor, urls):
-                                multiple_successful += 1
-                                successful += 1
-                            else:
-                                multiple_failed += 1
-                                failed += 1
-                        except Exception as e:
-                            self.stderr.write(
-                                self.style.ERROR(
-                                    f"Failed to process extracted event: {str(e)}"
-                                )
-                            )
-                            multiple_failed += 1
-                            failed += 1
+                    (
+                        multiple_successful,
+                        multiple_failed,
+                    ) = self._process_event_url_sets(
+                        processor, event_url_sets, f"extracted event from {url}"
+                    )
+                    successful += multiple_successful
+                    failed += multiple_failed
 
                     # Summary for this multiple events page
                     self.stdout.write(
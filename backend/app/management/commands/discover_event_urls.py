@@ -1,3 +1,5 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from enum import Enum
 import os
@@ -13,7 +15,9 @@ from pydantic import BaseModel
 import re
 
 from app.models import Event
+from app.services.scrape_cache import get_scrape_cache, set_scrape_cache_ttl
 from app.services.scraping_service import ScrapingService
+from app.utils.country_utils import get_search_countries
 from app.utils.url_utils import URLUtils
 
 
@@ -44,6 +48,82 @@ def serper(keyword: str, country_code: str = "ch", language: str = "en"):
     return data
 
 
+class ValidationCache:
+    """
+    Append-only store of URL validation results (one JSON record per line).
+
+    Every result is appended and flushed as soon as it is known, so an
+    interrupted run keeps its progress. A later record for the same URL
+    wins; a truncated last line from an interrupted write is ignored.
+    Caches in the old single-JSON-object format (the same path, or the .json
+    file next to a missing .jsonl path) are converted on first load.
+    """
+
+    def __init__(self, path: str, read_only: bool = False):
+        self.path = path
+        self.read_only = read_only
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._file = None
+        self._load()
+
+    def _load(self):
+        path = self.path
+        if not os.path.exists(path):
+            legacy_path = os.path.splitext(path)[0] + ".json"
+            if path.endswith(".jsonl") and os.path.exists(legacy_path):
+                path = legacy_path
+            else:
+                return
+        with open(path, "r") as f:
+            text = f.read()
+        try:
+            legacy = json.loads(text)
+        except json.JSONDecodeError:
+            legacy = None
+        if isinstance(legacy, dict) and all(
+            isinstance(v, dict) for v in legacy.values()
+        ):
+            self.entries = legacy
+            if not self.read_only:
+                self._rewrite()
+            return
+        for line in text.splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            key = record.pop("normalized_url", None)
+            if key:
+                self.entries[key] = record
+
+    def _rewrite(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            for key, entry in self.entries.items():
+                f.write(json.dumps({"normalized_url": key, **entry}) + "\n")
+        os.replace(tmp_path, self.path)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, key: str, entry: Dict[str, Any]):
+        self.entries[key] = entry
+        if self.read_only:
+            return
+        if self._file is None:
+            self._file = open(self.path, "a")
+        self._file.write(json.dumps({"normalized_url": key, **entry}) + "\n")
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
 class Command(BaseCommand):
     help = "Discover new event URLs using Google Search and validation with AI"
 
@@ -63,8 +143,9 @@ class Command(BaseCommand):
         parser.add_argument(
             "--cache",
             type=str,
-            default="url_validation_cache.json",
-            help="Cache file for URL validation results",
+            default="url_validation_cache.jsonl",
+            help="Cache file for URL validation results (one JSON record per line, "
+            "appended as results come in)",
         )
         parser.add_argument(
             "--countries",
@@ -77,6 +158,30 @@ class Command(BaseCommand):
             action="store_true",
             help="Run without saving to file",
         )
+        parser.add_argument(
+            "--scrape-cache-ttl",
+            type=float,
+            help="Hours a cached scrape stays fresh before Firecrawl is asked again "
+            "(default: SCRAPE_CACHE_TTL_HOURS, 24). Use 0 to always re-scrape.",
+        )
+        parser.add_argument(
+            "--search-concurrency",
+            type=int,
+            default=5,
+            help="Maximum parallel Serper searches (default: 5)",
+        )
+        parser.add_argument(
+            "--scrape-concurrency",
+            type=int,
+            default=5,
+            help="Maximum parallel Firecrawl scrapes (default: 5)",
+        )
+        parser.add_argument(
+            "--llm-concurrency",
+            type=int,
+            default=8,
+            help="Maximum parallel OpenAI validation requests (default: 8)",
+        )
 
     def handle(self, *args, **options):
         dotenv.load_dotenv()
@@ -92,6 +197,9 @@ class Command(BaseCommand):
             )
             return
 
+        if options.get("scrape_cache_ttl") is not None:
+            set_scrape_cache_ttl(options["scrape_cache_ttl"])
+
         # Initialize services
         scraping_service = ScrapingService(
             api_key=os.environ["FIRECRAWL_API_KEY"],
@@ -105,7 +213,7 @@ class Command(BaseCommand):
         dry_run = options.get("dry_run", False)
 
         # Load validation cache
-        validation_cache = self.load_validation_cache(cache_file)
+        validation_cache = ValidationCache(cache_file, read_only=dry_run)
         self.stdout.write(
             self.style.SUCCESS(
                 f"Loaded {len(validation_cache)} cached validation results"
@@ -121,6 +229,14 @@ class Command(BaseCommand):
                 )
             )
 
+        # One LLM client for translation and validation
+        self.llm = self.create_llm()
+        self.limits = {
+            "serper": max(options["search_concurrency"], 1),
+            "firecrawl": max(options["scrape_concurrency"], 1),
+            "openai": max(options["llm_concurrency"], 1),
+        }
+
         # 1. Generate keywords with GPT-4o
         self.stdout.write("Generating keywords with GPT-4o...")
         keywords = self.generate_keywords()
@@ -155,12 +271,7 @@ class Command(BaseCommand):
 
         # 5. Execute Google searches
         self.stdout.write("Executing Google searches...")
-        all_urls = []
-        for i, query in enumerate(search_queries, 1):
-            self.stdout.write(f"Searching ({i}/{len(search_queries)}): {query}")
-            urls = self.search_for_events(query)
-            all_urls.extend(urls)
-            self.stdout.write(f"  Found {len(urls)} potential URLs")
+        all_urls = self.run_async(self.search_all(search_queries))
 
         self.stdout.write(
             self.style.SUCCESS(
@@ -181,15 +292,18 @@ class Command(BaseCommand):
             if URLUtils.normalize_url(url_data["url"]) not in validation_cache
         ]
 
-        # Also filter out URLs that are already in the valid_urls list
-        existing_valid_urls = {
+        # Also filter out URLs that are already in the valid_urls list, and
+        # URLs found by several queries (they would be validated in parallel)
+        seen_urls = {
             URLUtils.normalize_url(url_data["url"]) for url_data in valid_urls
         }
-        new_urls = [
-            url_data
-            for url_data in new_urls
-            if URLUtils.normalize_url(url_data["url"]) not in existing_valid_urls
-        ]
+        unique_urls = []
+        for url_data in new_urls:
+            normalized_url = URLUtils.normalize_url(url_data["url"])
+            if normalized_url not in seen_urls:
+                seen_urls.add(normalized_url)
+                unique_urls.append(url_data)
+        new_urls = unique_urls
 
         self.stdout.write(
             self.style.SUCCESS(f"Found {len(new_urls)} new URLs to process")
@@ -197,61 +311,19 @@ class Command(BaseCommand):
 
         # 7. Validate URLs with GPT-4o
         self.stdout.write("Validating URLs with GPT-4o...")
-        newly_valid_urls = []
-
-        for i, url_data in enumerate(new_urls, 1):
-            url = url_data["url"]
-            normalized_url = URLUtils.normalize_url(url)
-            self.stdout.write(f"Validating ({i}/{len(new_urls)}): {url}")
-
-            # Check if URL is already in the validation cache
-            if normalized_url in validation_cache:
-                cached_result = validation_cache[normalized_url]
-                is_valid = cached_result["is_valid"]
-                explanation = cached_result["explanation"]
-                event_type = cached_result["event_type"]
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f"  Using cached result: {explanation} (Type: {event_type})"
-                    )
-                )
-            else:
-                # Validate the URL
-                is_valid, event_type, explanation = self.validate_url_with_gpt(
-                    url_data, scraping_service
-                )
-
-                # Add to validation cache
-                validation_cache[normalized_url] = {
-                    "is_valid": is_valid,
-                    "explanation": explanation,
-                    "event_type": str(event_type.value),  # Convert enum to string
-                    "url": url,
-                    "title": url_data.get("title", ""),
-                    "snippet": url_data.get("snippet", ""),
-                    "query": url_data.get("query", ""),
-                }
-
-                # Save the cache after each validation to avoid losing results on interruption
-                if not dry_run:
-                    self.save_validation_cache(validation_cache, cache_file)
-
-            if is_valid:
-                url_data["validation"] = explanation
-                url_data["event_type"] = (
-                    event_type if isinstance(event_type, str) else str(event_type.value)
-                )
-                newly_valid_urls.append(url_data)
-                valid_urls.append(url_data)
-                self.stdout.write(
-                    self.style.SUCCESS(f"  Valid: {explanation} (Type: {event_type})")
+        try:
+            newly_valid_urls = self.run_async(
+                self.validate_all(
+                    new_urls,
+                    scraping_service,
+                    validation_cache,
+                    valid_urls,
+                    output_file,
+                    dry_run,
                 )
-
-                # Save valid URLs incrementally to avoid losing results on interruption
-                if not dry_run:
-                    self.save_urls_to_file(valid_urls, output_file)
-            else:
-                self.stdout.write(self.style.WARNING(f"  Invalid: {explanation}"))
+            )
+        finally:
+            validation_cache.close()
 
         self.stdout.write(
             self.style.SUCCESS(f"Found {len(newly_valid_urls)} new valid event URLs")
@@ -275,33 +347,114 @@ class Command(BaseCommand):
         self.stdout.write(f"- New valid event URLs: {len(newly_valid_urls)}")
         self.stdout.write(f"- Total valid event URLs: {len(valid_urls)}")
         self.stdout.write(f"- Validation cache size: {len(validation_cache)}")
+        scrape_cache = get_scrape_cache()
+        if scrape_cache:
+            self.stdout.write(f"- Scrape cache: {scrape_cache.stats()}")
 
         # Return None instead of the list to avoid Django's management command error
         return None
 
-    def load_validation_cache(self, cache_file: str) -> Dict[str, Dict[str, Any]]:
-        """Load validation cache from file"""
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, "r") as f:
-                    cache = json.load(f)
-                return cache
-            except Exception as e:
-                self.stderr.write(
-                    self.style.WARNING(f"Error loading validation cache: {str(e)}")
-                )
-        return {}
+    def create_llm(self) -> OpenAIResponses:
+        return OpenAIResponses(
+            model=settings.OPENAI_MODEL,
+            reasoning_options={"effort": settings.OPENAI_REASONING_EFFORT},
+            additional_kwargs={"temperature": NOT_GIVEN, "top_p": NOT_GIVEN},
+        )
 
-    def save_validation_cache(self, cache: Dict[str, Dict[str, Any]], cache_file: str):
-        """Save validation cache to file"""
-        try:
-            with open(cache_file, "w") as f:
-                json.dump(cache, f, indent=2)
-        except Exception as e:
-            self.stderr.write(
-                self.style.WARNING(f"Error saving validation cache: {str(e)}")
+    def run_async(self, coro):
+        """
+        Run a pipeline coroutine. Blocking calls (Serper, Firecrawl) run on a
+        thread pool large enough for all concurrency limits at once.
+        """
+
+        async def main():
+            loop = asyncio.get_running_loop()
+            loop.set_default_executor(
+                ThreadPoolExecutor(max_workers=sum(self.limits.values()))
+            )
+            return await coro
+
+        return asyncio.run(main())
+
+    async def search_all(self, search_queries: List[str]) -> List[Dict[str, Any]]:
+        """Run the Google searches, at most limits["serper"] at a time"""
+        semaphore = asyncio.Semaphore(self.limits["serper"])
+        done = 0
+
+        async def search(query):
+            nonlocal done
+            async with semaphore:
+                urls = await asyncio.to_thread(self.search_for_events, query)
+            done += 1
+            self.stdout.write(
+                f"Searched ({done}/{len(search_queries)}): {query}\n"
+                f"  Found {len(urls)} potential URLs"
+            )
+            return urls
+
+        results = await asyncio.gather(*(search(query) for query in search_queries))
+        # Keep the query order of the sequential version
+        return [url_data for urls in results for url_data in urls]
+
+    async def validate_all(
+        self,
+        new_urls: List[Dict[str, Any]],
+        scraping_service: ScrapingService,
+        validation_cache: ValidationCache,
+        valid_urls: List[Dict[str, Any]],
+        output_file: str,
+        dry_run: bool,
+    ) -> List[Dict[str, Any]]:
+        """
+        Validate URLs concurrently. Firecrawl and OpenAI have separate limits,
+        so scrapes of the next URLs continue while earlier ones wait for the
+        LLM. Results are recorded on the event loop thread as they complete.
+        """
+        scrape_semaphore = asyncio.Semaphore(self.limits["firecrawl"])
+        llm_semaphore = asyncio.Semaphore(self.limits["openai"])
+        newly_valid_urls = []
+        done = 0
+
+        async def validate(url_data):
+            nonlocal done
+            url = url_data["url"]
+            is_valid, event_type, explanation = await self.validate_url_with_gpt(
+                url_data, scraping_service, scrape_semaphore, llm_semaphore
+            )
+            done += 1
+            self.stdout.write(f"Validated ({done}/{len(new_urls)}): {url}")
+
+            validation_cache.add(
+                URLUtils.normalize_url(url),
+                {
+                    "is_valid": is_valid,
+                    "explanation": explanation,
+                    "event_type": str(event_type.value),  # Convert enum to string
+                    "url": url,
+                    "title": url_data.get("title", ""),
+                    "snippet": url_data.get("snippet", ""),
+                    "query": url_data.get("query", ""),
+                },
             )
 
+            if is_valid:
+                url_data["validation"] = explanation
+                url_data["event_type"] = str(event_type.value)
+                newly_valid_urls.append(url_data)
+                valid_urls.append(url_data)
+                self.stdout.write(
+                    self.style.SUCCESS(f"  Valid: {explanation} (Type: {event_type})")
+                )
+
+                # Save valid URLs incrementally to avoid losing results on interruption
+                if not dry_run:
+                    self.save_urls_to_file(valid_urls, output_file)
+            else:
+                self.stdout.write(self.style.WARNING(f"  Invalid: {explanation}"))
+
+        await asyncio.gather(*(validate(url_data) for url_data in new_urls))
+        return newly_valid_urls
+
     def load_existing_valid_urls(self, output_file: str) -> List[Dict[str, Any]]:
         """Load existing valid URLs from a file"""
         if not os.path.exists(output_file):
@@ -320,41 +473,7 @@ class Command(BaseCommand):
 
     def get_country_languages(self, country_codes=None) -> List[Dict[str, Any]]:
         """Get country-language pairs for search"""
-        COUNTRY_LANGUAGES = [
-            {"country": "Switzerland", "code": "CH", "languages": ["de", "fr", "it"]},
-            {"country": "Germany", "code": "DE", "languages": ["de"]},
-            {"country": "France", "code": "FR", "languages": ["fr"]},
-            {"country": "Italy", "code": "IT", "languages": ["it"]},
-            {"country": "Spain", "code": "ES", "languages": ["es"]},
-            {"country": "United Kingdom", "code": "GB", "languages": ["en"]},
-            {"country": "Austria", "code": "AT", "languages": ["de"]},
-            {"country": "Netherlands", "code": "NL", "languages": ["nl"]},
-            {"country": "Belgium", "code": "BE", "languages": ["nl", "fr"]},
-            {"country": "Portugal", "code": "PT", "languages": ["pt"]},
-            {"country": "Greece", "code": "GR", "languages": ["el"]},
-            {"country": "Croatia", "code": "HR", "languages": ["hr"]},
-            {"country": "Sweden", "code": "SE", "languages": ["sv"]},
-            {"country": "Denmark", "code": "DK", "languages": ["da"]},
-            {"country": "Norway", "code": "NO", "languages": ["no"]},
-            {"country": "Finland", "code": "FI", "languages": ["fi"]},
-            {"country": "Ireland", "code": "IE", "languages": ["en"]},
-            {"country": "Poland", "code": "PL", "languages": ["pl"]},
-            {"country": "Czech Republic", "code": "CZ", "languages": ["cs"]},
-            {"country": "Hungary", "code": "HU", "languages": ["hu"]},
-            {"country": "Slovenia", "code": "SI", "languages": ["sl"]},
-            {"country": "Malta", "code": "MT", "languages": ["mt", "en"]},
-            {"country": "Cyprus", "code": "CY", "languages": ["el", "tr"]},
-            {"country": "Morocco", "code": "MA", "languages": ["ar", "fr"]},
-            {"country": "Tunisia", "code": "TN", "languages": ["ar", "fr"]},
-            {"country": "Egypt", "code": "EG", "languages": ["ar", "en"]},
-            {"country": "United States", "code": "US", "languages": ["en"]},
-        ]
-
-        if country_codes:
-            # Filter by provided country codes
-            return [c for c in COUNTRY_LANGUAGES if c["code"] in country_codes]
-
-        return COUNTRY_LANGUAGES
+        return get_search_countries(country_codes)
 
     def translate_keywords(
         self, keywords: List[str], country_languages: List[Dict[str, Any]]
@@ -371,11 +490,7 @@ class Command(BaseCommand):
             languages.remove("en")
 
         translated_keywords = {}
-        llm = OpenAIResponses(
-            model=settings.OPENAI_MODEL,
-            reasoning_options={"effort": settings.OPENAI_REASONING_EFFORT},
-            additional_kwargs={"temperature": NOT_GIVEN, "top_p": NOT_GIVEN},
-        )
+        llm = self.llm
 
         for language in languages:
             self.stdout.write(f"Translating keywords to {language}...")
@@ -499,26 +614,24 @@ class Command(BaseCommand):
             )
             return []
 
-    def validate_url_with_gpt(
-        self, url_data: Dict[str, Any], scraping_service: ScrapingService
+    async def validate_url_with_gpt(
+        self,
+        url_data: Dict[str, Any],
+        scraping_service: ScrapingService,
+        scrape_semaphore: asyncio.Semaphore,
+        llm_semaphore: asyncio.Semaphore,
     ) -> tuple:
         """Use AI to validate if a URL is an event website and determine its type"""
         url = url_data["url"]
 
         try:
             # Scrape the webpage content
-            content = scraping_service.scrape(url)
+            async with scrape_semaphore:
+                content = await asyncio.to_thread(scraping_service.scrape, url)
 
             if not content:
                 return False, EventType.UNKNOWN, "Failed to scrape content"
 
-            # Create the LLM client using llama_index
-            llm = OpenAIResponses(
-                model=settings.OPENAI_MODEL,
-                reasoning_options={"effort": settings.OPENAI_REASONING_EFFORT},
-                additional_kwargs={"temperature": NOT_GIVEN, "top_p": NOT_GIVEN},
-            )
-
             # Create the prompt
             prompt = f"""
             You are an expert at analyzing websites related to open water swimming events.
@@ -547,8 +660,9 @@ class Command(BaseCommand):
             (not pool swimming, not general sports, no swim vacations).
             """
 
-            # Get completion from LLM
-            response = llm.complete(prompt)
+            # Get completion from the shared LLM client
+            async with llm_semaphore:
+                response = await self.llm.acomplete(prompt)
 
             # Extract the JSON from the response
             result_text = str(response)
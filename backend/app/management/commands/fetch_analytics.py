@@ -3,6 +3,7 @@ from datetime import date
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
+from app.graphql import cache as graphql_cache
 from app.models import Event
 from app.services.google_analytics_service import GoogleAnalyticsService
 
@@ -14,8 +15,14 @@ class Command(BaseCommand):
         parser.add_argument(
             "--year",
             type=int,
-            default=date.today().year,
-            help="Year to fetch analytics for (default: current year)",
+            nargs="+",
+            default=[date.today().year],
+            help="Year(s) to fetch analytics for (default: current year)",
+        )
+        parser.add_argument(
+            "--from-snapshot",
+            action="store_true",
+            help="Use the last fetched GA4 report instead of calling the API",
         )
         parser.add_argument(
             "--dry-run",
@@ -29,9 +36,12 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
-        year = options.get("year")
+        years = options.get("year")
+        if isinstance(years, int):
+            years = [years]
         dry_run = options.get("dry_run", False)
         limit = options.get("limit")
+        from_snapshot = options.get("from_snapshot", False)
 
         if dry_run:
             self.stdout.write(
@@ -46,20 +56,42 @@ class Command(BaseCommand):
             stderr=self.stderr,
         )
 
-        # Fetch all event page analytics in one batch
-        self.stdout.write(f"Fetching analytics data for {year}...")
-        page_stats = service.fetch_page_active_users(
-            year=year,
+        # Fetch all event page analytics for all years in one batch
+        years_label = ", ".join(str(year) for year in years)
+        self.stdout.write(f"Fetching analytics data for {years_label}...")
+        stats_by_year = service.fetch_page_active_users_by_year(
+            years=years,
             page_path_filter="/event/",
+            from_snapshot=from_snapshot,
         )
 
-        if not page_stats:
+        if not any(stats_by_year.values()):
             self.stderr.write(
                 self.style.ERROR("No analytics data fetched. Check configuration.")
             )
             return
 
-        self.stdout.write(f"Fetched {len(page_stats)} page paths from GA4")
+        for year in years:
+            page_stats = stats_by_year.get(year)
+            if not page_stats:
+                self.stdout.write(
+                    self.style.WARNING(f"\nNo analytics data for {year}")
+                )
+                continue
+            self.stdout.write(
+                f"\nFetched {len(page_stats)} page paths from GA4 for {year}"
+            )
+            self._update_year(service, year, page_stats, dry_run, limit)
+
+    def _update_year(
+        self,
+        service: GoogleAnalyticsService,
+        year: int,
+        page_stats: dict,
+        dry_run: bool,
+        limit: int = None,
+    ):
+        """Match one year's page statistics to that year's events and save them."""
 
         # Get events to update (events in the specified year with slugs)
         events_qs = Event.objects.filter(
@@ -94,44 +126,45 @@ class Command(BaseCommand):
             self.stdout.write(f"Limited to {len(event_stats)} events")
 
         # Update events
-        updated_count = 0
+        events_by_id = {event.id: event for event in events}
+        events_to_update = []
         now = timezone.now()
 
         self.stdout.write("\nUpdating events:")
         for event_id, active_users in event_stats.items():
-            try:
-                event = Event.objects.get(id=event_id)
+            event = events_by_id[event_id]
 
-                if dry_run:
-                    self.stdout.write(
-                        f"  [DRY RUN] Would update {event.name} ({event.slug}): "
-                        f"{active_users} active users"
-                    )
-                else:
-                    event.active_user_count = active_users
-                    event.active_user_count_updated_at = now
-                    event.save(
-                        update_fields=[
-                            "active_user_count",
-                            "active_user_count_updated_at",
-                        ]
-                    )
-                    self.stdout.write(
-                        self.style.SUCCESS(
-                            f"  Updated {event.name}: {active_users} active users"
-                        )
+            if dry_run:
+                self.stdout.write(
+                    f"  [DRY RUN] Would update {event.name} ({event.slug}): "
+                    f"{active_users} active users"
+                )
+            else:
+                event.active_user_count = active_users
+                event.active_user_count_updated_at = now
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"  Updated {event.name}: {active_users} active users"
                     )
-                updated_count += 1
+                )
+            events_to_update.append(event)
 
-            except Event.DoesNotExist:
-                self.stderr.write(self.style.ERROR(f"  Event {event_id} not found"))
+        if not dry_run:
+            Event.objects.bulk_update(
+                events_to_update,
+                ["active_user_count", "active_user_count_updated_at"],
+                batch_size=500,
+            )
+            # bulk_update() sends no post_save signals
+            graphql_cache.invalidate(graphql_cache.EVENTS)
+        updated_count = len(events_to_update)
 
         # Summary
         prefix = "[DRY RUN] " if dry_run else ""
         total_events = len(events)
         self.stdout.write(
             self.style.SUCCESS(
-                f"\n{prefix}Summary:\n"
+                f"\n{prefix}Summary for {year}:\n"
                 f"- Events with analytics: {updated_count}\n"
                 f"- Events without analytics: {total_events - len(event_stats)}\n"
                 f"- Total events in {year}: {total_events}"
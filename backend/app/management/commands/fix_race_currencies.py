@@ -1,11 +1,9 @@
-import csv
 import logging
-import os
 from datetime import datetime
-from django.conf import settings
 from django.core.management.base import BaseCommand
 from djmoney.money import Money
 from app.models import Event, Race
+from app.utils.country_utils import country_currencies
 
 logger = logging.getLogger(__name__)
 
@@ -45,7 +43,7 @@ class Command(BaseCommand):
         logger.addHandler(console_handler)
 
         # Load country to currency mapping
-        country_to_currency = self._load_country_currency_mapping()
+        country_to_currency = country_currencies()
         if not country_to_currency:
             self.stdout.write(
                 self.style.ERROR("Failed to load country-to-currency mapping")
@@ -145,33 +143,3 @@ class Command(BaseCommand):
                     "This was a dry run - no changes were made to the database"
                 )
             )
-
-    def _load_country_currency_mapping(self):
-        """Load country code to currency code mapping from CSV file"""
-        csv_path = os.path.join(
-            settings.BASE_DIR,
-            "app",
-            "data",
-            "country-code-to-currency-code-mapping.csv",
-        )
-
-        if not os.path.exists(csv_path):
-            self.stderr.write(f"Mapping file not found: {csv_path}")
-            return {}
-
-        country_to_currency = {}
-
-        try:
-            with open(csv_path, "r") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    country_code = row.get("CountryCode")
-                    currency_code = row.get("Code")
-
-                    if country_code and currency_code:
-                        country_to_currency[country_code] = currency_code
-        except Exception as e:
-            self.stderr.write(f"Error reading mapping file: {str(e)}")
-            return {}
-
-        return country_to_currency
@@ -1,7 +1,7 @@
 from django.core.management.base import BaseCommand
-from django.db.models import Q
+from django.db.models import Count
 from app.models import Location, Event
-from app.services.geocoding_service import GeocodingService
+from app.utils.geo_utils import GridIndex
 from typing import List, Tuple, Dict
 import click
 
@@ -13,30 +13,30 @@ def find_nearby_locations(
     Find locations that are within the specified distance of each other
     Returns a list of tuples (location_to_keep, [locations_to_merge])
     """
-    locations = Location.objects.filter(lat__isnull=False, lng__isnull=False)
+    locations = list(
+        Location.objects.filter(lat__isnull=False, lng__isnull=False).annotate(
+            event_count=Count("events")
+        )
+    )
+    distance_km = distance_meters / 1000
+    index = GridIndex(
+        [loc.lat for loc in locations], [loc.lng for loc in locations], distance_km
+    )
+    neighbours = index.neighbours_within(distance_km)
+
     nearby_pairs = []
     processed = set()
-    geocoding_service = GeocodingService()
 
-    for loc1 in locations:
-        if loc1.id in processed:
+    for i, loc1 in enumerate(locations):
+        if i in processed:
             continue
 
         nearby = []
-        for loc2 in locations:
-            if loc1.id == loc2.id or loc2.id in processed:
+        for j, distance in neighbours[i]:
+            if j in processed:
                 continue
-
-            distance = (
-                geocoding_service.get_distance_from_lat_lng_in_km(
-                    loc1.lat, loc1.lng, loc2.lat, loc2.lng
-                )
-                * 1000
-            )  # Convert to meters
-
-            if distance <= distance_meters:
-                nearby.append((loc2, distance))
-                processed.add(loc2.id)
+            nearby.append((locations[j], distance * 1000))  # Convert to meters
+            processed.add(j)
 
         if nearby:
             # Add the current location to the group for comparison
@@ -50,7 +50,7 @@ def find_nearby_locations(
                 key=lambda x: (
                     not x[0].is_verified(),  # False (0) comes before True (1)
                     not bool(x[0].header_photo),  # False (0) comes before True (1)
-                    x[0].events.count(),  # Lower numbers come first
+                    x[0].event_count,  # Lower numbers come first
                 )
             )
 
@@ -59,8 +59,7 @@ def find_nearby_locations(
             merge_locs = all_locations[1:]
 
             nearby_pairs.append((keep_loc, merge_locs))
-            processed.add(loc1.id)
-            processed.update(loc[0].id for loc in merge_locs)
+            processed.add(i)
 
     return nearby_pairs
 
@@ -80,7 +79,7 @@ def print_location_info(location: Location, distance: float = None) -> str:
         f"Water Type: {location.water_type or 'N/A'}\n"
         f"Verified: {'Yes' if location.is_verified() else 'No'}\n"
         f"Has Image: {'Yes' if location.header_photo else 'No'}\n"
-        f"Number of Events: {location.events.count()}\n"
+        f"Number of Events: {location.event_count}\n"
         f"{distance_info}"
         "---"
     )
@@ -179,11 +178,13 @@ class Command(BaseCommand):
                     # Update all events to point to the kept location
                     total_events_updated = 0
                     for loc, _ in merge_locs:
-                        event_count = loc.events.count()
-                        Event.objects.filter(location=loc).update(location=keep_loc)
-                        total_events_updated += event_count
+                        total_events_updated += Event.objects.filter(
+                            location=loc
+                        ).update(location=keep_loc)
                         # Delete the merged location
                         loc.delete()
+                    # QuerySet.update() bypasses the rating signals
+                    keep_loc.update_average_rating()
                     self.stdout.write(
                         self.style.SUCCESS(
                             f"Locations merged successfully. {total_events_updated} events updated to the kept location."
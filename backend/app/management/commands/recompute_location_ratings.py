@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from app.graphql import cache as graphql_cache
+from app.models import Location
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the stored rating totals and average rating of locations "
+        "from their reviews (backfill or repair)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--location",
+            type=int,
+            nargs="+",
+            help="Only recompute these location IDs",
+        )
+
+    def handle(self, *args, **options):
+        locations = Location.objects.all()
+        if options.get("location"):
+            locations = locations.filter(pk__in=options["location"])
+
+        changed = Location.recompute_rating_aggregates(locations)
+        if changed:
+            # bulk_update() sends no post_save signals
+            graphql_cache.invalidate(graphql_cache.LOCATIONS)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Updated the ratings of {changed} locations")
+        )
@@ -1,17 +1,20 @@
 import base64
 import logging
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 import click
 from tqdm import tqdm
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
+from django.db.models import Count, prefetch_related_objects
 from django.utils import timezone
 
 from app.models import Event, Race
 from app.services.geocoding_service import GeocodingService
 from app.services.llm_service import LLMService
 from app.services.smart_merge_models import MergeDecision
+from app.utils.geo_utils import GridIndex, haversine_km_array
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +24,12 @@ def _yn(val):
     return "YES" if val else " - "
 
 
+def _location_event_count(location):
+    """Event count prefetched by _find_candidates, or queried if missing."""
+    count = getattr(location, "event_count", None)
+    return location.events.count() if count is None else count
+
+
 def format_event_for_llm(event, label):
     """Format event info for the LLM prompt (plain text)."""
     races = event.races.all()
@@ -57,7 +66,7 @@ def format_location_for_llm(location, label):
         f"  Coordinates: {location.lat}, {location.lng}\n"
         f"  Verified: {'Yes' if location.is_verified() else 'No'}\n"
         f"  Has Image: {'Yes' if location.header_photo else 'No'}\n"
-        f"  Events: {location.events.count()}"
+        f"  Events: {_location_event_count(location)}"
     )
 
 
@@ -130,8 +139,8 @@ def format_comparison_table(stdout, style, event_a, event_b,
     ))
     stdout.write(row(
         "# Events",
-        loc_a.events.count(),
-        loc_b.events.count(),
+        _location_event_count(loc_a),
+        _location_event_count(loc_b),
     ))
     stdout.write(row("ID", loc_a.id, loc_b.id))
 
@@ -199,6 +208,71 @@ def build_llm_prompt(event_a, event_b, loc_a, loc_b, distance_m):
     )
 
 
+class MergeDecisionQueue:
+    """
+    Candidates in review order, each with its LLM merge decision requested
+    up to ``window`` candidates ahead of the one being reviewed.
+
+    After a merge, ``invalidate`` withdraws the requests of later candidates
+    sharing its events or locations. Those are reloaded with ``refresh`` and
+    requested again once the window reaches them; a candidate that ``refresh``
+    turns into None is yielded as (None, None) without a request.
+    """
+
+    def __init__(self, candidates, window, request, refresh):
+        self.candidates = list(candidates)
+        self.window = window
+        self.request = request
+        self.refresh = refresh
+        # Ids at construction: merges clear the pk of deleted instances
+        self.keys = [self._key(candidate) for candidate in self.candidates]
+        self.pending = {}
+        self.stale = set()
+        self.position = 0
+
+    @staticmethod
+    def _key(candidate):
+        event_a, event_b, loc_a, loc_b, _ = candidate
+        return (event_a.id, event_b.id), {loc_a.id, loc_b.id}
+
+    def __iter__(self):
+        while self.position < len(self.candidates):
+            end = min(self.position + self.window, len(self.candidates))
+            for j in range(self.position, end):
+                self._submit(j)
+            yield (
+                self.candidates[self.position],
+                self.pending.pop(self.position, None),
+            )
+            self.position += 1
+
+    def _submit(self, j):
+        if j in self.pending:
+            return
+        if j in self.stale:
+            self.stale.discard(j)
+            self.candidates[j] = self.refresh(self.keys[j][0])
+            if self.candidates[j] is not None:
+                self.keys[j] = self._key(self.candidates[j])
+        if self.candidates[j] is not None:
+            self.pending[j] = self.request(self.candidates[j])
+
+    def invalidate(self):
+        """The candidate being reviewed was merged."""
+        event_ids, location_ids = self.keys[self.position]
+        for j in range(self.position + 1, len(self.candidates)):
+            if self.candidates[j] is None:
+                continue
+            other_events, other_locations = self.keys[j]
+            if set(event_ids) & set(other_events) or (
+                location_ids & other_locations
+            ):
+                future = self.pending.pop(j, None)
+                if future is not None:
+                    future.cancel()
+                self.stale.add(j)
+
+
 class Command(BaseCommand):
     help = (
         "Find same-date events at nearby (but different) locations, "
@@ -246,6 +320,13 @@ class Command(BaseCommand):
             default=None,
             help="Filter events by country code (e.g. CH, DE)",
         )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=4,
+            help="Number of LLM merge decisions requested in parallel "
+            "(default: 4). Candidates are still reviewed in order.",
+        )
 
     def handle(self, *args, **options):
         distance_m = options["distance"]
@@ -255,12 +336,13 @@ class Command(BaseCommand):
         confidence_threshold = options["confidence_threshold"]
         no_vision = options["no_vision"]
         country = options["country"]
+        concurrency = max(options["concurrency"], 1)
 
         geo = GeocodingService(stdout=self.stdout, stderr=self.stderr)
         llm = LLMService()
 
         # Step 1: Find candidate groups
-        candidates = self._find_candidates(geo, distance_m, country)
+        candidates = self._find_candidates(distance_m, country)
 
         if not candidates:
             self.stdout.write(self.style.SUCCESS("No candidate merge groups found."))
@@ -273,131 +355,153 @@ class Command(BaseCommand):
 
         merged = 0
         skipped = 0
-        deleted_ids = set()  # track already-merged events
 
         total = len(candidates)
-        for i, (event_a, event_b, loc_a, loc_b, dist) in enumerate(
-            candidates, 1
-        ):
-            # Skip if either event was already merged
-            if event_a.id in deleted_ids or event_b.id in deleted_ids:
-                skipped += 1
-                continue
-
-            # Header
-            self.stdout.write("")
-            self.stdout.write(
-                self.style.MIGRATE_HEADING(
-                    f"  [{i}/{total}]  "
-                    f"{event_a.date_start}  "
-                    f"{dist:.0f}m apart"
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        decisions = MergeDecisionQueue(
+            candidates,
+            concurrency,
+            request=lambda candidate: executor.submit(
+                self._get_merge_decision, llm, geo, *candidate, no_vision
+            ),
+            refresh=lambda event_ids: self._refresh_candidate(
+                event_ids, distance_m
+            ),
+        )
+        try:
+            for i, (candidate, pending_decision) in enumerate(decisions, 1):
+                # Merged away or moved apart by an earlier merge
+                if candidate is None:
+                    skipped += 1
+                    continue
+                event_a, event_b, loc_a, loc_b, dist = candidate
+                result = self._review_candidate(
+                    i, total, event_a, event_b, loc_a, loc_b, dist,
+                    pending_decision, dry_run, auto, confidence_threshold,
                 )
-            )
+                if result == "merged":
+                    merged += 1
+                    decisions.invalidate()
+                elif result == "skipped":
+                    skipped += 1
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
-            # Side-by-side comparison
-            format_comparison_table(
-                self.stdout, self.style,
-                event_a, event_b, loc_a, loc_b,
+        # Summary
+        self.stdout.write("")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"  Done: {merged} merged, {skipped} skipped "
+                f"(of {total} candidates)"
             )
+        )
 
-            # Get LLM decision
-            self.stdout.write("")
-            self.stdout.write("  Asking LLM...")
-            decision = self._get_merge_decision(
-                llm, geo, event_a, event_b,
-                loc_a, loc_b, dist, no_vision,
+    def _review_candidate(
+        self, i, total, event_a, event_b, loc_a, loc_b, dist,
+        pending_decision, dry_run, auto, confidence_threshold,
+    ):
+        """
+        Show one candidate pair with its LLM decision and apply it if
+        confirmed. Returns "merged", "skipped" or None (dry run).
+        """
+        # Header
+        self.stdout.write("")
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f"  [{i}/{total}]  "
+                f"{event_a.date_start}  "
+                f"{dist:.0f}m apart"
             )
+        )
 
-            if decision is None:
-                self.stdout.write(
-                    self.style.WARNING("  LLM failed — skipped")
-                )
-                skipped += 1
-                continue
+        # Side-by-side comparison
+        format_comparison_table(
+            self.stdout, self.style,
+            event_a, event_b, loc_a, loc_b,
+        )
 
-            if decision.confidence < 0.3:
-                self.stdout.write(
-                    self.style.WARNING(
-                        f"  Low confidence "
-                        f"({decision.confidence:.0%}) — skipped"
-                    )
-                )
-                skipped += 1
-                continue
+        # Get LLM decision
+        self.stdout.write("")
+        self.stdout.write("  Asking LLM...")
+        # Requested ahead of time by MergeDecisionQueue
+        decision = pending_decision.result()
 
-            # Decision box
-            conf_pct = f"{decision.confidence:.0%}"
-            keep_e = decision.keep_event
-            keep_l = decision.keep_location
-            self.stdout.write("")
-            self.stdout.write(
-                self.style.SUCCESS(
-                    f"  RECOMMENDATION  (confidence {conf_pct})"
-                )
-            )
+        if decision is None:
             self.stdout.write(
-                f"  Keep location {keep_l}  "
-                f"{decision.location_reasoning}"
-            )
-            self.stdout.write(
-                f"  Keep event    {keep_e}  "
-                f"{decision.event_reasoning}"
+                self.style.WARNING("  LLM failed — skipped")
             )
+            return "skipped"
 
-            flags = []
-            if decision.merge_races:
-                flags.append("races")
-            if decision.merge_description:
-                flags.append("description")
-            if decision.merge_website:
-                flags.append("website")
-            if decision.merge_flyer:
-                flags.append("flyer")
-            if flags:
-                self.stdout.write(
-                    f"  Copy from secondary: {', '.join(flags)}"
-                )
-
-            if dry_run:
-                self.stdout.write(
-                    self.style.WARNING("  [dry-run] no changes")
-                )
-                continue
-
-            # Confirm
-            should_apply = False
-            if auto and decision.confidence >= confidence_threshold:
-                self.stdout.write(
-                    self.style.SUCCESS("  Auto-applying")
-                )
-                should_apply = True
-            else:
-                should_apply = click.confirm(
-                    "  Apply this merge?", default=True
-                )
-
-            if should_apply:
-                deleted_event_id = self._execute_merge(
-                    decision, event_a, event_b, loc_a, loc_b
-                )
-                deleted_ids.add(deleted_event_id)
-                merged += 1
-            else:
-                self.stdout.write(
-                    self.style.WARNING("  Skipped")
+        if decision.confidence < 0.3:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"  Low confidence "
+                    f"({decision.confidence:.0%}) — skipped"
                 )
-                skipped += 1
+            )
+            return "skipped"
 
-        # Summary
+        # Decision box
+        conf_pct = f"{decision.confidence:.0%}"
+        keep_e = decision.keep_event
+        keep_l = decision.keep_location
         self.stdout.write("")
         self.stdout.write(
             self.style.SUCCESS(
-                f"  Done: {merged} merged, {skipped} skipped "
-                f"(of {total} candidates)"
+                f"  RECOMMENDATION  (confidence {conf_pct})"
             )
         )
+        self.stdout.write(
+            f"  Keep location {keep_l}  "
+            f"{decision.location_reasoning}"
+        )
+        self.stdout.write(
+            f"  Keep event    {keep_e}  "
+            f"{decision.event_reasoning}"
+        )
+
+        flags = []
+        if decision.merge_races:
+            flags.append("races")
+        if decision.merge_description:
+            flags.append("description")
+        if decision.merge_website:
+            flags.append("website")
+        if decision.merge_flyer:
+            flags.append("flyer")
+        if flags:
+            self.stdout.write(
+                f"  Copy from secondary: {', '.join(flags)}"
+            )
 
-    def _find_candidates(self, geo, distance_m, country):
+        if dry_run:
+            self.stdout.write(
+                self.style.WARNING("  [dry-run] no changes")
+            )
+            return None
+
+        # Confirm
+        should_apply = False
+        if auto and decision.confidence >= confidence_threshold:
+            self.stdout.write(
+                self.style.SUCCESS("  Auto-applying")
+            )
+            should_apply = True
+        else:
+            should_apply = click.confirm(
+                "  Apply this merge?", default=True
+            )
+
+        if should_apply:
+            self._execute_merge(decision, event_a, event_b, loc_a, loc_b)
+            return "merged"
+        else:
+            self.stdout.write(
+                self.style.WARNING("  Skipped")
+            )
+            return "skipped"
+
+    def _find_candidates(self, distance_m, country):
         """Find same-date events at nearby but different locations."""
         current_date = timezone.now().date()
         events = Event.objects.filter(
@@ -420,35 +524,84 @@ class Command(BaseCommand):
         }
 
         candidates = []
-        seen_pairs = set()
+        max_km = distance_m / 1000
 
         for date, date_events in tqdm(
             multi_dates.items(),
             desc="Scanning dates",
             unit="date",
         ):
-            for i, e1 in enumerate(date_events):
-                for e2 in date_events[i + 1:]:
+            # Grid over the bucket's locations: only events in neighbouring
+            # cells are compared
+            index = GridIndex(
+                [e.location.lat for e in date_events],
+                [e.location.lng for e in date_events],
+                cell_km=max_km,
+            )
+            for i, neighbours in enumerate(index.neighbours_within(max_km)):
+                e1 = date_events[i]
+                for j, dist_km in neighbours:
+                    if j <= i:
+                        continue  # Each pair once
+                    e2 = date_events[j]
                     if e1.location_id == e2.location_id:
                         continue  # Same location — handled by merge_events
-
-                    pair_key = tuple(sorted([e1.id, e2.id]))
-                    if pair_key in seen_pairs:
-                        continue
-
-                    loc1, loc2 = e1.location, e2.location
-                    dist = geo.get_distance_from_lat_lng_in_km(
-                        loc1.lat, loc1.lng, loc2.lat, loc2.lng
-                    ) * 1000
-
-                    if dist <= distance_m:
-                        seen_pairs.add(pair_key)
-                        candidates.append((e1, e2, loc1, loc2, dist))
+                    candidates.append(
+                        (e1, e2, e1.location, e2.location, dist_km * 1000)
+                    )
 
         # Sort by distance (closest first)
         candidates.sort(key=lambda x: x[4])
+        self._prefetch_candidate_details(candidates)
         return candidates
 
+    def _prefetch_candidate_details(self, candidates):
+        """
+        Load the races and location event counts shown for every candidate
+        in three queries instead of several per candidate.
+        """
+        events = {}
+        locations = []
+        for event_a, event_b, loc_a, loc_b, _ in candidates:
+            events[event_a.id] = event_a
+            events[event_b.id] = event_b
+            locations += [loc_a, loc_b]
+
+        prefetch_related_objects(list(events.values()), "races")
+
+        counts = dict(
+            Event.objects.filter(location_id__in={loc.id for loc in locations})
+            .values("location_id")
+            .annotate(n=Count("id"))
+            .values_list("location_id", "n")
+        )
+        # Events of the same location carry separate Location instances
+        for location in locations:
+            location.event_count = counts.get(location.id, 0)
+
+    def _refresh_candidate(self, event_ids, distance_m):
+        """
+        Reload a candidate pair after a merge touched its events or
+        locations. Returns None if it is no longer a candidate.
+        """
+        events = Event.objects.select_related(
+            "location", "organizer"
+        ).in_bulk(event_ids)
+        if len(events) < 2:
+            return None  # One of the events was merged away
+        event_a, event_b = (events[pk] for pk in event_ids)
+        loc_a, loc_b = event_a.location, event_b.location
+        if event_a.location_id == event_b.location_id:
+            return None  # Same location now — handled by merge_events
+        dist_m = 1000 * float(
+            haversine_km_array(loc_a.lat, loc_a.lng, loc_b.lat, loc_b.lng)
+        )
+        if dist_m > distance_m:
+            return None
+        candidate = (event_a, event_b, loc_a, loc_b, dist_m)
+        self._prefetch_candidate_details([candidate])
+        return candidate
+
     def _get_merge_decision(
         self, llm, geo, event_a, event_b, loc_a, loc_b, dist, no_vision
     ):
@@ -582,6 +735,8 @@ class Command(BaseCommand):
                 Event.objects.filter(location=lose_loc).update(
                     location=keep_loc
                 )
+                # QuerySet.update() bypasses the rating signals
+                keep_loc.update_average_rating()
                 actions.append(
                     f"moved {remaining} event(s) to loc #{keep_loc.id}"
                 )
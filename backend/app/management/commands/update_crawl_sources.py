@@ -18,9 +18,12 @@ from django.utils.text import slugify
 import dotenv
 from tqdm import tqdm
 
+from app.graphql import cache as graphql_cache
 from app.models import Event, Race, CrawlSource
 from app.services.event_crawler import EventCrawler
 from app.services.event_processor import EventProcessor
+from app.services.extraction_cache import get_extraction_cache
+from app.services.scrape_cache import get_scrape_cache, set_scrape_cache_ttl
 from app.utils.url_utils import URLUtils
 
 
@@ -68,6 +71,12 @@ class Command(BaseCommand):
             action="store_true",
             help="Process ALL CrawlSources, not just those with events in target year",
         )
+        parser.add_argument(
+            "--scrape-cache-ttl",
+            type=float,
+            help="Hours a cached scrape stays fresh before Firecrawl is asked again "
+            "(default: SCRAPE_CACHE_TTL_HOURS, 24). Use 0 to always re-scrape.",
+        )
 
     def handle(self, *args, **options):
         dotenv.load_dotenv()
@@ -79,6 +88,8 @@ class Command(BaseCommand):
         force = options.get("force", False)
         check_interval_days = options.get("check_interval", 30)
         process_all = options.get("all", False)
+        if options.get("scrape_cache_ttl") is not None:
+            set_scrape_cache_ttl(options["scrape_cache_ttl"])
 
         # Set up logging
         self._setup_logging()
@@ -130,45 +141,49 @@ class Command(BaseCommand):
             ncols=100,
         )
 
-        for crawl_source in progress_bar:
-            progress_bar.set_postfix_str(f"{crawl_source.name[:30]}...")
-            self.logger.info(
-                f"Processing CrawlSource: {crawl_source.name} (ID: {crawl_source.id}, type: {crawl_source.source_type})"
-            )
+        # Publish cache invalidations in batches instead of once per saved event
+        with graphql_cache.deferred_invalidation():
+            for crawl_source in progress_bar:
+                progress_bar.set_postfix_str(f"{crawl_source.name[:30]}...")
+                self.logger.info(
+                    f"Processing CrawlSource: {crawl_source.name} "
+                    f"(ID: {crawl_source.id}, type: {crawl_source.source_type})"
+                )
 
-            try:
-                # Dispatch based on source type
-                if crawl_source.source_type == "calendar":
-                    result = self._update_calendar_source(
-                        crawl_source, target_year, dry_run
+                try:
+                    # Dispatch based on source type
+                    if crawl_source.source_type == "calendar":
+                        result = self._update_calendar_source(
+                            crawl_source, target_year, dry_run
+                        )
+                    else:
+                        result = self._update_series_source(
+                            crawl_source, crawler, target_year, dry_run
+                        )
+
+                    if result["success"]:
+                        successful_sources += 1
+                        events_updated += result.get("updated", 0)
+                        events_not_found += result.get("not_found", 0)
+                        # Both series and calendar
+                        events_created += result.get("created", 0)
+                        events_skipped += result.get("skipped", 0)
+                    else:
+                        failed_sources += 1
+
+                except Exception as e:
+                    tqdm.write(
+                        self.style.ERROR(f"Failed to process CrawlSource: {str(e)}")
                     )
-                else:
-                    result = self._update_series_source(
-                        crawl_source, crawler, target_year, dry_run
+                    self.logger.error(
+                        f"Failed to process CrawlSource {crawl_source.id}: {str(e)}"
                     )
-
-                if result["success"]:
-                    successful_sources += 1
-                    events_updated += result.get("updated", 0)
-                    events_not_found += result.get("not_found", 0)
-                    events_created += result.get("created", 0)  # Both series and calendar
-                    events_skipped += result.get("skipped", 0)
-                else:
                     failed_sources += 1
 
-            except Exception as e:
-                tqdm.write(
-                    self.style.ERROR(f"Failed to process CrawlSource: {str(e)}")
-                )
-                self.logger.error(
-                    f"Failed to process CrawlSource {crawl_source.id}: {str(e)}"
+                # Update progress bar
+                progress_bar.set_description(
+                    f"OK:{successful_sources} FAIL:{failed_sources}"
                 )
-                failed_sources += 1
-
-            # Update progress bar
-            progress_bar.set_description(
-                f"OK:{successful_sources} FAIL:{failed_sources}"
-            )
 
         # Summary
         dry_run_prefix = "[DRY RUN] " if dry_run else ""
@@ -182,6 +197,12 @@ class Command(BaseCommand):
             f"- Events not matched: {events_not_found}",
             f"- Total CrawlSources processed: {len(crawl_sources)}",
         ]
+        scrape_cache = get_scrape_cache()
+        if scrape_cache:
+            summary_lines.append(f"- Scrape cache: {scrape_cache.stats()}")
+        extraction_cache = get_extraction_cache()
+        if extraction_cache:
+            summary_lines.append(f"- Extraction cache: {extraction_cache.stats()}")
 
         self.stdout.write(self.style.SUCCESS("\n".join(summary_lines)))
 
@@ -7,9 +7,12 @@ from django.utils.text import slugify
 import dotenv
 from tqdm import tqdm
 
+from app.graphql import cache as graphql_cache
 from app.models import Event, Race
 from app.services.event_crawler import EventCrawler
 from app.services.event_processor import EventProcessor
+from app.services.extraction_cache import get_extraction_cache
+from app.services.scrape_cache import get_scrape_cache, set_scrape_cache_ttl
 
 
 class Command(BaseCommand):
@@ -46,6 +49,12 @@ class Command(BaseCommand):
             action="store_true",
             help="Force check all events, ignoring last check date",
         )
+        parser.add_argument(
+            "--scrape-cache-ttl",
+            type=float,
+            help="Hours a cached scrape stays fresh before Firecrawl is asked again "
+            "(default: SCRAPE_CACHE_TTL_HOURS, 24). Use 0 to always re-scrape.",
+        )
 
     def handle(self, *args, **options):
         dotenv.load_dotenv()
@@ -55,6 +64,8 @@ class Command(BaseCommand):
         dry_run = options.get("dry_run", False)
         check_interval_days = options.get("check_interval", 30)
         force = options.get("force", False)
+        if options.get("scrape_cache_ttl") is not None:
+            set_scrape_cache_ttl(options["scrape_cache_ttl"])
 
         # Set up logging
         self._setup_logging()
@@ -118,32 +129,34 @@ class Command(BaseCommand):
             ncols=100,
         )
 
-        for event in progress_bar:
-            progress_bar.set_postfix_str(f"{event.name[:30]}...")
-            self.logger.info(f"Processing event: {event.name} (ID: {event.id})")
-
-            try:
-                result = self._update_event(
-                    event, processor, crawler, target_year, dry_run
-                )
-                if result == "success":
-                    successful += 1
-                elif result == "not_found":
-                    not_found += 1
-                else:
+        # Publish cache invalidations in batches instead of once per saved event
+        with graphql_cache.deferred_invalidation():
+            for event in progress_bar:
+                progress_bar.set_postfix_str(f"{event.name[:30]}...")
+                self.logger.info(f"Processing event: {event.name} (ID: {event.id})")
+
+                try:
+                    result = self._update_event(
+                        event, processor, crawler, target_year, dry_run
+                    )
+                    if result == "success":
+                        successful += 1
+                    elif result == "not_found":
+                        not_found += 1
+                    else:
+                        failed += 1
+                except Exception as e:
+                    tqdm.write(self.style.ERROR(f"Failed to process event: {str(e)}"))
+                    self.logger.error(f"Failed to process event {event.id}: {str(e)}")
+                    self._append_internal_comment(
+                        event, f"ERROR: Failed to process: {str(e)}", dry_run
+                    )
                     failed += 1
-            except Exception as e:
-                tqdm.write(self.style.ERROR(f"Failed to process event: {str(e)}"))
-                self.logger.error(f"Failed to process event {event.id}: {str(e)}")
-                self._append_internal_comment(
-                    event, f"ERROR: Failed to process: {str(e)}", dry_run
-                )
-                failed += 1
 
-            # Update progress bar with current stats
-            progress_bar.set_description(
-                f"✓{successful} ✗{failed} ?{not_found}"
-            )
+                # Update progress bar with current stats
+                progress_bar.set_description(
+                    f"✓{successful} ✗{failed} ?{not_found}"
+                )
 
         # Summary
         dry_run_prefix = "[DRY RUN] " if dry_run else ""
@@ -156,6 +169,12 @@ class Command(BaseCommand):
                 f"- Total processed: {len(events)}"
             )
         )
+        scrape_cache = get_scrape_cache()
+        if scrape_cache:
+            self.stdout.write(f"- Scrape cache: {scrape_cache.stats()}")
+        extraction_cache = get_extraction_cache()
+        if extraction_cache:
+            self.stdout.write(f"- Extraction cache: {extraction_cache.stats()}")
 
         if dry_run:
             self.stdout.write(
@@ -0,0 +1,158 @@
+"""
+Tests for the review order and the decisions ahead of smart_merge_events.
+"""
+from concurrent.futures import Future
+from datetime import date
+from io import StringIO
+from types import SimpleNamespace
+
+import pytest
+from django.core.management import call_command
+
+from app.management.commands import smart_merge_events
+from app.management.commands.smart_merge_events import Command, MergeDecisionQueue
+from app.models import Event, Location, Organizer, Race
+from app.services.smart_merge_models import MergeDecision
+
+DAY = date(2030, 7, 1)
+
+
+def _candidate(event_a, event_b, loc_a, loc_b):
+    return (
+        SimpleNamespace(id=event_a),
+        SimpleNamespace(id=event_b),
+        SimpleNamespace(id=loc_a),
+        SimpleNamespace(id=loc_b),
+        0.0,
+    )
+
+
+class TestMergeDecisionQueue:
+    def _queue(self, candidates, window, refresh=None):
+        requested = []
+
+        def request(candidate):
+            future = Future()
+            requested.append((candidate[0].id, candidate[1].id, future))
+            return future
+
+        queue = MergeDecisionQueue(candidates, window, request, refresh)
+        return queue, requested
+
+    def test_in_order_within_window(self):
+        candidates = [_candidate(1, 2, 10, 20), _candidate(3, 4, 30, 40)]
+        candidates.append(_candidate(5, 6, 50, 60))
+        queue, requested = self._queue(candidates, 2)
+
+        items = iter(queue)
+        first, future = next(items)
+        assert first is candidates[0]
+        assert [r[:2] for r in requested] == [(1, 2), (3, 4)]
+        assert future is requested[0][2]
+
+        assert [candidate for candidate, _ in items] == candidates[1:]
+        assert [r[:2] for r in requested] == [(1, 2), (3, 4), (5, 6)]
+
+    def test_requests_again_after_merge(self):
+        candidates = [
+            _candidate(1, 2, 10, 20),
+            _candidate(1, 3, 10, 30),
+            _candidate(2, 3, 20, 30),
+            _candidate(4, 5, 40, 50),
+        ]
+        refreshed = _candidate(1, 3, 10, 30)
+        reloads = []
+
+        def refresh(event_ids):
+            reloads.append(event_ids)
+            return refreshed if event_ids == (1, 3) else None
+
+        queue, requested = self._queue(candidates, 4, refresh)
+
+        items = iter(queue)
+        next(items)
+        stale = [future for *_, future in requested]
+        queue.invalidate()
+
+        assert [future.cancelled() for future in stale] == [False, True, True, False]
+        assert list(items) == [
+            (refreshed, requested[-1][2]),
+            (None, None),
+            (candidates[3], stale[3]),
+        ]
+        assert reloads == [(1, 3), (2, 3)]
+        assert [r[:2] for r in requested][4:] == [(1, 3)]
+
+
+@pytest.mark.django_db
+class TestCommand:
+    @pytest.fixture
+    def events(self):
+        """A and B 100 m apart, C 200 m from A and 230 m from B"""
+        organizer = Organizer.objects.create(name="Swim Club", website="https://x")
+        created = {}
+        for name, lat, lng, races in [
+            ("A", 47.3700, 8.5400, 1),
+            ("B", 47.3709, 8.5400, 2),
+            ("C", 47.3700, 8.5427, 0),
+        ]:
+            location = Location.objects.create(
+                city=f"City {name}", country="CH", lat=lat, lng=lng
+            )
+            event = Event.objects.create(
+                name=name,
+                website="https://x",
+                location=location,
+                organizer=organizer,
+                date_start=DAY,
+                date_end=DAY,
+            )
+            for distance in range(races):
+                Race.objects.create(event=event, date=DAY, distance=distance + 1)
+            created[name] = event
+        return created
+
+    @pytest.fixture
+    def requested(self, monkeypatch):
+        """Pairs asked about, with the race count of each event in the prompt"""
+        requested = []
+
+        def decide(self, llm, geo, event_a, event_b, loc_a, loc_b, dist, no_vision):
+            requested.append(
+                {event.name: len(event.races.all()) for event in (event_a, event_b)}
+            )
+            # Keep A when it is part of the pair, but only merge A and B
+            keep = "B" if event_b.name == "A" else "A"
+            confident = {event_a.name, event_b.name} == {"A", "B"}
+            return MergeDecision(
+                keep_event=keep,
+                keep_location=keep,
+                confidence=0.9 if confident else 0.1,
+            )
+
+        monkeypatch.setattr(Command, "_get_merge_decision", decide)
+        monkeypatch.setattr(smart_merge_events, "GeocodingService", lambda **_: None)
+        monkeypatch.setattr(smart_merge_events, "LLMService", lambda: None)
+        return requested
+
+    def _run(self, *args):
+        stdout = StringIO()
+        call_command("smart_merge_events", "--auto", *args, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_closest_first_and_skip_after_merge(self, events, requested):
+        output = self._run("--concurrency", "1")
+
+        # B is merged into A before A and C are asked about with B's races,
+        # and B and C are skipped without a request
+        assert requested == [{"A": 1, "B": 2}, {"A": 3, "C": 0}]
+        assert "1 merged, 2 skipped (of 3 candidates)" in output
+        assert not Event.objects.filter(pk=events["B"].pk).exists()
+        assert events["A"].races.count() == 3
+
+    def test_requests_ahead_are_refreshed(self, events, requested):
+        output = self._run("--concurrency", "3")
+
+        # Requests made before the merge may or may not have run by then
+        assert {"A": 3, "C": 0} in requested
+        assert "1 merged, 2 skipped (of 3 candidates)" in output
@@ -505,6 +505,7 @@ class TestSearchLocationsByCoordinates:
         mock_qs = MagicMock()
         mock_qs.filter.return_value = mock_qs
         mock_qs.__getitem__ = lambda self, s: locations
+        mock_qs.__iter__ = lambda self: iter(locations)
 
         with patch("app.mcp.tools.locations.sync_to_async",
                    side_effect=_fake_sync_to_async):
@@ -534,6 +535,7 @@ class TestSearchLocationsByCoordinates:
         mock_qs = MagicMock()
         mock_qs.filter.return_value = mock_qs
         mock_qs.__getitem__ = lambda self, s: locations
+        mock_qs.__iter__ = lambda self: iter(locations)
 
         with patch("app.mcp.tools.locations.sync_to_async",
                    side_effect=_fake_sync_to_async):
@@ -560,6 +562,7 @@ class TestSearchLocationsByCoordinates:
         mock_qs = MagicMock()
         mock_qs.filter.return_value = mock_qs
         mock_qs.__getitem__ = lambda self, s: locations
+        mock_qs.__iter__ = lambda self: iter(locations)
 
         with patch("app.mcp.tools.locations.sync_to_async",
                    side_effect=_fake_sync_to_async):
@@ -584,6 +587,7 @@ class TestSearchLocationsByCoordinates:
         mock_qs = MagicMock()
         mock_qs.filter.return_value = mock_qs
         mock_qs.__getitem__ = lambda self, s: locations
+        mock_qs.__iter__ = lambda self: iter(locations)
 
         with patch("app.mcp.tools.locations.sync_to_async",
                    side_effect=_fake_sync_to_async):
@@ -619,6 +623,7 @@ class TestListLocationsWithCoordinates:
         mock_qs.all.return_value = mock_qs
         mock_qs.filter.return_value = mock_qs
         mock_qs.__getitem__ = lambda self, s: locations
+        mock_qs.__iter__ = lambda self: iter(locations)
 
         with patch("app.mcp.tools.locations.sync_to_async",
                    side_effect=_fake_sync_to_async):
@@ -648,6 +653,7 @@ class TestListLocationsWithCoordinates:
         mock_qs.all.return_value = mock_qs
         mock_qs.filter.return_value = mock_qs
         mock_qs.__getitem__ = lambda self, s: locations
+        mock_qs.__iter__ = lambda self: iter(locations)
 
         with patch("app.mcp.tools.locations.sync_to_async",
                    side_effect=_fake_sync_to_async):
@@ -43,11 +43,12 @@ async def list_events(
     from app.models import Event
     from django.db.models import Q
 
-    from app.mcp.utils import fuzzy_rank
+    from app.mcp.utils import fuzzy_rank, trigram_search, trigram_search_enabled
 
     @sync_to_async
     def fetch_events():
         qs = Event.objects.select_related('location', 'organizer').all()
+        db_search = bool(search) and trigram_search_enabled()
 
         if not include_invisible:
             qs = qs.filter(invisible=False)
@@ -71,7 +72,12 @@ async def list_events(
         if organizer_id:
             qs = qs.filter(organizer_id=organizer_id)
 
-        if search:
+        if db_search:
+            qs = trigram_search(
+                qs, search, ['name'],
+                extra=Q(description__unaccent__icontains=search),
+            )
+        elif search:
             qs = qs.filter(
                 Q(name__icontains=search) | Q(description__icontains=search)
             )
@@ -100,7 +106,10 @@ async def list_events(
                 } if e.organizer else None,
             }
 
-        if search:
+        if db_search:
+            # Already ranked by similarity in the database
+            return [_serialize(e) for e in qs[offset:offset + limit_capped]]
+        elif search:
             # Fetch broader set for fuzzy ranking
             candidates = list(qs[:500])
             ranked = fuzzy_rank(
@@ -382,24 +391,31 @@ async def search_events(
     from app.models import Event
     from django.db.models import Q
 
-    from app.mcp.utils import fuzzy_rank
+    from app.mcp.utils import fuzzy_rank, trigram_search, trigram_search_enabled
 
     @sync_to_async
     def do_search():
-        qs = Event.objects.select_related('location', 'organizer').filter(
-            Q(name__icontains=query) | Q(description__icontains=query)
-        )
+        limit_capped = min(limit, 50)
+        qs = Event.objects.select_related('location', 'organizer')
 
         if country:
             qs = qs.filter(location__country=country.upper())
 
-        candidates = list(qs[:500])
-        limit_capped = min(limit, 50)
-        ranked = fuzzy_rank(
-            candidates,
-            lambda e: f"{e.name} {e.description or ''}",
-            query,
-        )
+        if trigram_search_enabled():
+            ranked = trigram_search(
+                qs, query, ['name'],
+                extra=Q(description__unaccent__icontains=query),
+            )[:limit_capped]
+        else:
+            qs = qs.filter(
+                Q(name__icontains=query) | Q(description__icontains=query)
+            )
+            candidates = list(qs[:500])
+            ranked = fuzzy_rank(
+                candidates,
+                lambda e: f"{e.name} {e.description or ''}",
+                query,
+            )
         return [
             {
                 "id": e.id,
@@ -42,11 +42,13 @@ async def list_locations(
     from app.models import Location
     from django.db.models import Q
 
-    from app.mcp.utils import fuzzy_rank, haversine_km
+    from app.mcp.utils import fuzzy_rank, trigram_search, trigram_search_enabled
+    from app.utils.geo_utils import nearby
 
     @sync_to_async
     def fetch_locations():
         qs = Location.objects.all()
+        db_search = bool(search) and trigram_search_enabled()
 
         if country:
             qs = qs.filter(country=country.upper())
@@ -57,22 +59,15 @@ async def list_locations(
         if water_type:
             qs = qs.filter(water_type=water_type)
 
-        if search:
+        if db_search:
+            qs = trigram_search(qs, search, ['city', 'water_name'])
+        elif search:
             qs = qs.filter(
                 Q(city__icontains=search) | Q(water_name__icontains=search)
             )
 
-        # Coordinate bounding-box pre-filter
         geo_search = (lat is not None and lng is not None
                       and radius_km is not None)
-        if geo_search:
-            qs = qs.filter(lat__isnull=False, lng__isnull=False)
-            # Rough bounding box to narrow candidates (~1 degree ≈ 111 km)
-            delta = radius_km / 111.0
-            qs = qs.filter(
-                lat__gte=lat - delta, lat__lte=lat + delta,
-                lng__gte=lng - delta, lng__lte=lng + delta,
-            )
 
         limit_capped = min(limit, 100)
 
@@ -93,18 +88,15 @@ async def list_locations(
             return result
 
         if geo_search:
-            # Precise haversine filter + sort by distance
-            candidates = list(qs[:2000])
-            with_dist = []
-            for loc in candidates:
-                d = haversine_km(lat, lng, loc.lat, loc.lng)
-                if d <= radius_km:
-                    with_dist.append((d, loc))
-            with_dist.sort(key=lambda x: x[0])
+            # Bounding box in the database, exact distances in NumPy
+            with_dist = nearby(qs, lat, lng, radius_km)
             return [
                 _serialize(loc, distance=d)
                 for d, loc in with_dist[offset:offset + limit_capped]
             ]
+        elif db_search:
+            # Already ranked by similarity in the database
+            return [_serialize(loc) for loc in qs[offset:offset + limit_capped]]
         elif search:
             candidates = list(qs[:500])
             ranked = fuzzy_rank(
@@ -359,22 +351,29 @@ async def search_locations(
 
     @sync_to_async
     def do_search():
-        from app.mcp.utils import fuzzy_rank
+        from app.mcp.utils import fuzzy_rank, trigram_search, trigram_search_enabled
 
-        qs = Location.objects.filter(
-            Q(city__icontains=query) | Q(water_name__icontains=query)
-        )
+        limit_capped = min(limit, 50)
 
-        if country:
-            qs = qs.filter(country=country.upper())
+        if trigram_search_enabled():
+            qs = Location.objects.all()
+            if country:
+                qs = qs.filter(country=country.upper())
+            ranked = trigram_search(qs, query, ['city', 'water_name'])[:limit_capped]
+        else:
+            qs = Location.objects.filter(
+                Q(city__icontains=query) | Q(water_name__icontains=query)
+            )
 
-        candidates = list(qs[:500])
-        limit_capped = min(limit, 50)
-        ranked = fuzzy_rank(
-            candidates,
-            lambda loc: f"{loc.city} {loc.water_name or ''}",
-            query,
-        )
+            if country:
+                qs = qs.filter(country=country.upper())
+
+            candidates = list(qs[:500])
+            ranked = fuzzy_rank(
+                candidates,
+                lambda loc: f"{loc.city} {loc.water_name or ''}",
+                query,
+            )
         return [
             {
                 "id": loc.id,
@@ -415,7 +414,7 @@ async def search_locations_by_coordinates(
     """
     from app.models import Location
 
-    from app.mcp.utils import haversine_km
+    from app.utils.geo_utils import nearby
 
     @sync_to_async
     def do_search():
@@ -424,22 +423,9 @@ async def search_locations_by_coordinates(
         if water_type:
             qs = qs.filter(water_type=water_type)
 
-        # Bounding box pre-filter (~1 degree ≈ 111 km)
-        delta = radius_km / 111.0
-        qs = qs.filter(
-            lat__gte=lat - delta, lat__lte=lat + delta,
-            lng__gte=lng - delta, lng__lte=lng + delta,
-        )
-
-        candidates = list(qs[:2000])
         limit_capped = min(limit, 50)
-
-        with_dist = []
-        for loc in candidates:
-            d = haversine_km(lat, lng, loc.lat, loc.lng)
-            if d <= radius_km:
-                with_dist.append((d, loc))
-        with_dist.sort(key=lambda x: x[0])
+        # Bounding box in the database, exact distances in NumPy
+        with_dist = nearby(qs, lat, lng, radius_km)
 
         return [
             {
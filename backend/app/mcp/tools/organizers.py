@@ -32,13 +32,16 @@ async def list_organizers(
     """
     from app.models import Organizer
 
-    from app.mcp.utils import fuzzy_rank
+    from app.mcp.utils import fuzzy_rank, trigram_search, trigram_search_enabled
 
     @sync_to_async
     def fetch_organizers():
         qs = Organizer.objects.all()
+        db_search = bool(search) and trigram_search_enabled()
 
-        if search:
+        if db_search:
+            qs = trigram_search(qs, search, ['name'])
+        elif search:
             qs = qs.filter(name__icontains=search)
 
         if has_upcoming_events:
@@ -58,7 +61,10 @@ async def list_organizers(
                 "contact_status": org.contact_status,
             }
 
-        if search:
+        if db_search:
+            # Already ranked by similarity in the database
+            return [_serialize(org) for org in qs[offset:offset + limit_capped]]
+        elif search:
             candidates = list(qs[:500])
             ranked = fuzzy_rank(candidates, lambda org: org.name, search)
             return [
@@ -308,13 +314,19 @@ async def search_organizers(
 
     @sync_to_async
     def do_search():
-        from app.mcp.utils import fuzzy_rank
+        from app.mcp.utils import fuzzy_rank, trigram_search, trigram_search_enabled
 
-        qs = Organizer.objects.filter(name__icontains=query)
-
-        candidates = list(qs[:500])
         limit_capped = min(limit, 50)
-        ranked = fuzzy_rank(candidates, lambda org: org.name, query)
+
+        if trigram_search_enabled():
+            ranked = trigram_search(
+                Organizer.objects.all(), query, ['name']
+            )[:limit_capped]
+        else:
+            qs = Organizer.objects.filter(name__icontains=query)
+
+            candidates = list(qs[:500])
+            ranked = fuzzy_rank(candidates, lambda org: org.name, query)
         return [
             {
                 "id": org.id,
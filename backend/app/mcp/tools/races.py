@@ -43,11 +43,12 @@ async def list_races(
     from app.models import Race
     from django.db.models import Q
 
-    from app.mcp.utils import fuzzy_rank
+    from app.mcp.utils import fuzzy_rank, trigram_search, trigram_search_enabled
 
     @sync_to_async
     def fetch_races():
         qs = Race.objects.select_related('event', 'event__location').all()
+        db_search = bool(search) and trigram_search_enabled()
 
         if event_id:
             qs = qs.filter(event_id=event_id)
@@ -68,7 +69,9 @@ async def list_races(
         if distance_max is not None:
             qs = qs.filter(distance__lte=distance_max)
 
-        if search:
+        if db_search:
+            qs = trigram_search(qs, search, ['event__name', 'name'])
+        elif search:
             qs = qs.filter(
                 Q(name__icontains=search) | Q(event__name__icontains=search)
             )
@@ -93,7 +96,10 @@ async def list_races(
                 },
             }
 
-        if search:
+        if db_search:
+            # Already ranked by similarity in the database
+            return [_serialize(r) for r in qs[offset:offset + limit_capped]]
+        elif search:
             candidates = list(qs[:500])
             ranked = fuzzy_rank(
                 candidates,
@@ -127,21 +133,26 @@ async def search_races(
     from app.models import Race
     from django.db.models import Q
 
-    from app.mcp.utils import fuzzy_rank
+    from app.mcp.utils import fuzzy_rank, trigram_search, trigram_search_enabled
 
     @sync_to_async
     def do_search():
-        qs = Race.objects.select_related('event', 'event__location').filter(
-            Q(name__icontains=query) | Q(event__name__icontains=query)
-        )
-
-        candidates = list(qs[:500])
         limit_capped = min(limit, 50)
-        ranked = fuzzy_rank(
-            candidates,
-            lambda r: f"{r.name or ''} {r.event.name}",
-            query,
-        )
+        qs = Race.objects.select_related('event', 'event__location')
+
+        if trigram_search_enabled():
+            ranked = trigram_search(qs, query, ['event__name', 'name'])[:limit_capped]
+        else:
+            qs = qs.filter(
+                Q(name__icontains=query) | Q(event__name__icontains=query)
+            )
+
+            candidates = list(qs[:500])
+            ranked = fuzzy_rank(
+                candidates,
+                lambda r: f"{r.name or ''} {r.event.name}",
+                query,
+            )
         return [
             {
                 "id": r.id,
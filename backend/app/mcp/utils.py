@@ -1,11 +1,72 @@
 """
 Shared utilities for MCP tools.
+
+Text search runs in the database on PostgreSQL: pg_trgm word similarity over
+unaccented, lower-cased names, backed by the GIN indexes of migration 0061,
+so matching and ranking see every row. Other backends (the SQLite test
+database) pre-filter with icontains and rank the candidates with fuzzy_rank.
 """
 import math
 
+from django.db import connection
+from django.db.models import FloatField, Func, Q, TextField, Value
+from django.db.models.functions import Greatest, Lower
 from thefuzz import fuzz
 
 
+class ImmutableUnaccent(Func):
+    """
+    unaccent() wrapper declared IMMUTABLE in migration 0061, so it can be
+    used in index expressions. Queries must use the same expression
+    (immutable_unaccent(lower(column))) for the indexes to apply.
+    """
+
+    function = "immutable_unaccent"
+    output_field = TextField()
+
+
+class WordSimilarity(Func):
+    """pg_trgm word_similarity(query, text)"""
+
+    function = "word_similarity"
+    output_field = FloatField()
+
+
+def search_key(expression):
+    return ImmutableUnaccent(Lower(expression))
+
+
+def trigram_search_enabled():
+    """True if the database supports trigram_search()"""
+    return connection.vendor == "postgresql"
+
+
+def trigram_search(qs, query, fields, extra=None):
+    """
+    Filter qs to rows where one of ``fields`` contains a word similar to
+    ``query`` (accent and case insensitive, pg_trgm.word_similarity_threshold)
+    and order them by the best similarity. ``extra`` is an optional Q that
+    also lets a row match (e.g. a substring of an unindexed text column).
+    """
+    query_key = search_key(Value(query))
+    aliases = {f"_search_{i}": search_key(field) for i, field in enumerate(fields)}
+    condition = Q()
+    for alias in aliases:
+        # "<%" operator, served by the gin_trgm_ops indexes
+        condition |= Q(**{f"{alias}__trigram_word_similar": query_key})
+    if extra is not None:
+        condition |= extra
+
+    scores = [WordSimilarity(query_key, search_key(field)) for field in fields]
+    score = scores[0] if len(scores) == 1 else Greatest(*scores)
+    return (
+        qs.alias(**aliases)
+        .filter(condition)
+        .annotate(search_score=score)
+        .order_by("-search_score", "pk")
+    )
+
+
 def fuzzy_rank(items, key_func, query, cutoff=60):
     """
     Rank items by fuzzy match score against query.
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.29 on 2026-10-17 19:05
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def forwards(apps, schema_editor):
+    """
+    Fill the rating totals from the existing reviews and recompute
+    average_rating, which was only ever updated for a single location
+    """
+    Location = apps.get_model("app", "Location")
+    locations = []
+    for location in Location.objects.annotate(
+        computed_count=Count("events__reviews__rating"),
+        computed_sum=Sum("events__reviews__rating"),
+    ).iterator():
+        location.rating_count = location.computed_count
+        location.rating_sum = location.computed_sum or 0
+        location.average_rating = (
+            location.rating_sum / location.rating_count
+            if location.rating_count
+            else None
+        )
+        locations.append(location)
+    Location.objects.bulk_update(
+        locations, ["rating_count", "rating_sum", "average_rating"], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0057_remove_organizer_marketing_email_sent_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='location',
+            name='rating_count',
+            field=models.PositiveIntegerField(
+                default=0, help_text='Number of rated reviews of events here'
+            ),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='rating_sum',
+            field=models.PositiveIntegerField(
+                default=0, help_text='Sum of the ratings of events here'
+            ),
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+TASK_FUNC = "app.tasks.regenerate_sitemaps"
+
+
+def forwards(apps, schema_editor):
+    """
+    Schedule the nightly sitemap regeneration in the Django Q cluster
+    """
+    Schedule = apps.get_model("django_q", "Schedule")
+    next_run = (timezone.now() + timedelta(days=1)).replace(
+        hour=0, minute=5, second=0, microsecond=0
+    )
+    Schedule.objects.get_or_create(
+        func=TASK_FUNC,
+        defaults={
+            "name": "Regenerate sitemaps",
+            "schedule_type": "D",
+            "next_run": next_run,
+            "repeats": -1,
+        },
+    )
+
+
+def backwards(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.filter(func=TASK_FUNC).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0058_location_rating_aggregates'),
+        ('django_q', '0018_task_success_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SitemapFile',
+            fields=[
+                ('name', models.CharField(
+                    help_text='Storage path',
+                    max_length=255,
+                    primary_key=True,
+                    serialize=False,
+                )),
+                ('site', models.CharField(
+                    help_text='Base URL of the site', max_length=255
+                )),
+                ('section', models.CharField(
+                    help_text="Child section or 'index'", max_length=20
+                )),
+                ('rendered_at', models.DateTimeField(
+                    help_text=(
+                        'When rendering started; changes after it are not included'
+                    )
+                )),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SitemapSection',
+            fields=[
+                ('name', models.CharField(
+                    max_length=20, primary_key=True, serialize=False
+                )),
+                ('changed_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.RunPython(forwards, backwards),
+    ]
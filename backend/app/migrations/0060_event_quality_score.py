@@ -0,0 +1,89 @@
+# Generated by Django 4.2.29 on 2026-10-17 21:40
+
+from django.db import migrations, models
+
+
+# Scoring rules of app.services.event_checker.EventChecker when the field was
+# added, as (field, points) per model. Copied here so that the migration does
+# not depend on application code that may change later.
+EVENT_SHARE = 0.5
+EVENT_FIELDS = [
+    ("website", 5),
+    ("flyer_image", 5),
+    ("location", 10),
+    ("organizer", 2),
+    ("needs_medical_certificate", 1),
+    ("needs_license", 1),
+    ("with_ranking", 1),
+    ("water_temp", 1),
+    ("description", 5),
+]
+RACE_SHARE = 0.3
+RACE_FIELDS = [
+    ("distance", 10),
+    ("name", 5),
+    ("wetsuit", 2),
+    ("price", 2),
+    ("coordinates", 20),
+]
+LOCATION_SHARE = 0.3
+LOCATION_FIELDS = [
+    ("city", 10),
+    ("country", 10),
+    ("lat", 10),
+    ("lng", 10),
+    ("header_photo", 10),
+]
+
+
+def _rate_fields(obj, fields):
+    points = 0
+    for name, field_points in fields:
+        field = obj._meta.get_field(name)
+        value = getattr(obj, field.attname if field.is_relation else name)
+        if value:
+            points += field_points
+    return points
+
+
+def _rating(event):
+    points = EVENT_SHARE * _rate_fields(event, EVENT_FIELDS)
+    if event.location is not None:
+        points += LOCATION_SHARE * _rate_fields(event.location, LOCATION_FIELDS)
+    race_points = [_rate_fields(race, RACE_FIELDS) for race in event.races.all()]
+    if race_points:
+        points += RACE_SHARE * sum(race_points) / len(race_points)
+    return int(points)
+
+
+def forwards(apps, schema_editor):
+    """Store the entry quality score of all existing events"""
+    Event = apps.get_model("app", "Event")
+    events = Event.objects.select_related("location").prefetch_related("races")
+    changed = []
+    for event in events.iterator(chunk_size=2000):
+        event.quality_score = _rating(event)
+        changed.append(event)
+    Event.objects.bulk_update(changed, ["quality_score"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0059_sitemap_schedule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='quality_score',
+            field=models.IntegerField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text='Completeness score from EventChecker, refreshed on save',
+                null=True,
+            ),
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+from django.contrib.postgres.operations import TrigramExtension, UnaccentExtension
+from django.db import migrations
+
+# (index name, table, column) searched by the MCP tools (see app/mcp/utils.py)
+TRIGRAM_INDEXES = [
+    ("app_event_name_trgm", "app_event", "name"),
+    ("app_location_city_trgm", "app_location", "city"),
+    ("app_location_water_name_trgm", "app_location", "water_name"),
+    ("app_organizer_name_trgm", "app_organizer", "name"),
+]
+
+# unaccent() is only STABLE (it depends on the dictionary), which index
+# expressions do not allow. Pinning the dictionary makes it safe to declare
+# the wrapper IMMUTABLE.
+CREATE_FUNCTION = """
+CREATE OR REPLACE FUNCTION immutable_unaccent(text) RETURNS text AS
+$$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+"""
+
+
+def forwards(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(CREATE_FUNCTION)
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} "
+            f"USING gin (immutable_unaccent(lower({column})) gin_trgm_ops)"
+        )
+
+
+def backwards(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _, _ in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+    schema_editor.execute("DROP FUNCTION IF EXISTS immutable_unaccent(text)")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0060_event_quality_score'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        UnaccentExtension(),
+        migrations.RunPython(forwards, backwards),
+    ]
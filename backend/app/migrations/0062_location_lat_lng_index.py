@@ -0,0 +1,17 @@
+# Generated by Django 4.2.29 on 2026-10-17 19:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0061_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='location',
+            index=models.Index(fields=['lat', 'lng'], name='app_location_lat_lng_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.29 on 2026-10-17 19:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0062_location_lat_lng_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(
+                fields=['date_start', 'id'], name='app_event_date_start_id_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='location',
+            index=models.Index(fields=['city', 'id'], name='app_location_city_id_idx'),
+        ),
+    ]
@@ -42,6 +42,14 @@ class Location(models.Model):
         blank=True,
         help_text="Stores the average rating of all events happened here",
     )
+    # Running totals behind average_rating, kept up to date by the Review
+    # signals in app/signals.py without re-aggregating all reviews
+    rating_count = models.PositiveIntegerField(
+        default=0, help_text="Number of rated reviews of events here"
+    )
+    rating_sum = models.PositiveIntegerField(
+        default=0, help_text="Sum of the ratings of events here"
+    )
     verified_at = models.DateTimeField(
         null=True,
         blank=True,
@@ -58,6 +66,12 @@ class Location(models.Model):
 
     class Meta:
         ordering = ["city"]
+        indexes = [
+            # Bounding-box prefilter of radius searches (app/utils/geo_utils.py)
+            models.Index(fields=["lat", "lng"], name="app_location_lat_lng_idx"),
+            # Keyset pagination of allLocations (app/graphql/pagination.py)
+            models.Index(fields=["city", "id"], name="app_location_city_id_idx"),
+        ]
         verbose_name = _("Location")
         verbose_name_plural = _("Locations")
 
@@ -69,13 +83,88 @@ class Location(models.Model):
         return self.verified_at is not None
 
     def update_average_rating(self):
-        from django.db.models import Avg
+        """Recompute the rating aggregates of this location from its reviews."""
+        Location.recompute_rating_aggregates(Location.objects.filter(pk=self.pk))
+        self.refresh_from_db(fields=["rating_count", "rating_sum", "average_rating"])
+
+    @staticmethod
+    def adjust_rating_aggregates(location_id, count_delta: int, sum_delta: int):
+        """
+        Atomically add to the rating totals of a location in a single UPDATE.
+        The new average is computed from the same expressions, so concurrent
+        reviews cannot leave it out of sync with the totals.
+        """
+        from django.db.models import Case, F, FloatField, When
+        from django.db.models.functions import Cast
+
+        new_count = F("rating_count") + count_delta
+        new_sum = F("rating_sum") + sum_delta
+        return Location.objects.filter(pk=location_id).update(
+            rating_count=new_count,
+            rating_sum=new_sum,
+            average_rating=Case(
+                When(
+                    rating_count__gt=-count_delta,
+                    then=Cast(new_sum, FloatField()) / Cast(new_count, FloatField()),
+                ),
+                default=None,
+                output_field=FloatField(),
+            ),
+        )
 
-        result = Review.objects.filter(event__location__pk=2089).aggregate(
-            average_rating=Avg("rating")
+    @staticmethod
+    def recompute_rating_aggregates(queryset=None, batch_size: int = 500) -> int:
+        """
+        Recompute rating totals and averages from the reviews, e.g. to backfill
+        or repair them. Returns the number of locations whose values changed.
+        """
+        from django.db.models import Count, Sum
+
+        if queryset is None:
+            queryset = Location.objects.all()
+        locations = queryset.annotate(
+            computed_count=Count("events__reviews__rating"),
+            computed_sum=Sum("events__reviews__rating"),
+        ).only("id", "rating_count", "rating_sum", "average_rating")
+
+        changed = []
+        for location in locations.iterator(chunk_size=2000):
+            count = location.computed_count
+            total = location.computed_sum or 0
+            average = total / count if count else None
+            stored = (
+                location.rating_count,
+                location.rating_sum,
+                location.average_rating,
+            )
+            if stored != (count, total, average):
+                location.rating_count = count
+                location.rating_sum = total
+                location.average_rating = average
+                changed.append(location)
+
+        Location.objects.bulk_update(
+            changed,
+            ["rating_count", "rating_sum", "average_rating"],
+            batch_size=batch_size,
+        )
+        return len(changed)
+
+
+class OrganizerQuerySet(models.QuerySet):
+    def with_future_event_count(self):
+        """
+        Annotate each organizer with ``future_event_count``, the number of its
+        events starting today or later, computed in a single aggregate query.
+        """
+        if "future_event_count" in self.query.annotations:
+            return self
+        return self.annotate(
+            future_event_count=models.Count(
+                "events",
+                filter=models.Q(events__date_start__gte=datetime.now().date()),
+            )
         )
-        self.average_rating = result["average_rating"]
-        self.save()
 
 
 class Organizer(models.Model):
@@ -122,13 +211,19 @@ class Organizer(models.Model):
         help_text="Linked user account for organizer portal access",
     )
 
+    objects = OrganizerQuerySet.as_manager()
+
     class Meta:
         ordering = ["name"]
         verbose_name = _("Organizer")
         verbose_name_plural = _("Organizers")
 
     def number_of_events(self):
-        return len(self.events.filter(date_start__gte=datetime.now()))
+        # Prefer the value annotated by OrganizerQuerySet.with_future_event_count
+        count = getattr(self, "future_event_count", None)
+        if count is not None:
+            return count
+        return self.events.filter(date_start__gte=datetime.now().date()).count()
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -302,6 +397,13 @@ class Event(CloneMixin, models.Model):
         null=True,
         blank=True,
     )
+    quality_score = models.IntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+        help_text="Completeness score from EventChecker, refreshed on save",
+    )
     source = models.CharField(max_length=200, null=True, blank=True)
     created_by = models.ForeignKey(
         User,
@@ -355,6 +457,12 @@ class Event(CloneMixin, models.Model):
 
     class Meta:
         ordering = ["date_start"]
+        indexes = [
+            # Keyset pagination of allEvents (app/graphql/pagination.py)
+            models.Index(
+                fields=["date_start", "id"], name="app_event_date_start_id_idx"
+            ),
+        ]
         verbose_name = _("Event")
         verbose_name_plural = _("Events")
 
@@ -508,3 +616,31 @@ class EventSubmission(models.Model):
 
     def __str__(self):
         return f"{self.url} ({self.status})"
+
+
+class SitemapSection(models.Model):
+    """
+    Last change to the content of a child sitemap (see
+    app/services/sitemap_service.py). Kept in the database so that changes
+    made by the Django Q cluster reach the web workers.
+    """
+
+    name = models.CharField(max_length=20, primary_key=True)
+    changed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} (changed {self.changed_at})"
+
+
+class SitemapFile(models.Model):
+    """A sitemap file rendered into the default storage for one site"""
+
+    name = models.CharField(max_length=255, primary_key=True, help_text="Storage path")
+    site = models.CharField(max_length=255, help_text="Base URL of the site")
+    section = models.CharField(max_length=20, help_text="Child section or 'index'")
+    rendered_at = models.DateTimeField(
+        help_text="When rendering started; changes after it are not included"
+    )
+
+    def __str__(self):
+        return self.name
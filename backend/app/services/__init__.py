@@ -1,2 +1,3 @@
+from .event_checker import EventChecker
 from .geocoding_service import GeocodingService
 from .google_analytics_service import GoogleAnalyticsService
@@ -1,6 +1,7 @@
 import json
 import logging
 import os
+from bisect import bisect_left
 from datetime import date
 from typing import Optional, Dict, Any, List
 
@@ -59,6 +60,37 @@ class EmailService:
     def __init__(self):
         self.sparkpost = SparkPost(settings.SPARKPOST_API_KEY)
         self.llm_service = LLMService()
+        # Per-year statistics shared by all send_marketing_email() calls
+        # made through this instance (one command run)
+        self._sorted_user_counts: Dict[int, List[int]] = {}
+        self._event_counts: Dict[int, int] = {}
+
+    def get_sorted_user_counts(self, year: int) -> List[int]:
+        """Sorted active user counts of all events with stats in the year (cached)."""
+        if year not in self._sorted_user_counts:
+            self._sorted_user_counts[year] = sorted(
+                Event.objects.filter(
+                    date_start__year=year,
+                    active_user_count__isnull=False,
+                ).values_list("active_user_count", flat=True)
+            )
+        return self._sorted_user_counts[year]
+
+    def get_percentile(self, year: int, user_count: int) -> int:
+        """Calculate percentile: % of events in the year with fewer users"""
+        user_counts = self.get_sorted_user_counts(year)
+        if not user_counts:
+            return 0
+        events_below = bisect_left(user_counts, user_count)
+        return int((events_below / len(user_counts)) * 100)
+
+    def get_event_count(self, year: int) -> int:
+        """Number of events in the year (cached)."""
+        if year not in self._event_counts:
+            self._event_counts[year] = Event.objects.filter(
+                date_start__year=year
+            ).count()
+        return self._event_counts[year]
 
     def generate_email_content(
         self, organizer: Organizer, prompt_extension: Optional[str] = None
@@ -585,22 +617,6 @@ class EmailService:
         # Build event table HTML
         event_table_html = ""
         if variant == "high_views" and events:
-            # Calculate percentile ranks based on all events with stats in this year
-            all_events_with_stats = list(
-                Event.objects.filter(
-                    date_start__year=year,
-                    active_user_count__isnull=False,
-                ).values_list("active_user_count", flat=True)
-            )
-            total_events_with_stats = len(all_events_with_stats)
-
-            def get_percentile(user_count):
-                """Calculate percentile: % of events with fewer users"""
-                if total_events_with_stats == 0:
-                    return 0
-                events_below = sum(1 for c in all_events_with_stats if c < user_count)
-                return int((events_below / total_events_with_stats) * 100)
-
             # High views: show table with "Interested Swimmers" and "Global Rank" columns
             event_table_html = f"""
 <table border="1" cellpadding="8" cellspacing="0" style="border-collapse: collapse; width: 100%;">
@@ -614,7 +630,8 @@ class EmailService:
             for event in events:
                 event_date = event.date_start.strftime("%d.%m.%Y") if event.date_start else "TBD"
                 user_count = event.active_user_count or 0
-                percentile = get_percentile(user_count)
+                # Percentile ranks are based on all events with stats in this year
+                percentile = self.get_percentile(year, user_count)
                 rank_text = f"Top {100 - percentile}%"
                 event_table_html += f"""  <tr>
     <td>{event.name}</td>
@@ -643,7 +660,7 @@ class EmailService:
             event_table_html += "</table>"
 
         # Get total event count for low-views variant
-        total_event_count = Event.objects.filter(date_start__year=year).count()
+        total_event_count = self.get_event_count(year)
 
         # Check for next year events (e.g., 2026) - only visible ones
         next_year = year + 1
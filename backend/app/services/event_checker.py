@@ -0,0 +1,122 @@
+from typing import Dict, Iterable
+
+from django.db import models as db_models
+
+from app import models
+
+
+class EventChecker:
+    """
+    Rates the completeness of an event entry (event, location and race
+    fields). The result is stored in Event.quality_score, which the admin
+    changelist shows, sorts and filters on.
+    """
+
+    event_share = 0.5
+    event_fields = [
+        {'name': 'website', 'points': 5},
+        {'name': 'flyer_image', 'points': 5},
+        {'name': 'location', 'points': 10},
+        {'name': 'organizer', 'points': 2},
+        {'name': 'needs_medical_certificate', 'points': 1},
+        {'name': 'needs_license', 'points': 1},
+        {'name': 'with_ranking', 'points': 1},
+        {'name': 'water_temp', 'points': 1},
+        {'name': 'description', 'points': 5},
+    ]
+
+    race_share = 0.3
+    race_fields = [
+        {'name': 'distance', 'points': 10},
+        {'name': 'name', 'points': 5},
+        {'name': 'wetsuit', 'points': 2},
+        {'name': 'price', 'points': 2},
+        {'name': 'coordinates', 'points': 20},
+    ]
+
+    location_share = 0.3
+    location_fields = [
+        {'name': 'city', 'points': 10},
+        {'name': 'country', 'points': 10},
+        {'name': 'lat', 'points': 10},
+        {'name': 'lng', 'points': 10},
+        {'name': 'header_photo', 'points': 10},
+    ]
+
+    def __init__(self, event: models.Event):
+        self.event = event
+
+    @staticmethod
+    def _rate_fields(obj, fields) -> int:
+        points = 0
+        for field_data in fields:
+            field = obj._meta.get_field(field_data['name'])
+            # Check foreign keys by their id so no related object is loaded
+            if isinstance(field, db_models.ForeignKey):
+                value = getattr(obj, field.attname)
+            else:
+                value = getattr(obj, field_data['name'])
+            if value:
+                points += field_data['points']
+        return points
+
+    def _rate_event(self, event: models.Event) -> int:
+        return self._rate_fields(event, self.event_fields)
+
+    def _rate_location(self, location: models.Location) -> int:
+        if location is None:
+            return 0
+        return self._rate_fields(location, self.location_fields)
+
+    def _rate_race(self, race: models.Race) -> int:
+        return self._rate_fields(race, self.race_fields)
+
+    def get_rating(self):
+        """
+        Rate entry quality according to checks
+        :return:
+        """
+        points = (
+            self.event_share * self._rate_event(self.event)
+            + self.location_share * self._rate_location(self.event.location)
+        )
+
+        race_points = [self._rate_race(r) for r in self.event.races.all()]
+        if len(race_points) == 0:
+            return int(points)
+        else:
+            return int(points + self.race_share * sum(race_points) / len(race_points))
+
+    @staticmethod
+    def with_related(queryset):
+        """Load everything get_rating() needs in two queries"""
+        return queryset.select_related("location").prefetch_related("races")
+
+    @classmethod
+    def rate_events(cls, events: Iterable[models.Event]) -> Dict[int, int]:
+        """
+        Rate several events at once. Querysets are loaded with their locations
+        and races up front instead of two queries per event.
+        """
+        if isinstance(events, db_models.QuerySet):
+            events = cls.with_related(events)
+        return {event.id: cls(event).get_rating() for event in events}
+
+    @classmethod
+    def update_scores(cls, events, batch_size: int = 500) -> int:
+        """
+        Recompute and store Event.quality_score. Returns the number of events
+        whose score changed.
+        """
+        changed = []
+        for event in cls.with_related(events).iterator(chunk_size=2000):
+            score = cls(event).get_rating()
+            if event.quality_score != score:
+                event.quality_score = score
+                changed.append(event)
+        # bulk_update() sends no signals, so storing the score does not
+        # trigger another recomputation
+        models.Event.objects.bulk_update(
+            changed, ["quality_score"], batch_size=batch_size
+        )
+        return len(changed)
@@ -44,9 +44,6 @@ class EventCrawler:
         )
         self.profile = profile
 
-        # Cache for scraped pages to avoid re-scraping
-        self.page_cache = {}
-
     def get_event_urls(self, start_url: str) -> List[List[str]]:
         """
         Get lists of event URLs from the starting URL.
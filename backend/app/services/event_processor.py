@@ -1,15 +1,17 @@
+import hashlib
 import logging
 import json
+import math
 import re
 import os
 import sys
-import pycountry
 import requests
 import uuid
 from datetime import datetime
 from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.utils.text import slugify
-from thefuzz import fuzz, process
 from typing import Optional, Dict, Any, List, Tuple
 from django.core.management.base import OutputWrapper
 from llama_index.core.agent import ReActAgent
@@ -17,10 +19,16 @@ from llama_index.llms.openai import OpenAIResponses
 from llama_index.core.tools import FunctionTool
 from openai import NOT_GIVEN
 from djmoney.money import Money
+from moneyed import CurrencyDoesNotExist
 
-from .scraping_service import ScrapingService
+from .event_checker import EventChecker
+from .extraction_cache import MISSING, get_extraction_cache
+from .scraping_service import DomainRateLimiter, ScrapingService
 from .geocoding_service import GeocodingService
+from .organizer_matcher import get_organizer_matcher
+from app.graphql import cache as graphql_cache
 from app.models import CrawlSource, Event, Location, Organizer, Race
+from app.utils.country_utils import resolve_country_code
 
 
 def strip_json_comments(json_text: str) -> str:
@@ -88,6 +96,10 @@ else:
 
 # Geocoding functionality is now provided by the shared GeocodingService
 
+PROMPT_TEMPLATE_PATH = os.path.join(
+    os.path.dirname(__file__), "templates", "event_extraction_prompt.txt"
+)
+
 
 class EventProcessor:
     """
@@ -107,9 +119,13 @@ class EventProcessor:
         dry_run: bool = False,
         update_existing: bool = False,
         crawl_source: CrawlSource = None,
+        rate_limiter: DomainRateLimiter = None,
     ):
         self.scraping_service = ScrapingService(
-            api_key=firecrawl_api_key, stdout=stdout, stderr=stderr
+            api_key=firecrawl_api_key,
+            stdout=stdout,
+            stderr=stderr,
+            rate_limiter=rate_limiter,
         )
         self.llm = OpenAIResponses(
             model=settings.OPENAI_MODEL,
@@ -122,6 +138,7 @@ class EventProcessor:
         self.stdout = stdout
         self.stderr = stderr
         self.crawl_source = crawl_source
+        self.extraction_cache = get_extraction_cache()
 
         logger.info(
             f"EventProcessor initialized (dry_run={dry_run}, update_existing={update_existing})"
@@ -141,13 +158,7 @@ class EventProcessor:
             target_year: Optional target year to search for (e.g., 2026)
             filter_future_only: If True, only process future events (default for new event crawling)
         """
-        template_path = os.path.join(
-            os.path.dirname(__file__),
-            "templates",
-            "event_extraction_prompt.txt",
-        )
-
-        with open(template_path, "r") as f:
+        with open(PROMPT_TEMPLATE_PATH, "r") as f:
             template = f.read()
 
         current_date = datetime.now().strftime("%Y-%m-%d")
@@ -189,6 +200,30 @@ Do NOT extract {target_year-1} data - we already have it. Only return data if it
             year_instruction=year_instruction,
         )
 
+    def _extraction_cache_key(
+        self,
+        contents: List[Dict[str, str]],
+        target_year: int = None,
+        filter_future_only: bool = True,
+    ) -> str:
+        """Cache key for an extraction over the given scraped pages."""
+        with open(PROMPT_TEMPLATE_PATH, "rb") as f:
+            prompt_version = hashlib.sha256(f.read()).hexdigest()
+        params = {
+            "target_year": target_year,
+            "filter_future_only": filter_future_only,
+        }
+        # Without a target year the prompt filters on today's date, so the
+        # answer for the same page may change from one day to the next
+        if filter_future_only and not target_year:
+            params["current_date"] = datetime.now().strftime("%Y-%m-%d")
+        return self.extraction_cache.make_key(
+            model=f"{settings.OPENAI_MODEL}:{settings.OPENAI_REASONING_EFFORT}",
+            prompt_version=prompt_version,
+            params=params,
+            contents=contents,
+        )
+
     def extract_event_data(
         self,
         urls: List[str],
@@ -202,6 +237,10 @@ Do NOT extract {target_year-1} data - we already have it. Only return data if it
         - process_event_urls() for new event crawling
         - update_next_year_events command for updating existing events
 
+        Results are stored in the extraction cache; if the scraped pages are
+        unchanged since a previous run, the stored result is returned without
+        calling the LLM.
+
         Args:
             urls: List of URLs belonging to the same event
             target_year: Optional target year to search for (e.g., 2026)
@@ -230,6 +269,18 @@ Do NOT extract {target_year-1} data - we already have it. Only return data if it
             logger.error("Failed to scrape any URLs")
             return None
 
+        cache_key = None
+        if self.extraction_cache:
+            cache_key = self._extraction_cache_key(
+                contents, target_year, filter_future_only
+            )
+            cached = self.extraction_cache.get(cache_key)
+            if cached is not MISSING:
+                logger.info(
+                    f"Using cached extraction for unchanged pages: {', '.join(urls)}"
+                )
+                return cached
+
         # Create a tool for the LLM to scrape additional pages if needed
         scrape_tool = FunctionTool.from_defaults(fn=self.scraping_service.scrape)
         agent = ReActAgent(tools=[scrape_tool], llm=self.llm, verbose=True)
@@ -265,8 +316,19 @@ Do NOT extract {target_year-1} data - we already have it. Only return data if it
             # Validate that the LLM returned actual event data
             if data.get("event") is None:
                 logger.info("LLM returned null event data - no valid event found on page")
-                return None
-
+                data = None
+
+            if cache_key:
+                # The agent may follow links off the cached pages, and dates
+                # for the target year or a missing event often show up there
+                # first, so those results are checked again sooner
+                max_age = None
+                if data is None or target_year:
+                    max_age = settings.EXTRACTION_CACHE_RECHECK_DAYS * 86400
+                try:
+                    self.extraction_cache.set(cache_key, urls, data, max_age)
+                except Exception as e:
+                    logger.warning(f"Failed to store extraction result: {str(e)}")
             return data
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON response: {str(e)}")
@@ -287,7 +349,17 @@ Do NOT extract {target_year-1} data - we already have it. Only return data if it
 
         # Extract event data (filter for future events only)
         data = self.extract_event_data(urls, filter_future_only=True)
+        return self.save_extracted_event(data, urls)
 
+    def save_extracted_event(
+        self, data: Optional[Dict], urls: List[str]
+    ) -> Optional[Event]:
+        """
+        Save data returned by extract_event_data() to the database.
+
+        Split from process_event_urls() so that callers can run the extraction
+        of several events concurrently while keeping database writes serial.
+        """
         if not data:
             logger.error("Failed to extract event data")
             return None
@@ -379,186 +451,227 @@ Do NOT extract {target_year-1} data - we already have it. Only return data if it
 
         # Create or update Event
         event_data = data["event"]
-        try:
-            if self.dry_run:
-                # Create a dummy event object for dry run
-                from collections import namedtuple
-
-                DummyEvent = namedtuple("DummyEvent", ["id", "name"])
-                event = DummyEvent(id=0, name=event_data["name"])
-                if self.update_existing:
-                    logger.info(f"[DRY RUN] Would update existing event: {event.name}")
-                else:
-                    logger.info(f"[DRY RUN] Would create event: {event.name}")
-                logger.info(f"[DRY RUN] Event details: {event_data}")
-            elif existing_event:
-                # Update existing event
-                existing_event.name = event_data["name"]
-                existing_event.website = event_data.get("website", urls[0])
-                existing_event.slug = slugify(event_data["name"])
-                existing_event.location = location
-                existing_event.organizer = organizer
-                existing_event.crawl_source = self.crawl_source
-                existing_event.needs_medical_certificate = event_data.get(
-                    "needs_medical_certificate"
-                )
-                existing_event.needs_license = event_data.get("needs_license")
-                existing_event.sold_out = event_data.get("sold_out")
-                existing_event.cancelled = event_data.get("cancelled")
-                existing_event.with_ranking = event_data.get("with_ranking")
-                existing_event.date_start = event_data["date_start"]
-                existing_event.date_end = event_data["date_end"]
-                existing_event.water_temp = event_data.get("water_temp")
-                existing_event.description = event_data.get("description") or ""
-                existing_event.source = (
-                    f"agentic crawling (updated), source urls: {', '.join(urls)}"
-                )
-                existing_event.save()
-                event = existing_event
-                logger.info(
-                    f"Successfully updated event: {event.name} (ID: {event.id})"
-                )
+        # A race that cannot be stored must not take its event down with it
+        races = [
+            race
+            for race in map(self._clean_race, data.get("races") or [])
+            if race is not None
+        ]
+        if self.dry_run:
+            # Create a dummy event object for dry run
+            from collections import namedtuple
 
-                # Delete existing races before creating new ones
-                event.races.all().delete()
-                logger.info(f"Deleted existing races for event: {event.name}")
+            DummyEvent = namedtuple("DummyEvent", ["id", "name"])
+            event = DummyEvent(id=0, name=event_data["name"])
+            if self.update_existing:
+                logger.info(f"[DRY RUN] Would update existing event: {event.name}")
             else:
-                event = Event.objects.create(
-                    name=event_data["name"],
-                    website=event_data.get(
-                        "website", urls[0]
-                    ),  # Use the first URL as default
-                    slug=slugify(event_data["name"]),  # Generate slug from name
-                    location=location,
-                    organizer=organizer,
-                    crawl_source=self.crawl_source,
-                    needs_medical_certificate=event_data.get(
-                        "needs_medical_certificate"
-                    ),
-                    needs_license=event_data.get("needs_license"),
-                    sold_out=event_data.get("sold_out"),
-                    cancelled=event_data.get("cancelled"),
-                    with_ranking=event_data.get("with_ranking"),
-                    date_start=event_data["date_start"],
-                    date_end=event_data["date_end"],
-                    water_temp=event_data.get("water_temp"),
-                    description=event_data.get("description") or "",
-                    source=f"agentic crawling, source urls: {', '.join(urls)}",
-                )
+                logger.info(f"[DRY RUN] Would create event: {event.name}")
+            logger.info(f"[DRY RUN] Event details: {event_data}")
+            for race in races:
                 logger.info(
-                    f"Successfully created event: {event.name} (ID: {event.id})"
+                    f"[DRY RUN] Would create race: {race['name']} "
+                    f"for event: {event.name}"
                 )
-        except Exception as e:
-            logger.error(f"Failed to create/update event: {str(e)}")
-            return None
-
-        # Create Races
-        for race_data in data["races"]:
-            try:
-                if self.dry_run:
+                logger.info(f"[DRY RUN] Race details: {race}")
+            return event
+
+        event_fields = {
+            "name": event_data["name"],
+            # Use the first URL as default
+            "website": event_data.get("website", urls[0]),
+            "slug": slugify(event_data["name"]),  # Generate slug from name
+            "location": location,
+            "organizer": organizer,
+            "crawl_source": self.crawl_source,
+            "needs_medical_certificate": event_data.get("needs_medical_certificate"),
+            "needs_license": event_data.get("needs_license"),
+            "sold_out": event_data.get("sold_out"),
+            "cancelled": event_data.get("cancelled"),
+            "with_ranking": event_data.get("with_ranking"),
+            "date_start": event_data["date_start"],
+            "date_end": event_data["date_end"],
+            "water_temp": event_data.get("water_temp"),
+            "description": event_data.get("description") or "",
+        }
+
+        # The event and its races are written in one transaction, so a failure
+        # leaves no half-written event behind. The cache invalidations of the
+        # individual saves are flushed once, after the commit.
+        try:
+            with graphql_cache.deferred_invalidation(), transaction.atomic():
+                if existing_event:
+                    for field, value in event_fields.items():
+                        setattr(existing_event, field, value)
+                    existing_event.source = (
+                        f"agentic crawling (updated), source urls: {', '.join(urls)}"
+                    )
+                    existing_event.save()
+                    event = existing_event
                     logger.info(
-                        f"[DRY RUN] Would create race: {race_data['name']} for event: {event.name}"
+                        f"Successfully updated event: {event.name} (ID: {event.id})"
                     )
-                    logger.info(f"[DRY RUN] Race details: {race_data}")
                 else:
-                    # Create proper Money object with both amount and currency
-                    price_amount = race_data.get("price", {}).get("amount")
-                    price_currency = race_data.get("price", {}).get("currency", "EUR")
-
-                    # Create race with proper Money object if price is available
-                    race_kwargs = {
-                        "event": event,
-                        "name": race_data["name"],
-                        "date": race_data["date"],
-                        "race_time": race_data.get("race_time"),
-                        "distance": race_data["distance"],
-                        "wetsuit": race_data.get("wetsuit"),
-                    }
-
-                    # Only set price if amount is provided
-                    if price_amount is not None:
-                        race_kwargs["price"] = Money(price_amount, price_currency)
-
-                    race = Race.objects.create(**race_kwargs)
-
-                    logger.info(f"Created race: {race.name} for event: {event.name}")
-            except Exception as e:
-                logger.error(f"Failed to create race: {str(e)}")
+                    event = Event.objects.create(
+                        **event_fields,
+                        source=f"agentic crawling, source urls: {', '.join(urls)}",
+                    )
+                    logger.info(
+                        f"Successfully created event: {event.name} (ID: {event.id})"
+                    )
+
+                if self._save_races(event, races):
+                    # bulk_create()/bulk_update() send no signals
+                    EventChecker.update_scores(Event.objects.filter(pk=event.pk))
+                    graphql_cache.invalidate(graphql_cache.EVENTS)
+        except Exception as e:
+            logger.error(f"Failed to create/update event: {str(e)}")
+            return None
 
         return event
 
-    def _get_or_create_location(self, location_data: Dict) -> Optional[Location]:
-        """Get or create a location from the provided data"""
-        if not location_data.get("city") or not location_data.get("country"):
-            logger.error("Missing city or country in location data")
+    @staticmethod
+    def _clean_race(race_data: Dict) -> Optional[Dict]:
+        """
+        Validate and normalize one extracted race before it is saved.
+
+        Returns None for a race without a usable date or distance. Values the
+        model cannot store are dropped, over-long names are shortened.
+        """
+        try:
+            date = datetime.strptime(str(race_data["date"]), "%Y-%m-%d").date()
+            distance = float(race_data["distance"])
+        except (KeyError, TypeError, ValueError):
+            logger.warning(f"Skipping race with invalid date or distance: {race_data}")
+            return None
+        if not math.isfinite(distance) or distance <= 0:
+            logger.warning(f"Skipping race with invalid distance: {race_data}")
             return None
 
-        country_name = location_data["country"]
+        name = race_data.get("name")
+        if name is not None:
+            name = str(name).strip()
+            max_length = Race._meta.get_field("name").max_length
+            if len(name) > max_length:
+                logger.warning(f"Shortening race name: {name}")
+                name = name[:max_length].rstrip()
 
-        # First check if the country is already a valid 2-letter ISO code
-        if (
-            isinstance(country_name, str)
-            and len(country_name) == 2
-            and country_name.upper() == country_name
-        ):
-            # Validate that it's actually a valid ISO code using pycountry
+        try:
+            race_time = Race._meta.get_field("race_time").to_python(
+                race_data.get("race_time")
+            )
+        except ValidationError:
+            logger.warning(f"Ignoring invalid race time: {race_data.get('race_time')}")
+            race_time = None
+
+        wetsuit = race_data.get("wetsuit")
+        if wetsuit not in dict(Race._meta.get_field("wetsuit").choices):
+            wetsuit = None
+
+        # Only set price if amount is provided
+        price = None
+        price_data = race_data.get("price")
+        if isinstance(price_data, dict) and price_data.get("amount") is not None:
             try:
-                pycountry.countries.get(alpha_2=country_name)
-                country_code = country_name
-                logger.info(f"Using provided country code directly: {country_code}")
-            except KeyError:
-                # Not a valid ISO code, fall through to mapping/lookup logic
-                logger.info(
-                    f"'{country_name}' is not a valid ISO country code, attempting to map or lookup"
+                price = Money(
+                    price_data["amount"], price_data.get("currency") or "EUR"
                 )
-                country_code = None
-        else:
-            country_code = None
+            except (ArithmeticError, CurrencyDoesNotExist):
+                logger.warning(f"Ignoring invalid race price: {price_data}")
+
+        return {
+            "name": name,
+            "date": date,
+            "distance": distance,
+            "race_time": race_time,
+            "wetsuit": wetsuit,
+            "price": price,
+        }
+
+    @staticmethod
+    def _race_key(date, distance, name) -> Tuple:
+        """Identity of a race within its event, used to match updated races"""
+        return date, round(distance, 3), (name or "").strip().lower()
+
+    def _save_races(self, event: Event, races: List[Dict]) -> bool:
+        """
+        Bring the races of an event in line with the extracted data.
 
-        if not country_code:
-            # Country name to code mapping for special cases
-            country_name_mappings = {
-                "Czech Republic": "CZ",
-                "Czechia": "CZ",
-                "England": "GB",  # Teil des Vereinigten Königreichs
-                "Scotland": "GB",  # Teil des Vereinigten Königreichs
-                "Wales": "GB",  # Teil des Vereinigten Königreichs
-                "United Kingdom": "GB",
-                "UK": "GB",  # Add mapping for UK to GB
-                "USA": "US",
-                "United States": "US",
-                "United States of America": "US",
-                "日本": "JP",  # Japanese for Japan
+        Takes races cleaned by _clean_race(). They are matched to the existing
+        rows by date, distance and name, so unchanged races keep their IDs.
+        Matched races are updated, new ones created and races no longer listed
+        deleted, each in a single query. Returns True if anything changed.
+        """
+        existing = {}
+        for race in event.races.all():
+            existing.setdefault(
+                self._race_key(race.date, race.distance, race.name), []
+            ).append(race)
+
+        to_create = []
+        to_update = []
+        for race_values in races:
+            values = {
+                field: race_values[field] for field in ("race_time", "wetsuit", "price")
             }
-
-            # Check if we have a direct mapping for this country name
-            if country_name in country_name_mappings:
-                country_code = country_name_mappings[country_name]
-                logger.info(
-                    f"Using mapped country code {country_code} for {country_name}"
+            matches = existing.get(
+                self._race_key(
+                    race_values["date"], race_values["distance"], race_values["name"]
                 )
+            )
+            if matches:
+                race = matches.pop(0)
+                changed = False
+                for field, value in values.items():
+                    if getattr(race, field) == value:
+                        continue
+                    setattr(race, field, value)
+                    changed = True
+                if changed:
+                    to_update.append(race)
             else:
-                # Try to find the country code using pycountry
-                country = pycountry.countries.get(name=country_name)
-
-                # If not found by exact name, try with common name
-                if not country:
-                    country = pycountry.countries.get(common_name=country_name)
-
-                # If still not found, try searching by name
-                if not country:
-                    try:
-                        countries = list(pycountry.countries.search_fuzzy(country_name))
-                        country = countries[0] if countries else None
-                    except LookupError:
-                        # Handle the case where fuzzy search fails
-                        country = None
-
-                if not country:
-                    logger.error(f"Could not find country code for {country_name}")
-                    return None
+                race = Race(
+                    event=event,
+                    name=race_values["name"],
+                    date=race_values["date"],
+                    distance=race_values["distance"],
+                    **{
+                        field: value
+                        for field, value in values.items()
+                        if value is not None
+                    },
+                )
+                to_create.append(race)
 
-                country_code = country.alpha_2
+        stale_ids = [race.id for unmatched in existing.values() for race in unmatched]
+        if stale_ids:
+            Race.objects.filter(pk__in=stale_ids).delete()
+            logger.info(
+                f"Deleted {len(stale_ids)} races no longer listed for event: "
+                f"{event.name}"
+            )
+        if to_update:
+            Race.objects.bulk_update(
+                to_update, ["race_time", "wetsuit", "price", "price_currency"]
+            )
+            logger.info(f"Updated {len(to_update)} races for event: {event.name}")
+        if to_create:
+            Race.objects.bulk_create(to_create)
+            logger.info(f"Created {len(to_create)} races for event: {event.name}")
+
+        return bool(stale_ids or to_update or to_create)
+
+    def _get_or_create_location(self, location_data: Dict) -> Optional[Location]:
+        """Get or create a location from the provided data"""
+        if not location_data.get("city") or not location_data.get("country"):
+            logger.error("Missing city or country in location data")
+            return None
+
+        country_name = location_data["country"]
+        country_code = resolve_country_code(country_name)
+        if not country_code:
+            logger.error(f"Could not find country code for {country_name}")
+            return None
 
         # Try to find an exact match first using all available fields
         location = Location.objects.filter(
@@ -702,18 +815,10 @@ Do NOT extract {target_year-1} data - we already have it. Only return data if it
             logger.warning("No organizer name provided")
             return None
 
-        # Get all existing organizers
-        existing_organizers = Organizer.objects.all()
-        # Use fuzzy matching to find the best match
-        best_match = process.extractOne(
-            organizer_name,
-            [org.name for org in existing_organizers],
-            scorer=fuzz.token_sort_ratio,
-            score_cutoff=80,  # Minimum similarity score (0-100)
-        )
+        matcher = get_organizer_matcher()
+        organizer = matcher.find(organizer_name)
 
-        if best_match:
-            organizer = existing_organizers.get(name=best_match[0])
+        if organizer:
             logger.info(f"Using existing organizer: {organizer.name}")
             return organizer
         else:
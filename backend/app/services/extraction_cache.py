@@ -0,0 +1,171 @@
+"""
+Persistent store of LLM extraction results.
+
+EventProcessor.extract_event_data runs a ReActAgent over the scraped pages.
+The nightly update commands mostly see pages that have not changed since the
+previous run, so results are stored keyed by everything that determines the
+agent's answer: model, prompt template version, extraction parameters and a
+hash of the scraped content. An unchanged page skips the LLM entirely.
+
+Pages the agent decides to scrape on its own while running are not part of
+the key; a change that only shows up on such a follow-up page is picked up
+once the entry expires. Entries can be given a shorter maximum age than the
+cache default (EXTRACTION_CACHE_MAX_AGE_DAYS), which EventProcessor does for
+results that are most likely to change that way.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Sentinel returned by ExtractionCache.get() when nothing is stored. None is a
+# valid cached result ("no event found on this page").
+MISSING = object()
+
+
+class ExtractionCache:
+    """SQLite backed store of extract_event_data() results"""
+
+    def __init__(self, path: str, max_age_seconds: float):
+        self.path = path
+        self.max_age_seconds = max_age_seconds
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS extraction_cache (
+                    key TEXT PRIMARY KEY,
+                    urls TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    max_age REAL
+                )
+                """
+            )
+            columns = {
+                row[1] for row in conn.execute("PRAGMA table_info(extraction_cache)")
+            }
+            if "max_age" not in columns:
+                conn.execute("ALTER TABLE extraction_cache ADD COLUMN max_age REAL")
+            now = time.time()
+            conn.execute(
+                "DELETE FROM extraction_cache "
+                "WHERE created_at < ? OR created_at + max_age < ?",
+                (now - max_age_seconds, now),
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(
+        model: str,
+        prompt_version: str,
+        params: Dict,
+        contents: List[Dict[str, str]],
+    ) -> str:
+        """
+        Build the cache key.
+
+        Args:
+            model: LLM model and reasoning settings
+            prompt_version: Hash of the prompt template file
+            params: Extraction parameters that change the prompt (target year, ...)
+            contents: Scraped pages as returned by the scraping step
+        """
+        content_hash = hashlib.sha256()
+        for page in sorted(contents, key=lambda page: page["url"]):
+            content_hash.update(page["url"].encode())
+            content_hash.update(b"\0")
+            content_hash.update(page["content"].encode())
+            content_hash.update(b"\0")
+        raw = json.dumps(
+            {
+                "model": model,
+                "prompt_version": prompt_version,
+                "params": params,
+                "content": content_hash.hexdigest(),
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str):
+        """Return the stored result (possibly None) or MISSING."""
+        row = self._connection().execute(
+            "SELECT result, created_at, max_age FROM extraction_cache WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None or time.time() - row[1] > min(
+            self.max_age_seconds, row[2] or self.max_age_seconds
+        ):
+            with self._lock:
+                self.misses += 1
+            return MISSING
+        with self._lock:
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(
+        self,
+        key: str,
+        urls: List[str],
+        result: Optional[Dict],
+        max_age_seconds: Optional[float] = None,
+    ):
+        """Store a result, optionally expiring sooner than the cache default."""
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO extraction_cache "
+                "(key, urls, result, created_at, max_age) VALUES (?, ?, ?, ?, ?)",
+                (
+                    key,
+                    json.dumps(urls),
+                    json.dumps(result),
+                    time.time(),
+                    max_age_seconds,
+                ),
+            )
+
+    def stats(self) -> str:
+        total = self.hits + self.misses
+        rate = f" ({self.hits / total:.0%} hit rate)" if total else ""
+        return f"{self.hits} hits, {self.misses} misses{rate}"
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """Return the process-wide extraction cache, or None if disabled in settings."""
+    global _default_cache
+    if not settings.EXTRACTION_CACHE_ENABLED:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ExtractionCache(
+                path=settings.EXTRACTION_CACHE_PATH,
+                max_age_seconds=settings.EXTRACTION_CACHE_MAX_AGE_DAYS * 86400,
+            )
+    return _default_cache
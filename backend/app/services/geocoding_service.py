@@ -9,6 +9,7 @@ import googlemaps
 import pycountry
 
 from app.models import Location
+from app.utils.geo_utils import nearby
 
 logger = logging.getLogger(__name__)
 
@@ -251,27 +252,10 @@ class GeocodingService:
         Returns:
             List of dictionaries containing location objects and their distances
         """
-        # Calculate bounding box for initial filtering (optimization)
-        # 0.01 degrees is roughly 1km at the equator, adjust based on max_distance_km
-        lat_range = max_distance_km * 0.01
-        lng_range = max_distance_km * 0.01
-
-        existing_locations = Location.objects.filter(
-            lat__gte=lat - lat_range,
-            lat__lte=lat + lat_range,
-            lng__gte=lng - lng_range,
-            lng__lte=lng + lng_range,
-        )
-
-        # Calculate exact distances and filter
-        locations_with_distance = []
-        for loc in existing_locations:
-            dist = self.get_distance_from_lat_lng_in_km(lat, lng, loc.lat, loc.lng)
-            if dist <= max_distance_km:
-                locations_with_distance.append({"distance": dist, "location": loc})
-
-        # Sort by distance
-        return sorted(locations_with_distance, key=lambda x: x["distance"])
+        return [
+            {"distance": dist, "location": loc}
+            for dist, loc in nearby(Location.objects.all(), lat, lng, max_distance_km)
+        ]
 
     def find_place_by_location(self, location: Location) -> Optional[Dict[str, Any]]:
         """
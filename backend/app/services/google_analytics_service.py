@@ -1,8 +1,14 @@
+import json
 import logging
+import os
+import re
+from bisect import bisect_right
+from collections import defaultdict
 from datetime import date
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from django.conf import settings
+from django.utils import timezone
 from google.analytics.data_v1beta import BetaAnalyticsDataClient
 from google.analytics.data_v1beta.types import (
     DateRange,
@@ -15,6 +21,13 @@ from google.analytics.data_v1beta.types import (
 
 logger = logging.getLogger(__name__)
 
+# Canonical event page paths: /<lang>/event/<slug>/ (language prefix optional)
+EVENT_PATH_RE = re.compile(r"^/(?:[a-z]{2}(?:-[a-z]+)?/)?event/([^/?#]+)/?$", re.I)
+
+# Rows per runReport request and date ranges per request (GA4 API limits)
+PAGE_SIZE = 10000
+MAX_DATE_RANGES = 4
+
 
 class GoogleAnalyticsService:
     """
@@ -65,46 +78,53 @@ class GoogleAnalyticsService:
             else:
                 self.stdout.write(msg)
 
-    def fetch_page_active_users(
+    def iter_page_active_users(
         self,
-        year: int,
+        years: List[int],
         page_path_filter: Optional[str] = None,
-    ) -> Dict[str, int]:
+        page_size: int = PAGE_SIZE,
+    ) -> Iterator[Tuple[int, str, int]]:
         """
-        Fetch active user counts grouped by page path for a specific year.
+        Stream active user counts per page path for several years.
+
+        Years are requested in batches of MAX_DATE_RANGES date ranges per
+        report, and each report is paged with offset/limit so large
+        properties are not truncated.
 
         Args:
-            year: The year to fetch data for (e.g., 2025)
+            years: Years to fetch data for (e.g., [2024, 2025])
             page_path_filter: Optional filter for page paths
                             (e.g., "/event/" to only get event pages)
+            page_size: Rows per API request (GA4 allows up to 250,000)
 
-        Returns:
-            Dictionary mapping page paths to active user counts
-            Example: {"/en/event/lake-annecy-2025/": 150, ...}
-        """
-        if not self.property_id:
-            self._log("GA_PROPERTY_ID not configured", "error")
-            return {}
+        Yields:
+            (year, page_path, active_users) tuples
 
-        try:
-            client = self._get_client()
+        Raises:
+            Exception: API errors are passed on to the caller
+        """
+        client = self._get_client()
+        years = sorted(set(years))
 
-            # Date range for the entire year
-            start_date = date(year, 1, 1)
-            end_date = date(year, 12, 31)
+        for batch_start in range(0, len(years), MAX_DATE_RANGES):
+            batch = years[batch_start : batch_start + MAX_DATE_RANGES]
 
             # Build the request
             request_params = {
                 "property": f"properties/{self.property_id}",
+                # Named ranges: with several ranges GA4 adds a "dateRange"
+                # dimension holding the name as the last dimension value
                 "date_ranges": [
                     DateRange(
-                        start_date=start_date.strftime("%Y-%m-%d"),
-                        end_date=end_date.strftime("%Y-%m-%d"),
+                        start_date=date(year, 1, 1).strftime("%Y-%m-%d"),
+                        end_date=date(year, 12, 31).strftime("%Y-%m-%d"),
+                        name=str(year),
                     )
+                    for year in batch
                 ],
                 "dimensions": [Dimension(name="pagePath")],
                 "metrics": [Metric(name="activeUsers")],
-                "limit": 10000,
+                "limit": page_size,
             }
 
             # Add page path filter if specified
@@ -119,22 +139,135 @@ class GoogleAnalyticsService:
                     )
                 )
 
-            request = RunReportRequest(**request_params)
-            response = client.run_report(request)
+            offset = 0
+            while True:
+                request = RunReportRequest(offset=offset, **request_params)
+                response = client.run_report(request)
 
-            page_stats = {}
-            for row in response.rows:
-                page_path = row.dimension_values[0].value
-                active_users = int(row.metric_values[0].value)
-                page_stats[page_path] = active_users
+                for row in response.rows:
+                    if len(batch) > 1:
+                        year = int(row.dimension_values[-1].value)
+                    else:
+                        year = batch[0]
+                    yield (
+                        year,
+                        row.dimension_values[0].value,
+                        int(row.metric_values[0].value),
+                    )
+
+                offset += len(response.rows)
+                if not response.rows or offset >= response.row_count:
+                    break
+
+    def fetch_page_active_users_by_year(
+        self,
+        years: List[int],
+        page_path_filter: Optional[str] = None,
+        from_snapshot: bool = False,
+    ) -> Dict[int, Dict[str, int]]:
+        """
+        Fetch active user counts grouped by page path for several years.
+
+        The result is written to the snapshot file (settings.GA_SNAPSHOT_PATH).
+        With from_snapshot=True the years found in the last snapshot for the
+        same filter are returned without calling the API.
+
+        Returns:
+            Dictionary mapping years to {page path: active user count}
+        """
+        if from_snapshot:
+            return self._load_snapshot(years, page_path_filter)
 
-            self._log(f"Fetched {len(page_stats)} page stats from GA4 for {year}")
-            return page_stats
+        if not self.property_id:
+            self._log("GA_PROPERTY_ID not configured", "error")
+            return {}
 
+        stats_by_year = {year: {} for year in years}
+        try:
+            for year, page_path, active_users in self.iter_page_active_users(
+                years, page_path_filter
+            ):
+                stats_by_year[year][page_path] = active_users
         except Exception as e:
             self._log(f"Error fetching GA4 data: {str(e)}", "error")
             return {}
 
+        for year in sorted(stats_by_year):
+            self._log(
+                f"Fetched {len(stats_by_year[year])} page stats from GA4 for {year}"
+            )
+        self._save_snapshot(stats_by_year, page_path_filter)
+        return stats_by_year
+
+    def fetch_page_active_users(
+        self,
+        year: int,
+        page_path_filter: Optional[str] = None,
+    ) -> Dict[str, int]:
+        """
+        Fetch active user counts grouped by page path for a specific year.
+
+        Args:
+            year: The year to fetch data for (e.g., 2025)
+            page_path_filter: Optional filter for page paths
+                            (e.g., "/event/" to only get event pages)
+
+        Returns:
+            Dictionary mapping page paths to active user counts
+            Example: {"/en/event/lake-annecy-2025/": 150, ...}
+        """
+        return self.fetch_page_active_users_by_year([year], page_path_filter).get(
+            year, {}
+        )
+
+    def _save_snapshot(
+        self, stats_by_year: Dict[int, Dict[str, int]], page_path_filter: Optional[str]
+    ):
+        """Write the last report to the snapshot file, best effort."""
+        path = settings.GA_SNAPSHOT_PATH
+        snapshot = {
+            "property_id": self.property_id,
+            "page_path_filter": page_path_filter,
+            "fetched_at": timezone.now().isoformat(),
+            "years": {str(year): stats for year, stats in stats_by_year.items()},
+        }
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self._log(f"Could not write GA4 snapshot {path}: {str(e)}", "warning")
+
+    def _load_snapshot(
+        self, years: List[int], page_path_filter: Optional[str]
+    ) -> Dict[int, Dict[str, int]]:
+        path = settings.GA_SNAPSHOT_PATH
+        try:
+            with open(path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError) as e:
+            self._log(f"Could not read GA4 snapshot {path}: {str(e)}", "error")
+            return {}
+
+        if snapshot.get("page_path_filter") != page_path_filter:
+            self._log(
+                f"GA4 snapshot was fetched with filter "
+                f"{snapshot.get('page_path_filter')!r}, not {page_path_filter!r}",
+                "error",
+            )
+            return {}
+
+        stats_by_year = {}
+        for year in years:
+            if str(year) in snapshot["years"]:
+                stats_by_year[year] = snapshot["years"][str(year)]
+            else:
+                self._log(f"GA4 snapshot has no data for {year}", "warning")
+        self._log(f"Using GA4 snapshot from {snapshot.get('fetched_at')}")
+        return stats_by_year
+
     def match_events_to_analytics(
         self,
         page_stats: Dict[str, int],
@@ -143,6 +276,9 @@ class GoogleAnalyticsService:
         """
         Match GA4 page statistics to events by slug.
 
+        Canonical event paths are parsed into a slug lookup table in a single
+        pass; other paths containing the slug are still counted.
+
         Args:
             page_stats: Dictionary of page paths to active user counts
             events: List of Event objects with slug field
@@ -150,27 +286,55 @@ class GoogleAnalyticsService:
         Returns:
             Dictionary mapping event IDs to active user counts
         """
-        event_stats = {}
+        # Parse canonical paths once into slug -> (summed users, page count).
+        # This handles multiple language paths (/en/event/slug/, /de/event/slug/)
+        slug_users = defaultdict(lambda: [0, 0])
+        irregular_paths = []
+        for page_path, user_count in page_stats.items():
+            match = EVENT_PATH_RE.match(page_path)
+            if match:
+                totals = slug_users[match.group(1)]
+                totals[0] += user_count
+                totals[1] += 1
+            else:
+                irregular_paths.append((page_path, user_count))
 
+        # Irregular paths (tracking suffixes, old URL schemes, ...) are matched
+        # by substring search over one joined string instead of per path.
+        # Newlines cannot occur in paths or slugs, so matches never span paths.
+        haystack = "\n".join(path for path, _ in irregular_paths)
+        offsets = []
+        position = 0
+        for path, _ in irregular_paths:
+            offsets.append(position)
+            position += len(path) + 1
+
+        event_stats = {}
         for event in events:
             if not event.slug:
                 continue
 
-            # Sum up all pages containing this event's slug
-            # This handles multiple language paths (/en/event/slug/, /de/event/slug/)
-            total_users = 0
-            matched_paths = []
+            total_users, matched_pages = slug_users.get(event.slug, (0, 0))
 
-            for page_path, user_count in page_stats.items():
-                if event.slug in page_path:
-                    total_users += user_count
-                    matched_paths.append(page_path)
+            matched_irregular = set()
+            start = haystack.find(event.slug)
+            while start != -1:
+                index = bisect_right(offsets, start) - 1
+                matched_irregular.add(index)
+                # Continue after the end of this path
+                next_path = index + 1
+                if next_path >= len(offsets):
+                    break
+                start = haystack.find(event.slug, offsets[next_path])
+            for index in matched_irregular:
+                total_users += irregular_paths[index][1]
+            matched_pages += len(matched_irregular)
 
             if total_users > 0:
                 event_stats[event.id] = total_users
                 self._log(
                     f"  Event {event.id} ({event.slug}): {total_users} users "
-                    f"from {len(matched_paths)} page(s)"
+                    f"from {matched_pages} page(s)"
                 )
 
         self._log(f"Matched {len(event_stats)} events to analytics data")
@@ -0,0 +1,152 @@
+"""
+Packed marker data for the frontend map.
+
+locationsFiltered returns full LocationNode objects, although the map only
+needs a position per location to draw its markers. The marker endpoint
+(app/views.py, /api/map-markers) answers the same filters with columnar
+arrays built from a single values_list query:
+
+    {
+      "count": 2,
+      "ids": [12, 40],                 # Location primary keys
+      "lat": [47.36667, 46.2],
+      "lng": [8.55, 6.15],
+      "waterType": [3, 0],             # index into waterTypes + 1, 0 = unknown
+      "waterTypes": ["river", "sea", "lake", "pool"],
+      "nextEvent": [22462, 22470]      # first matching event, days since 1970-01-01
+    }
+
+With ``encoding=float32``, "lat" and "lng" are instead base64 strings of
+little-endian float32 arrays. Payloads are cached gzip-compressed with the
+versioned GraphQL cache, so they are rebuilt whenever events, locations or
+organizers change.
+"""
+import base64
+import gzip
+import hashlib
+import json
+import sys
+from array import array
+from datetime import date
+from typing import Optional, Tuple
+
+from django.core.cache import cache
+from django.db.models import Min, Q
+
+from app.graphql import cache as graphql_cache
+from app.models import Location
+
+ENCODINGS = ("json", "float32")
+
+WATER_TYPES = [value for value, _ in Location._meta.get_field("water_type").choices]
+
+EPOCH = date(1970, 1, 1)
+
+# Coordinates are rounded to about a metre in the JSON encoding
+COORDINATE_DIGITS = 5
+
+
+def location_filter_q(
+    race_distance_gte: Optional[float] = None,
+    race_distance_lte: Optional[float] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    keyword: str = "",
+    organizer_slug: Optional[str] = None,
+    organizer_id: Optional[str] = None,
+) -> Q:
+    """
+    Locations with a visible event matching the map filters. ``organizer_id``
+    is a relay global ID ("OrganizerNode:<pk>", base64 encoded).
+    """
+    conditions = {
+        "events__races__distance__gte": race_distance_gte,
+        "events__races__distance__lte": race_distance_lte,
+        "events__date_start__gte": date_from,
+        "events__date_start__lte": date_to,
+    }
+    q = Q(
+        events__invisible=False,
+        **{lookup: value for lookup, value in conditions.items() if value is not None},
+    )
+
+    if keyword and len(keyword) >= 3:
+        q = q & (Q(events__name__istartswith=keyword) | Q(city__istartswith=keyword))
+
+    if organizer_slug:
+        q = q & Q(events__organizer__slug=organizer_slug)
+
+    if organizer_id:
+        model_with_pk = base64.b64decode(organizer_id).decode("utf-8")
+        model_name, pk = model_with_pk.split(":")
+        q = q & Q(events__organizer__id=pk)
+
+    return q
+
+
+def _float32_base64(values) -> str:
+    packed = array("f", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return base64.b64encode(packed.tobytes()).decode("ascii")
+
+
+def build_markers(encoding: str = "json", **filters) -> bytes:
+    """Render the marker payload (uncompressed JSON bytes)"""
+    rows = (
+        Location.objects.filter(location_filter_q(**filters))
+        .filter(lat__isnull=False, lng__isnull=False)
+        # Filtering first restricts the aggregate to the matching events
+        .annotate(next_event=Min("events__date_start"))
+        .order_by("id")
+        .values_list("id", "lat", "lng", "water_type", "next_event")
+    )
+    ids, lats, lngs, water_types, next_events = [], [], [], [], []
+    for pk, lat, lng, water_type, next_event in rows:
+        ids.append(pk)
+        lats.append(lat)
+        lngs.append(lng)
+        water_types.append(
+            WATER_TYPES.index(water_type) + 1 if water_type in WATER_TYPES else 0
+        )
+        next_events.append((next_event - EPOCH).days if next_event else None)
+
+    if encoding == "float32":
+        lat, lng = _float32_base64(lats), _float32_base64(lngs)
+    else:
+        lat = [round(value, COORDINATE_DIGITS) for value in lats]
+        lng = [round(value, COORDINATE_DIGITS) for value in lngs]
+
+    payload = {
+        "count": len(ids),
+        "ids": ids,
+        "lat": lat,
+        "lng": lng,
+        "waterType": water_types,
+        "waterTypes": WATER_TYPES,
+        "nextEvent": next_events,
+    }
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def get_markers(encoding: str = "json", **filters) -> Tuple[str, bytes]:
+    """Return the ETag and the gzip-compressed marker payload, cached"""
+    params = {
+        name: value if isinstance(value, (str, int, float)) else str(value)
+        for name, value in filters.items()
+        if value is not None
+    }
+    params["encoding"] = encoding
+    cache_key = graphql_cache.make_key(
+        "map_markers",
+        params,
+        (graphql_cache.EVENTS, graphql_cache.LOCATIONS, graphql_cache.ORGANIZERS),
+    )
+    cached = cache.get(cache_key)
+    if cached is None:
+        content = build_markers(encoding, **filters)
+        etag = f'"{hashlib.md5(content).hexdigest()}"'
+        # mtime=0 keeps the gzip bytes stable for identical content
+        cached = (etag, gzip.compress(content, mtime=0))
+        cache.set(cache_key, cached, graphql_cache.DEFAULT_TIMEOUT)
+    return cached
@@ -0,0 +1,131 @@
+"""
+Process-wide fuzzy matcher for organizer names.
+
+EventProcessor used to load every organizer and score the extracted name
+against all of them with token_sort_ratio, once per processed event. The
+matcher instead keeps the normalised, token-sorted names in memory together
+with a trigram index, so only organizers sharing a trigram and of a
+compatible length are scored. The scores are the ones thefuzz's
+token_sort_ratio would return.
+
+Organizers created since the last lookup are picked up incrementally (one
+query for IDs above the highest one seen); app/signals.py keeps renamed and
+deleted organizers in sync within the process. Organizers deleted elsewhere
+are dropped from the index when they come up as a match.
+"""
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Optional, Set
+
+from rapidfuzz import fuzz
+from thefuzz import utils
+
+from app.models import Organizer
+
+logger = logging.getLogger(__name__)
+
+# Minimum similarity score (0-100)
+SCORE_CUTOFF = 80
+
+
+def match_key(name: str) -> str:
+    """Normalised name with sorted tokens, as compared by token_sort_ratio"""
+    return " ".join(sorted(utils.full_process(name, force_ascii=True).split()))
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f" {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class OrganizerMatcher:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys: Dict[int, str] = {}
+        self._index: Dict[str, Set[int]] = defaultdict(set)
+        self._max_id = 0
+
+    def _add(self, organizer: Organizer):
+        self._remove(organizer.pk)
+        key = match_key(organizer.name or "")
+        self._keys[organizer.pk] = key
+        for trigram in _trigrams(key):
+            self._index[trigram].add(organizer.pk)
+        self._max_id = max(self._max_id, organizer.pk)
+
+    def _remove(self, organizer_id: int):
+        key = self._keys.pop(organizer_id, None)
+        if key is None:
+            return
+        for trigram in _trigrams(key):
+            ids = self._index.get(trigram)
+            if ids:
+                ids.discard(organizer_id)
+                if not ids:
+                    del self._index[trigram]
+
+    def _load_new(self):
+        new = Organizer.objects.filter(pk__gt=self._max_id).only("id", "name")
+        for organizer in new.order_by("pk"):
+            self._add(organizer)
+
+    def add(self, organizer: Organizer):
+        """Add or update an organizer in the index"""
+        with self._lock:
+            self._add(organizer)
+
+    def remove(self, organizer_id: int):
+        with self._lock:
+            self._remove(organizer_id)
+
+    def find(self, name: str) -> Optional[Organizer]:
+        """Return the best matching organizer scoring at least SCORE_CUTOFF"""
+        key = match_key(name)
+        if not key:
+            return None
+
+        with self._lock:
+            self._load_new()
+
+            candidates = set()
+            for trigram in _trigrams(key):
+                candidates |= self._index.get(trigram, set())
+
+            scores = []
+            for organizer_id in candidates:
+                other = self._keys[organizer_id]
+                # fuzz.ratio cannot reach the cutoff if the lengths differ
+                # too much, so skip the comparison
+                similarity = 200 * min(len(key), len(other)) / (len(key) + len(other))
+                if similarity < SCORE_CUTOFF - 0.5:
+                    continue
+                score = int(round(fuzz.ratio(key, other)))
+                if score >= SCORE_CUTOFF:
+                    scores.append((-score, organizer_id))
+
+            # The index may be stale if organizers were deleted or merged in
+            # another process, so confirm the match in the database
+            for _, organizer_id in sorted(scores):
+                organizer = Organizer.objects.filter(pk=organizer_id).first()
+                if organizer:
+                    return organizer
+                self._remove(organizer_id)
+            return None
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_organizer_matcher() -> OrganizerMatcher:
+    """Return the process-wide organizer matcher"""
+    global _matcher
+    with _matcher_lock:
+        if _matcher is None:
+            _matcher = OrganizerMatcher()
+    return _matcher
+
+
+def organizer_matcher_loaded() -> bool:
+    return _matcher is not None
@@ -0,0 +1,181 @@
+"""
+Persistent on-disk cache for scraped page content.
+
+Firecrawl charges per scrape and the same pages are scraped by the crawler,
+the event processor, the agent's scrape tool, URL discovery and the yearly
+update commands. Entries are stored in a SQLite file keyed by URL plus the
+crawl profile actions, expire after a TTL and are evicted least recently used
+once the cache grows beyond its size budget.
+
+Firecrawl does not pass on the ETag/Last-Modified headers of the page, and
+an extra request for them would bypass the crawl rate limits, so stale
+entries are simply scraped again.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ScrapeCache:
+    """SQLite backed, size-bounded LRU cache for scraped markdown"""
+
+    def __init__(self, path: str, ttl_seconds: float, max_bytes: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        # Bytes stored, tracked from the first write on so that inserts need
+        # not sum up the whole table. Writes of other processes sharing the
+        # file are only seen when evicting, so the budget is approximate.
+        self._total = None
+        self._total_lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS scrape_cache (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS scrape_cache_accessed_at "
+                "ON scrape_cache (accessed_at)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(url: str, profile=None) -> str:
+        actions = profile.get("actions") if profile else None
+        raw = json.dumps({"url": url, "actions": actions}, sort_keys=True)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, url: str, profile=None) -> Optional[str]:
+        """Return cached content for the URL, or None if missing or stale."""
+        if self.ttl_seconds <= 0:
+            self.misses += 1
+            return None
+
+        key = self.make_key(url, profile)
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT content, fetched_at FROM scrape_cache WHERE key = ?",
+            (key,),
+        ).fetchone()
+        now = time.time()
+        if row is None or now - row[1] > self.ttl_seconds:
+            self.misses += 1
+            return None
+
+        with conn:
+            conn.execute(
+                "UPDATE scrape_cache SET accessed_at = ? WHERE key = ?",
+                (now, key),
+            )
+        self.hits += 1
+        return row[0]
+
+    def set(self, url: str, content: str, profile=None):
+        """Store scraped content, evicting least recently used entries if needed."""
+        if not content:
+            return
+        key = self.make_key(url, profile)
+        size = len(content.encode())
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            replaced = conn.execute(
+                "SELECT size FROM scrape_cache WHERE key = ?", (key,)
+            ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO scrape_cache "
+                "(key, url, content, fetched_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, url, content, now, now, size),
+            )
+
+        with self._total_lock:
+            if self._total is None:
+                self._total = self._stored_bytes(conn)
+            else:
+                self._total += size - (replaced[0] if replaced else 0)
+            if self._total > self.max_bytes:
+                with conn:
+                    self._evict(conn)
+
+    @staticmethod
+    def _stored_bytes(conn: sqlite3.Connection) -> int:
+        query = "SELECT COALESCE(SUM(size), 0) FROM scrape_cache"
+        return conn.execute(query).fetchone()[0]
+
+    def _evict(self, conn: sqlite3.Connection):
+        total = self._stored_bytes(conn)
+        self._total = total
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute(
+            "SELECT key, size FROM scrape_cache ORDER BY accessed_at"
+        ).fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM scrape_cache WHERE key = ?", evicted)
+        self._total = total
+        logger.info(f"Evicted {len(evicted)} entries from the scrape cache")
+
+    def stats(self) -> str:
+        return f"{self.hits} hits, {self.misses} misses"
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_scrape_cache() -> Optional[ScrapeCache]:
+    """Return the process-wide scrape cache, or None if disabled in settings."""
+    global _default_cache
+    if not settings.SCRAPE_CACHE_ENABLED:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ScrapeCache(
+                path=settings.SCRAPE_CACHE_PATH,
+                ttl_seconds=settings.SCRAPE_CACHE_TTL_HOURS * 3600,
+                max_bytes=settings.SCRAPE_CACHE_MAX_MB * 1024 * 1024,
+            )
+    return _default_cache
+
+
+def set_scrape_cache_ttl(hours: float):
+    """Override the TTL of the process-wide cache, e.g. from a command option."""
+    cache = get_scrape_cache()
+    if cache is not None:
+        cache.ttl_seconds = hours * 3600
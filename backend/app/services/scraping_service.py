@@ -1,19 +1,66 @@
 import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
 from firecrawl import FirecrawlApp
 from django.core.management.base import OutputWrapper
 
+from app.services.scrape_cache import get_scrape_cache
+
 logger = logging.getLogger(__name__)
 
 
+class DomainRateLimiter:
+    """
+    Politeness limits for concurrent crawling: at most ``max_concurrent``
+    requests in flight per domain, started at least ``min_interval`` seconds
+    apart. Safe to share between threads.
+    """
+
+    def __init__(self, max_concurrent: int = 2, min_interval: float = 1.0):
+        self.max_concurrent = max(max_concurrent, 1)
+        self.min_interval = max(min_interval, 0.0)
+        self._lock = threading.Lock()
+        self._semaphores = defaultdict(
+            lambda: threading.BoundedSemaphore(self.max_concurrent)
+        )
+        self._next_start = defaultdict(float)
+
+    @contextmanager
+    def slot(self, url: str):
+        """Block until a request to the domain of ``url`` may be started."""
+        domain = urlparse(url).netloc.lower()
+        with self._lock:
+            semaphore = self._semaphores[domain]
+        with semaphore:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start[domain])
+                self._next_start[domain] = start + self.min_interval
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+
 class ScrapingService:
     """Service for web scraping using Firecrawl"""
 
     def __init__(
-        self, api_key: str, stdout: OutputWrapper = None, stderr: OutputWrapper = None
+        self,
+        api_key: str,
+        stdout: OutputWrapper = None,
+        stderr: OutputWrapper = None,
+        rate_limiter: DomainRateLimiter = None,
+        use_cache: bool = True,
     ):
         self.firecrawl_app = FirecrawlApp(api_key=api_key)
         self.stdout = stdout
         self.stderr = stderr
+        self.rate_limiter = rate_limiter
+        self.cache = get_scrape_cache() if use_cache else None
 
     def _log(self, msg: str, level: str = "info", style_func=None):
         """Log a message to both the logger and command output if available"""
@@ -41,6 +88,16 @@ class ScrapingService:
             url: The URL to scrape
             profile: Optional crawl profile with actions to perform before scraping
         """
+        cached = None
+        if self.cache:
+            try:
+                cached = self.cache.get(url, profile)
+            except Exception as e:
+                self._log(f"Failed to read scrape cache for {url}: {str(e)}", "warning")
+            if cached is not None:
+                self._log(f"Using cached content for {url}")
+                return cached
+
         try:
             scrape_kwargs = {
                 "formats": ["markdown"],
@@ -56,10 +113,21 @@ class ScrapingService:
                     f"Using crawl profile '{profile.get('name', 'unnamed')}' for {url}"
                 )
 
-            self._log(f"Scraping {url}...", "info")
-
-            scrape_result = self.firecrawl_app.scrape(url, **scrape_kwargs)
-            return scrape_result.markdown or ""
+            if self.rate_limiter:
+                with self.rate_limiter.slot(url):
+                    self._log(f"Scraping {url}...", "info")
+                    scrape_result = self.firecrawl_app.scrape(url, **scrape_kwargs)
+            else:
+                self._log(f"Scraping {url}...", "info")
+                scrape_result = self.firecrawl_app.scrape(url, **scrape_kwargs)
+            content = scrape_result.markdown or ""
         except Exception as e:
             self._log(f"Failed to scrape {url}: {str(e)}", "error")
             return ""
+
+        if self.cache:
+            try:
+                self.cache.set(url, content, profile)
+            except Exception as e:
+                self._log(f"Failed to cache scrape of {url}: {str(e)}", "warning")
+        return content
@@ -0,0 +1,279 @@
+"""
+Pre-rendered, gzip-compressed sitemaps.
+
+The sitemap is split into an index and one child sitemap per section
+(static pages, events, organizers). Each file is rendered once and stored in
+the default file storage (Google Cloud Storage in production), one directory
+per site (scheme + host), so crawler hits only read a stored file. The web
+workers and the Django Q cluster therefore share the files.
+
+A child is rebuilt when it is missing, when it was rendered on an earlier
+day (past events drop out of it) or when its section changed since it was
+rendered (see app/signals.py). Render and change times are kept in the
+database (SitemapFile, SitemapSection), so changes saved by a crawl in the
+Django Q cluster are noticed by the web workers too. Only the affected child
+is re-rendered; the index follows whenever one of its children is newer. A
+Django Q schedule calls regenerate_all() nightly so the first crawler of the
+day does not pay for the rebuild.
+"""
+import gzip
+import logging
+import re
+from datetime import datetime
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from django_sitemaps import Sitemap, S
+from lxml import etree
+
+from app import models
+
+logger = logging.getLogger(__name__)
+
+STATIC = "static"
+EVENTS = "events"
+ORGANIZERS = "organizers"
+SECTIONS = (STATIC, EVENTS, ORGANIZERS)
+
+INDEX = "index"
+
+# Sections whose content depends on today's date
+DATED_SECTIONS = (EVENTS, ORGANIZERS)
+
+INDEX_FILENAME = "sitemap.xml.gz"
+
+# needs to correspond to the frontend
+OTHER_LANGUAGES = ["de", "fr", "it", "es", "ru", "ja"]
+
+
+def section_filename(section: str) -> str:
+    if section == INDEX:
+        return INDEX_FILENAME
+    return f"sitemap-{section}.xml.gz"
+
+
+def _storage_name(base_url: str, section: str) -> str:
+    # base_url comes from request.build_absolute_uri, so its host has passed
+    # the ALLOWED_HOSTS check; the pattern only keeps it a valid path segment
+    site = re.sub(r"[^A-Za-z0-9.:_-]", "_", base_url.replace("://", "_").rstrip("/"))
+    return f"{settings.SITEMAP_STORAGE_DIR}/{site}/{section_filename(section)}"
+
+
+def _touch_section(section: str):
+    now = timezone.now()
+    if not models.SitemapSection.objects.filter(name=section).update(changed_at=now):
+        models.SitemapSection.objects.update_or_create(
+            name=section, defaults={"changed_at": now}
+        )
+
+
+def mark_stale(section: str):
+    """Record that a section changed; its child sitemap is rebuilt on next access."""
+    # Stamped when the change is committed, so a rendering that could not
+    # see it yet started earlier and counts as stale
+    transaction.on_commit(partial(_touch_section, section))
+
+
+def _is_fresh(
+    sitemap_file: Optional[models.SitemapFile], changed_at: Optional[datetime]
+) -> bool:
+    if sitemap_file is None:
+        return False
+    rendered_at = sitemap_file.rendered_at
+    if changed_at and rendered_at <= changed_at:
+        return False
+    if sitemap_file.section in DATED_SECTIONS:
+        return timezone.localdate(rendered_at) == timezone.localdate()
+    return True
+
+
+def _write(
+    base_url: str, section: str, rendered_at: datetime, xml: bytes
+) -> Tuple[models.SitemapFile, bytes]:
+    name = _storage_name(base_url, section)
+    # mtime=0 keeps the gzip bytes stable for identical content
+    content = gzip.compress(xml, mtime=0)
+    # Google Cloud Storage overwrites in place; other storages would pick a
+    # new name for an existing file
+    if not getattr(default_storage, "file_overwrite", False):
+        if default_storage.exists(name):
+            default_storage.delete(name)
+    default_storage.save(name, ContentFile(content))
+    sitemap_file, _ = models.SitemapFile.objects.update_or_create(
+        name=name,
+        defaults={"site": base_url, "section": section, "rendered_at": rendered_at},
+    )
+    return sitemap_file, content
+
+
+def _add_static(sitemap: Sitemap):
+    # Homepage
+    sitemap.add(
+        "/en/",
+        changefreq="monthly",
+        priority=1,
+        alternates={code: urljoin("/", code) for code in OTHER_LANGUAGES},
+    )
+
+    # Info pages
+    info_tabs = ["help", "organizers", "contributors", "partners", "imprint"]
+    for tab in info_tabs:
+        sitemap.add(
+            f"/en/info/{tab}",
+            changefreq="yearly",
+            priority=0.3,
+            alternates={code: f"/{code}/info/{tab}" for code in OTHER_LANGUAGES},
+        )
+
+
+def _add_events(sitemap: Sitemap):
+    events = models.Event.objects.filter(date_start__gte=datetime.now()).values_list(
+        "slug", "edited_at"
+    )
+    for slug, edited_at in events.iterator():
+        sitemap.add(
+            f"/en/event/{slug}",
+            changefreq="monthly",
+            priority=0.5,
+            alternates={code: f"/{code}/event/{slug}" for code in OTHER_LANGUAGES},
+            lastmod=edited_at,
+        )
+
+
+def _add_organizers(sitemap: Sitemap):
+    slugs = (
+        models.Organizer.objects.filter(
+            events__date_start__gte=datetime.now(), slug__isnull=False
+        )
+        .exclude(slug="")
+        .values_list("slug", flat=True)
+        .distinct()
+    )
+    for slug in slugs.iterator():
+        sitemap.add(
+            f"/en/organizer/{slug}",
+            changefreq="monthly",
+            priority=0.7,
+            alternates={code: f"/{code}/organizer/{slug}" for code in OTHER_LANGUAGES},
+        )
+
+
+SECTION_BUILDERS = {
+    STATIC: _add_static,
+    EVENTS: _add_events,
+    ORGANIZERS: _add_organizers,
+}
+
+
+def render_section(section: str, base_url: str) -> bytes:
+    sitemap = Sitemap(build_absolute_uri=lambda loc: urljoin(base_url, loc))
+    SECTION_BUILDERS[section](sitemap)
+    return sitemap.serialize(pretty_print=settings.DEBUG)
+
+
+def render_index(base_url: str, lastmods: Dict[str, datetime]) -> bytes:
+    entries = [
+        S.sitemap(
+            S.loc(urljoin(base_url, "/" + section_filename(section))),
+            S.lastmod(timezone.localtime(lastmods[section]).isoformat()),
+        )
+        for section in SECTIONS
+    ]
+    return etree.tostring(
+        S.sitemapindex(*entries),
+        encoding="UTF-8",
+        pretty_print=settings.DEBUG,
+        xml_declaration=True,
+    )
+
+
+def _render_section(base_url: str, section: str):
+    logger.info(f"Rendering {section} sitemap for {base_url}")
+    rendered_at = timezone.now()
+    return _write(base_url, section, rendered_at, render_section(section, base_url))
+
+
+def _render_index(base_url: str, children: Dict[str, models.SitemapFile]):
+    lastmods = {section: child.rendered_at for section, child in children.items()}
+    return _write(base_url, INDEX, timezone.now(), render_index(base_url, lastmods))
+
+
+def _stored_files(base_url: str) -> Dict[str, models.SitemapFile]:
+    return {
+        sitemap_file.section: sitemap_file
+        for sitemap_file in models.SitemapFile.objects.filter(site=base_url)
+    }
+
+
+def _changed_at() -> Dict[str, datetime]:
+    return dict(models.SitemapSection.objects.values_list("name", "changed_at"))
+
+
+def _fresh_sections(
+    base_url: str, sections, force: bool = False
+) -> Dict[str, models.SitemapFile]:
+    stored = _stored_files(base_url)
+    changed_at = _changed_at()
+    files = {}
+    for section in sections:
+        sitemap_file = stored.get(section)
+        if force or not _is_fresh(sitemap_file, changed_at.get(section)):
+            sitemap_file, _ = _render_section(base_url, section)
+        files[section] = sitemap_file
+    return files
+
+
+def get_section(
+    section: str, base_url: str, force: bool = False
+) -> models.SitemapFile:
+    """Return the stored child sitemap, rebuilding it first if stale."""
+    return _fresh_sections(base_url, [section], force)[section]
+
+
+def get_index(base_url: str, force: bool = False) -> models.SitemapFile:
+    """Return the stored sitemap index, rebuilding stale children first."""
+    children = _fresh_sections(base_url, SECTIONS, force)
+    index = models.SitemapFile.objects.filter(site=base_url, section=INDEX).first()
+    newest_child = max(child.rendered_at for child in children.values())
+    if force or index is None or index.rendered_at < newest_child:
+        index, _ = _render_index(base_url, children)
+    return index
+
+
+def read(sitemap_file: models.SitemapFile) -> bytes:
+    """The gzip-compressed content of a stored sitemap file."""
+    try:
+        with default_storage.open(sitemap_file.name, "rb") as f:
+            return f.read()
+    except Exception as e:
+        # E.g. removed from the bucket: render it again
+        logger.warning(f"Could not read {sitemap_file.name}, re-rendering: {e}")
+    if sitemap_file.section == INDEX:
+        children = _fresh_sections(sitemap_file.site, SECTIONS)
+        _, content = _render_index(sitemap_file.site, children)
+    else:
+        _, content = _render_section(sitemap_file.site, sitemap_file.section)
+    return content
+
+
+def known_sites() -> List[str]:
+    """Base URLs of every site a sitemap was rendered for."""
+    return list(
+        models.SitemapFile.objects.values_list("site", flat=True)
+        .distinct()
+        .order_by("site")
+    )
+
+
+def regenerate_all(force: bool = False) -> str:
+    """Bring the sitemaps of all known sites up to date (Django Q schedule)."""
+    sites = known_sites()
+    for base_url in sites:
+        get_index(base_url, force=force)
+    return f"Sitemaps up to date for {len(sites)} site(s)"
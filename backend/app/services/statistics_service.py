@@ -0,0 +1,90 @@
+"""
+Snapshot of the upcoming-event statistics shown on the homepage.
+
+The statistics used to be a three-way count(distinct ...) join run on every
+homepage load. They are now computed once into a snapshot (totals plus
+per-country and per-month breakdowns) and kept in the Django cache, keyed by
+the day and the versioned GraphQL cache generations of events and locations.
+Saving or deleting an event, race or location bumps those generations (see
+app/signals.py), so the next read rebuilds the snapshot; all other reads are
+a single cache lookup. As the day is part of the key, the events of the past
+day drop out with the first read after midnight.
+"""
+from datetime import date
+from typing import Dict, Optional
+
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from app.graphql import cache as graphql_cache
+from app.models import Event
+
+# Countries change with locations, the counts with events and races
+FAMILIES = (graphql_cache.EVENTS, graphql_cache.LOCATIONS)
+
+# Without a shared cache (CACHE_URL) every process keeps its own snapshot and
+# generations, so changes made in another process only show once it expires,
+# as for the other GraphQL cache entries
+TIMEOUT = graphql_cache.DEFAULT_TIMEOUT
+
+COUNTS = {
+    "event_count": Count("id", distinct=True),
+    "race_count": Count("races", distinct=True),
+}
+
+
+def _cache_key(today: date) -> str:
+    return graphql_cache.make_key("statistics", {"date": str(today)}, FAMILIES)
+
+
+def compute(today: date) -> Dict:
+    """Count the visible events from ``today`` on, with their races"""
+    events = Event.objects.filter(
+        date_start__gte=today, invisible=False, location__isnull=False
+    )
+    totals = events.aggregate(
+        countries_count=Count("location__country", distinct=True), **COUNTS
+    )
+    countries = (
+        events.values("location__country")
+        .annotate(**COUNTS)
+        .order_by("location__country")
+    )
+    months = (
+        events.annotate(month=TruncMonth("date_start"))
+        .values("month")
+        .annotate(**COUNTS)
+        .order_by("month")
+    )
+    return {
+        **totals,
+        "countries": [
+            {
+                "country": row["location__country"],
+                "event_count": row["event_count"],
+                "race_count": row["race_count"],
+            }
+            for row in countries
+        ],
+        "months": list(months),
+        "computed_at": timezone.now(),
+    }
+
+
+def get_snapshot() -> Dict:
+    """Return the current statistics, computing them if the snapshot is stale"""
+    today = timezone.localdate()
+    snapshot = cache.get(_cache_key(today))
+    if snapshot is None:
+        snapshot = refresh(today)
+    return snapshot
+
+
+def refresh(today: Optional[date] = None) -> Dict:
+    """Recompute and store the snapshot"""
+    today = today or timezone.localdate()
+    snapshot = compute(today)
+    cache.set(_cache_key(today), snapshot, TIMEOUT)
+    return snapshot
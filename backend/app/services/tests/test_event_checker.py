@@ -0,0 +1,75 @@
+"""
+Tests for the entry quality score of events.
+"""
+import importlib
+from datetime import date
+
+import pytest
+
+from app.models import Event, Location, Organizer, Race
+from app.services.event_checker import EventChecker
+
+pytestmark = pytest.mark.django_db
+
+migration = importlib.import_module("app.migrations.0060_event_quality_score")
+
+
+@pytest.fixture
+def event():
+    return Event.objects.create(
+        name="Lake Swim",
+        website="https://lake.example.org",
+        location=Location.objects.create(city="Zurich", country="CH", lat=47.4),
+        organizer=Organizer.objects.create(name="Swim Club", website="https://x"),
+        date_start=date(2030, 7, 1),
+        date_end=date(2030, 7, 1),
+    )
+
+
+def _stored_score(event):
+    return Event.objects.values_list("quality_score", flat=True).get(pk=event.pk)
+
+
+class TestEventChecker:
+    def test_event_and_location_fields(self, event):
+        # website 5, location 10, organizer 2; city, country and lat 10 each
+        assert EventChecker(event).get_rating() == int(0.5 * 17 + 0.3 * 30)
+
+    def test_races_are_averaged(self, event):
+        Race.objects.create(event=event, date=event.date_start, distance=5)
+        Race.objects.create(event=event, date=event.date_start, distance=2, name="B")
+        assert EventChecker(event).get_rating() == int(
+            0.5 * 17 + 0.3 * 30 + 0.3 * (10 + 15) / 2
+        )
+
+    def test_rate_events(self, event):
+        assert EventChecker.rate_events(Event.objects.all()) == {
+            event.pk: EventChecker(event).get_rating()
+        }
+
+
+class TestStoredScore:
+    def test_stored_on_save(self, event):
+        assert _stored_score(event) == EventChecker(event).get_rating()
+
+    def test_refreshed_when_a_race_is_added(self, event):
+        before = _stored_score(event)
+        Race.objects.create(event=event, date=event.date_start, distance=5, name="A")
+        assert _stored_score(event) > before
+
+    def test_refreshed_when_the_location_changes(self, event):
+        before = _stored_score(event)
+        event.location.header_photo = "location_header/lake.jpg"
+        event.location.save()
+        assert _stored_score(event) > before
+
+
+class TestMigration:
+    def test_matches_event_checker(self, event):
+        # The migration keeps its own copy of the rules, which only has to
+        # agree with the EventChecker of its time
+        Race.objects.create(event=event, date=event.date_start, distance=5)
+        event = Event.objects.get(pk=event.pk)
+        assert migration._rating(event) == EventChecker(event).get_rating()
+        event.location = None
+        assert migration._rating(event) == EventChecker(event).get_rating()
@@ -0,0 +1,117 @@
+"""
+Tests for saving extracted events and their races.
+"""
+from datetime import date
+
+import pytest
+from djmoney.money import Money
+
+from app.models import CrawlSource, Event, Location, Organizer, Race
+from app.services.event_processor import EventProcessor
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def processor():
+    organizer = Organizer.objects.create(name="Swim Club", website="https://x")
+    crawl_source = CrawlSource.objects.create(
+        name="Swim Club", homepage_url="https://x", organizer=organizer
+    )
+    Location.objects.create(city="Zurich", country="CH")
+    return EventProcessor(firecrawl_api_key="x", crawl_source=crawl_source)
+
+
+def _race(**values):
+    return {"date": "2030-07-01", "distance": 5, "name": "Classic", **values}
+
+
+def _data(races):
+    return {
+        "event": {
+            "name": "Lake Swim",
+            "location": {"city": "Zurich", "country": "Switzerland"},
+            "date_start": "2030-07-01",
+            "date_end": "2030-07-01",
+        },
+        "races": races,
+    }
+
+
+class TestCleanRace:
+    def test_normalizes_values(self):
+        race = EventProcessor._clean_race(
+            _race(
+                distance="2.5",
+                race_time="10:30",
+                wetsuit="optional",
+                price={"amount": 25, "currency": "CHF"},
+            )
+        )
+        assert race["date"] == date(2030, 7, 1)
+        assert race["distance"] == 2.5
+        assert race["race_time"].hour == 10
+        assert race["wetsuit"] == "optional"
+        assert race["price"] == Money(25, "CHF")
+
+    @pytest.mark.parametrize(
+        "values",
+        [
+            {"distance": None},
+            {"distance": "far"},
+            {"distance": 0},
+            {"date": "1 July 2030"},
+            {"date": None},
+        ],
+    )
+    def test_rejects_unusable_race(self, values):
+        assert EventProcessor._clean_race(_race(**values)) is None
+
+    def test_drops_values_the_model_cannot_store(self):
+        race = EventProcessor._clean_race(
+            _race(
+                name="x" * 80,
+                race_time="noon",
+                wetsuit="maybe",
+                price={"amount": "free", "currency": "EUR"},
+            )
+        )
+        assert race["name"] == "x" * 50
+        assert race["race_time"] is None
+        assert race["wetsuit"] is None
+        assert race["price"] is None
+
+    def test_null_price(self):
+        assert EventProcessor._clean_race(_race(price=None))["price"] is None
+
+
+class TestSaveEventData:
+    def test_bad_race_does_not_drop_the_event(self, processor):
+        event = processor._save_event_data(
+            _data(
+                [
+                    _race(price=None),
+                    _race(distance=None),
+                    _race(date="July 1st"),
+                    _race(distance=10, name="Marathon swim " * 5),
+                ]
+            ),
+            ["https://lake.example.org"],
+        )
+
+        assert Event.objects.filter(pk=event.pk).exists()
+        assert sorted(Race.objects.values_list("distance", flat=True)) == [5, 10]
+
+    def test_update_keeps_matched_races(self, processor):
+        urls = ["https://lake.example.org"]
+        event = processor._save_event_data(_data([_race(), _race(distance=2)]), urls)
+        kept = Race.objects.get(distance=5)
+
+        processor.update_existing = True
+        processor._save_event_data(
+            _data([_race(wetsuit="prohibited"), _race(distance=None)]), urls
+        )
+
+        assert list(event.races.values_list("id", "wetsuit")) == [
+            (kept.id, "prohibited")
+        ]
@@ -0,0 +1,87 @@
+"""
+Tests for the stored LLM extraction results (no DB, temporary SQLite file).
+"""
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from app.services.extraction_cache import MISSING, ExtractionCache
+
+PAGES = [{"url": "https://example.com", "content": "Lake swim, 5 July"}]
+
+
+@pytest.fixture
+def extraction_cache(tmp_path):
+    return ExtractionCache(
+        path=str(tmp_path / "extraction_cache.sqlite3"), max_age_seconds=90 * 86400
+    )
+
+
+def _key(**params):
+    return ExtractionCache.make_key("gpt", "v1", params, PAGES)
+
+
+class TestMakeKey:
+    def test_page_order_does_not_matter(self):
+        pages = PAGES + [{"url": "https://example.com/a", "content": "Races"}]
+        assert ExtractionCache.make_key(
+            "gpt", "v1", {}, pages
+        ) == ExtractionCache.make_key("gpt", "v1", {}, pages[::-1])
+
+    def test_changed_content_changes_the_key(self):
+        changed = [{"url": "https://example.com", "content": "Lake swim, 6 July"}]
+        assert _key() != ExtractionCache.make_key("gpt", "v1", {}, changed)
+
+    def test_params_are_part_of_the_key(self):
+        assert _key(target_year=2027) != _key(target_year=2028)
+
+
+class TestExtractionCache:
+    def test_missing(self, extraction_cache):
+        assert extraction_cache.get(_key()) is MISSING
+
+    def test_stored_result(self, extraction_cache):
+        extraction_cache.set(_key(), ["https://example.com"], {"event": {"name": "X"}})
+        assert extraction_cache.get(_key()) == {"event": {"name": "X"}}
+        assert extraction_cache.stats() == "1 hits, 0 misses (100% hit rate)"
+
+    def test_none_is_a_stored_result(self, extraction_cache):
+        extraction_cache.set(_key(), ["https://example.com"], None)
+        assert extraction_cache.get(_key()) is None
+
+    def test_entries_expire_after_the_default_max_age(self, extraction_cache):
+        with patch("app.services.extraction_cache.time.time", return_value=0.0):
+            extraction_cache.set(_key(), [], None)
+        with patch("app.services.extraction_cache.time.time", return_value=91 * 86400):
+            assert extraction_cache.get(_key()) is MISSING
+
+    def test_entries_with_a_short_max_age(self, extraction_cache):
+        with patch("app.services.extraction_cache.time.time", return_value=0.0):
+            extraction_cache.set(_key(), [], None, max_age_seconds=3 * 86400)
+        with patch("app.services.extraction_cache.time.time", return_value=86400):
+            assert extraction_cache.get(_key()) is None
+        with patch("app.services.extraction_cache.time.time", return_value=4 * 86400):
+            assert extraction_cache.get(_key()) is MISSING
+
+    def test_short_max_age_entries_are_purged_on_open(self, extraction_cache):
+        extraction_cache.set(_key(), [], None, max_age_seconds=-1)
+        ExtractionCache(extraction_cache.path, max_age_seconds=90 * 86400)
+        count = extraction_cache._connection().execute(
+            "SELECT COUNT(*) FROM extraction_cache"
+        )
+        assert count.fetchone()[0] == 0
+
+    def test_adds_max_age_to_existing_files(self, tmp_path):
+        path = str(tmp_path / "old.sqlite3")
+        with sqlite3.connect(path) as conn:
+            conn.execute(
+                "CREATE TABLE extraction_cache (key TEXT PRIMARY KEY, "
+                "urls TEXT NOT NULL, result TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "INSERT INTO extraction_cache VALUES (?, '[]', 'null', ?)",
+                (_key(), 1e12),
+            )
+        extraction_cache = ExtractionCache(path, max_age_seconds=1e13)
+        assert extraction_cache.get(_key()) is None
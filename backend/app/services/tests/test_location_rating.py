@@ -0,0 +1,99 @@
+"""
+Tests for the rating totals of locations, kept up to date by the Review and
+Event signals in app/signals.py.
+"""
+from datetime import date
+
+import pytest
+
+from app.models import Event, Location, Organizer, Review
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def organizer():
+    return Organizer.objects.create(name="Swim Club", website="https://x")
+
+
+def _location(city="Zurich"):
+    return Location.objects.create(city=city, country="CH")
+
+
+def _event(location, organizer):
+    return Event.objects.create(
+        name="Lake Swim",
+        website="https://lake.example.org",
+        location=location,
+        organizer=organizer,
+        date_start=date(2030, 7, 1),
+        date_end=date(2030, 7, 1),
+    )
+
+
+def _totals(location):
+    location.refresh_from_db()
+    return location.rating_count, location.rating_sum, location.average_rating
+
+
+class TestReviewSignals:
+    def test_created_reviews(self, organizer):
+        location = _location()
+        event = _event(location, organizer)
+        Review.objects.create(event=event, rating=4)
+        Review.objects.create(event=event, rating=5)
+        Review.objects.create(event=event, rating=None)
+        assert _totals(location) == (2, 9, 4.5)
+
+    def test_changed_rating(self, organizer):
+        location = _location()
+        review = Review.objects.create(event=_event(location, organizer), rating=2)
+        review.rating = 5
+        review.save()
+        assert _totals(location) == (1, 5, 5.0)
+
+    def test_deleted_review(self, organizer):
+        location = _location()
+        event = _event(location, organizer)
+        Review.objects.create(event=event, rating=2)
+        Review.objects.create(event=event, rating=4).delete()
+        assert _totals(location) == (1, 2, 2.0)
+
+    def test_last_review_deleted(self, organizer):
+        location = _location()
+        Review.objects.create(event=_event(location, organizer), rating=3).delete()
+        assert _totals(location) == (0, 0, None)
+
+    def test_review_moved_to_another_event(self, organizer):
+        zurich, geneva = _location(), _location("Geneva")
+        review = Review.objects.create(event=_event(zurich, organizer), rating=4)
+        review.event = _event(geneva, organizer)
+        review.save()
+        assert _totals(zurich) == (0, 0, None)
+        assert _totals(geneva) == (1, 4, 4.0)
+
+
+class TestEventSignals:
+    def test_event_moved_to_another_location(self, organizer):
+        zurich, geneva = _location(), _location("Geneva")
+        event = _event(zurich, organizer)
+        Review.objects.create(event=event, rating=3)
+        event = Event.objects.get(pk=event.pk)
+        event.location = geneva
+        event.save()
+        assert _totals(zurich) == (0, 0, None)
+        assert _totals(geneva) == (1, 3, 3.0)
+
+
+class TestRecomputeRatingAggregates:
+    def test_repairs_totals(self, organizer):
+        location = _location()
+        event = _event(location, organizer)
+        Review.objects.create(event=event, rating=2)
+        Review.objects.create(event=event, rating=3)
+        Location.objects.filter(pk=location.pk).update(
+            rating_count=0, rating_sum=0, average_rating=None
+        )
+        assert Location.recompute_rating_aggregates() == 1
+        assert _totals(location) == (2, 5, 2.5)
+        assert Location.recompute_rating_aggregates() == 0
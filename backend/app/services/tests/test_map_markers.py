@@ -0,0 +1,137 @@
+"""
+Tests for the packed map marker payload and its endpoint.
+"""
+import base64
+import gzip
+import json
+from array import array
+from datetime import date
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from app.models import Event, Location, Organizer, Race
+from app.services import map_markers
+
+pytestmark = pytest.mark.django_db
+
+DAY = date(2030, 7, 1)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def locations():
+    organizer = Organizer.objects.create(name="Swim Club", website="https://x")
+    lake = Location.objects.create(
+        city="Zurich", country="CH", lat=47.366671, lng=8.55, water_type="lake"
+    )
+    sea = Location.objects.create(city="Nice", country="FR", lat=43.7, lng=7.27)
+    Location.objects.create(city="Nowhere", country="CH")
+    for location, day, distance in [(lake, DAY, 2), (lake, date(2030, 6, 1), 10)]:
+        event = Event.objects.create(
+            name=f"Swim {location.city} {distance}",
+            website="https://x",
+            location=location,
+            organizer=organizer,
+            date_start=day,
+            date_end=day,
+        )
+        Race.objects.create(event=event, date=day, distance=distance)
+    Event.objects.create(
+        name="Hidden",
+        website="https://x",
+        location=sea,
+        organizer=organizer,
+        date_start=DAY,
+        date_end=DAY,
+        invisible=True,
+    )
+    return lake, sea
+
+
+def _payload(**filters):
+    return json.loads(map_markers.build_markers(**filters))
+
+
+class TestBuildMarkers:
+    def test_json_payload(self, locations):
+        lake, _ = locations
+
+        assert _payload() == {
+            "count": 1,
+            "ids": [lake.pk],
+            "lat": [47.36667],
+            "lng": [8.55],
+            "waterType": [map_markers.WATER_TYPES.index("lake") + 1],
+            "waterTypes": map_markers.WATER_TYPES,
+            "nextEvent": [(date(2030, 6, 1) - map_markers.EPOCH).days],
+        }
+
+    def test_filters_restrict_next_event(self, locations):
+        payload = _payload(race_distance_lte=5)
+
+        assert payload["nextEvent"] == [(DAY - map_markers.EPOCH).days]
+        assert _payload(race_distance_gte=20)["count"] == 0
+
+    def test_float32(self, locations):
+        payload = _payload(encoding="float32")
+
+        lats = array("f", base64.b64decode(payload["lat"]))
+        assert lats.tolist() == pytest.approx([47.366671])
+
+    def test_cache_follows_changes(self, locations):
+        _, sea = locations
+        etag, content = map_markers.get_markers()
+        assert map_markers.get_markers() == (etag, content)
+
+        hidden = sea.events.get()
+        hidden.invisible = False
+        hidden.save()
+
+        new_etag, content = map_markers.get_markers()
+        assert new_etag != etag
+        assert json.loads(gzip.decompress(content))["count"] == 2
+
+
+class TestMapMarkersView:
+    def test_gzip_and_etag(self, client, locations):
+        response = client.get(reverse("map_markers"), HTTP_ACCEPT_ENCODING="gzip")
+
+        assert response.status_code == 200
+        assert response["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response["Vary"]
+        assert json.loads(gzip.decompress(response.content))["count"] == 1
+
+        repeat = client.get(
+            reverse("map_markers"), HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        assert repeat.status_code == 304
+        assert repeat["ETag"] == response["ETag"]
+
+    def test_plain_response(self, client, locations):
+        response = client.get(reverse("map_markers"), {"date_from": "2030-06-15"})
+
+        assert "Content-Encoding" not in response
+        assert response.json()["nextEvent"] == [(DAY - map_markers.EPOCH).days]
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"date_from": "July"},
+            {"race_distance_gte": "far"},
+            {"encoding": "protobuf"},
+            {"organizer_id": "not-base64"},
+        ],
+    )
+    def test_bad_request(self, client, params):
+        response = client.get(reverse("map_markers"), params)
+
+        assert response.status_code == 400
+        assert "error" in response.json()
@@ -0,0 +1,51 @@
+"""
+Tests for the fuzzy organizer name matcher.
+"""
+import pytest
+
+from app.models import Organizer
+from app.services.organizer_matcher import OrganizerMatcher, match_key
+
+pytestmark = pytest.mark.django_db
+
+
+def _organizer(name):
+    return Organizer.objects.create(name=name, website="https://x")
+
+
+class TestOrganizerMatcher:
+    def test_match_key(self):
+        assert match_key("Swim-Club  ZURICH") == "club swim zurich"
+
+    def test_finds_similar_name(self):
+        club = _organizer("Swim Club Zurich")
+        _organizer("Lake Geneva Crossing")
+
+        assert OrganizerMatcher().find("Zurich Swimming Club") == club
+
+    def test_no_match_below_cutoff(self):
+        _organizer("Swim Club Zurich")
+
+        assert OrganizerMatcher().find("Rowing Club Basel") is None
+        assert OrganizerMatcher().find("") is None
+
+    def test_picks_up_new_organizers(self):
+        matcher = OrganizerMatcher()
+        assert matcher.find("Swim Club Zurich") is None
+
+        club = _organizer("Swim Club Zurich")
+
+        assert matcher.find("Swim Club Zurich") == club
+
+    def test_organizer_deleted_in_another_process(self):
+        # Signals only update the process-wide matcher, so a separate instance
+        # stands in for the index of another process
+        matcher = OrganizerMatcher()
+        merged = _organizer("Swim Club Zurich")
+        kept = _organizer("Swim Club Zuerich")
+        assert matcher.find("Swim Club Zurich") == merged
+
+        merged.delete()
+
+        assert matcher.find("Swim Club Zurich") == kept
+        assert merged.pk not in matcher._keys
@@ -0,0 +1,90 @@
+"""
+Tests for the on-disk scrape cache (no DB, uses a temporary SQLite file).
+"""
+from unittest.mock import patch
+
+import pytest
+
+from app.services.scrape_cache import ScrapeCache
+
+
+@pytest.fixture
+def scrape_cache(tmp_path):
+    return ScrapeCache(
+        path=str(tmp_path / "scrape_cache.sqlite3"), ttl_seconds=3600, max_bytes=100
+    )
+
+
+def _stored_keys(cache):
+    rows = cache._connection().execute("SELECT url FROM scrape_cache").fetchall()
+    return {url for url, in rows}
+
+
+class TestScrapeCache:
+    def test_hit_after_set(self, scrape_cache):
+        scrape_cache.set("https://example.com", "content")
+        assert scrape_cache.get("https://example.com") == "content"
+        assert scrape_cache.stats() == "1 hits, 0 misses"
+
+    def test_miss_for_unknown_url(self, scrape_cache):
+        assert scrape_cache.get("https://example.com") is None
+        assert scrape_cache.misses == 1
+
+    def test_profile_actions_are_part_of_the_key(self, scrape_cache):
+        profile = {"actions": [{"type": "click", "selector": "#more"}]}
+        scrape_cache.set("https://example.com", "expanded", profile)
+        assert scrape_cache.get("https://example.com") is None
+        assert scrape_cache.get("https://example.com", profile) == "expanded"
+
+    def test_stale_entry_is_a_miss(self, scrape_cache):
+        with patch("app.services.scrape_cache.time.time", return_value=1000.0):
+            scrape_cache.set("https://example.com", "content")
+        with patch("app.services.scrape_cache.time.time", return_value=5000.0):
+            assert scrape_cache.get("https://example.com") is None
+
+    def test_zero_ttl_disables_reads(self, scrape_cache):
+        scrape_cache.set("https://example.com", "content")
+        scrape_cache.ttl_seconds = 0
+        assert scrape_cache.get("https://example.com") is None
+
+    def test_set_makes_no_requests(self, scrape_cache):
+        with patch("requests.head") as head, patch("requests.get") as get:
+            scrape_cache.set("https://example.com", "content")
+        head.assert_not_called()
+        get.assert_not_called()
+
+    def test_empty_content_is_not_stored(self, scrape_cache):
+        scrape_cache.set("https://example.com", "")
+        assert _stored_keys(scrape_cache) == set()
+
+
+class TestEviction:
+    def test_least_recently_used_entries_are_evicted(self, scrape_cache):
+        for i, now in enumerate([1.0, 2.0, 3.0]):
+            with patch("app.services.scrape_cache.time.time", return_value=now):
+                scrape_cache.set(f"https://example.com/{i}", "x" * 40)
+        assert _stored_keys(scrape_cache) == {
+            "https://example.com/1",
+            "https://example.com/2",
+        }
+        assert scrape_cache._total == 80
+
+    def test_replacing_an_entry_does_not_count_twice(self, scrape_cache):
+        for _ in range(5):
+            scrape_cache.set("https://example.com", "x" * 40)
+        assert scrape_cache._total == 40
+        assert _stored_keys(scrape_cache) == {"https://example.com"}
+
+    def test_total_is_read_once(self, scrape_cache):
+        with patch.object(
+            ScrapeCache, "_stored_bytes", wraps=ScrapeCache._stored_bytes
+        ) as stored_bytes:
+            for i in range(3):
+                scrape_cache.set(f"https://example.com/{i}", "x" * 10)
+        assert stored_bytes.call_count == 1
+
+    def test_existing_entries_count_towards_the_budget(self, scrape_cache):
+        scrape_cache.set("https://example.com/0", "x" * 60)
+        reopened = ScrapeCache(scrape_cache.path, 3600, max_bytes=100)
+        reopened.set("https://example.com/1", "x" * 60)
+        assert _stored_keys(reopened) == {"https://example.com/1"}
@@ -0,0 +1,132 @@
+"""
+Tests for the pre-rendered sitemaps and their views.
+"""
+import gzip
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import pytest
+from django.core.files.storage import default_storage
+from django.test import Client
+from django.utils import timezone
+
+from app.models import Event, Location, Organizer, SitemapFile, SitemapSection
+from app.services import sitemap_service
+
+pytestmark = pytest.mark.django_db
+
+BASE_URL = "http://testserver/"
+
+
+@pytest.fixture(autouse=True)
+def storage(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.DEFAULT_FILE_STORAGE = "django.core.files.storage.FileSystemStorage"
+    settings.ALLOWED_HOSTS = ["testserver"]
+
+
+@pytest.fixture
+def event():
+    future = date.today() + timedelta(days=30)
+    return Event.objects.create(
+        name="Lake Swim",
+        slug="lake-swim",
+        website="https://lake.example.org",
+        location=Location.objects.create(city="Zurich", country="CH"),
+        organizer=Organizer.objects.create(
+            name="Swim Club", slug="swim-club", website="https://x"
+        ),
+        date_start=future,
+        date_end=future,
+    )
+
+
+def _xml(sitemap_file):
+    return gzip.decompress(sitemap_service.read(sitemap_file)).decode()
+
+
+def _rendered_sections():
+    with patch.object(
+        sitemap_service, "render_section", wraps=sitemap_service.render_section
+    ) as render_section:
+        sitemap_service.get_index(BASE_URL)
+    return sorted(call.args[0] for call in render_section.call_args_list)
+
+
+class TestSitemapService:
+    def test_renders_index_and_sections(self, event):
+        index = sitemap_service.get_index(BASE_URL)
+        assert "http://testserver/sitemap-events.xml.gz" in _xml(index)
+        events = sitemap_service.get_section(sitemap_service.EVENTS, BASE_URL)
+        assert "http://testserver/en/event/lake-swim" in _xml(events)
+        assert default_storage.exists(events.name)
+
+    def test_fresh_files_are_not_rendered_again(self, event):
+        sitemap_service.get_index(BASE_URL)
+        assert _rendered_sections() == []
+
+    def test_changed_section_is_rendered_again(
+        self, event, django_capture_on_commit_callbacks
+    ):
+        sitemap_service.get_index(BASE_URL)
+        with django_capture_on_commit_callbacks(execute=True):
+            event.name = "Lake Swim 2"
+            event.save()
+        assert set(SitemapSection.objects.values_list("name", flat=True)) == {
+            sitemap_service.EVENTS,
+            sitemap_service.ORGANIZERS,
+        }
+        assert _rendered_sections() == [
+            sitemap_service.EVENTS,
+            sitemap_service.ORGANIZERS,
+        ]
+
+    def test_change_is_stamped_on_commit(self, event):
+        # Inside the (test) transaction the change is not visible to others yet
+        sitemap_service.mark_stale(sitemap_service.EVENTS)
+        assert not SitemapSection.objects.exists()
+
+    def test_dated_sections_expire_at_midnight(self, event):
+        sitemap_service.get_index(BASE_URL)
+        SitemapFile.objects.exclude(section=sitemap_service.INDEX).update(
+            rendered_at=timezone.now() - timedelta(days=1)
+        )
+        assert _rendered_sections() == [
+            sitemap_service.EVENTS,
+            sitemap_service.ORGANIZERS,
+        ]
+
+    def test_missing_file_is_rendered_again(self, event):
+        events = sitemap_service.get_section(sitemap_service.EVENTS, BASE_URL)
+        default_storage.delete(events.name)
+        assert "lake-swim" in _xml(events)
+
+    def test_regenerate_all_uses_the_rendered_sites(self, event):
+        sitemap_service.get_index(BASE_URL)
+        sitemap_service.get_index("https://example.org/")
+        assert sitemap_service.known_sites() == [
+            BASE_URL,
+            "https://example.org/",
+        ]
+        assert sitemap_service.regenerate_all() == "Sitemaps up to date for 2 site(s)"
+
+
+class TestSitemapViews:
+    def test_index_is_served_compressed(self, event):
+        response = Client().get("/sitemap.xml", HTTP_ACCEPT_ENCODING="gzip")
+        assert response.status_code == 200
+        assert response["Content-Encoding"] == "gzip"
+        assert b"sitemap-events.xml.gz" in gzip.decompress(response.content)
+
+    def test_index_is_decompressed_without_gzip(self, event):
+        response = Client().get("/sitemap.xml")
+        assert b"sitemap-events.xml.gz" in response.content
+
+    def test_not_modified(self, event):
+        client = Client()
+        response = client.get("/sitemap-events.xml.gz")
+        assert b"lake-swim" in gzip.decompress(response.content)
+        response = client.get(
+            "/sitemap-events.xml.gz", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        assert response.status_code == 304
@@ -0,0 +1,96 @@
+"""
+Tests for the cached snapshot of the homepage statistics.
+"""
+from datetime import date, timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from app.models import Event, Location, Organizer, Race
+from app.services import statistics_service
+
+pytestmark = pytest.mark.django_db
+
+TODAY = date(2030, 6, 15)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def events():
+    organizer = Organizer.objects.create(name="Swim Club", website="https://x")
+    zurich = Location.objects.create(city="Zurich", country="CH")
+    nice = Location.objects.create(city="Nice", country="FR")
+    created = []
+    for location, day, races, invisible in [
+        (zurich, TODAY, 2, False),
+        (zurich, date(2030, 7, 10), 1, False),
+        (nice, date(2030, 7, 20), 3, False),
+        (nice, TODAY - timedelta(days=1), 1, False),
+        (nice, date(2030, 7, 21), 1, True),
+    ]:
+        event = Event.objects.create(
+            name=f"Swim {location.city} {day}",
+            website="https://x",
+            location=location,
+            organizer=organizer,
+            date_start=day,
+            date_end=day,
+            invisible=invisible,
+        )
+        for distance in range(races):
+            Race.objects.create(event=event, date=day, distance=distance + 1)
+        created.append(event)
+    return created
+
+
+class TestCompute:
+    def test_totals_and_breakdowns(self, events):
+        snapshot = statistics_service.compute(TODAY)
+
+        assert snapshot["event_count"] == 3
+        assert snapshot["race_count"] == 6
+        assert snapshot["countries_count"] == 2
+        assert snapshot["countries"] == [
+            {"country": "CH", "event_count": 2, "race_count": 3},
+            {"country": "FR", "event_count": 1, "race_count": 3},
+        ]
+        assert [
+            (row["month"].month, row["event_count"], row["race_count"])
+            for row in snapshot["months"]
+        ] == [(6, 1, 2), (7, 2, 4)]
+
+
+class TestGetSnapshot:
+    @pytest.fixture(autouse=True)
+    def today(self, monkeypatch):
+        monkeypatch.setattr(timezone, "localdate", lambda: TODAY)
+
+    def test_cached(self, events):
+        snapshot = statistics_service.get_snapshot()
+
+        with CaptureQueriesContext(connection) as queries:
+            assert statistics_service.get_snapshot() == snapshot
+        assert len(queries) == 0
+
+    def test_rebuilt_after_change(self, events):
+        assert statistics_service.get_snapshot()["race_count"] == 6
+
+        Race.objects.create(event=events[0], date=TODAY, distance=10)
+
+        assert statistics_service.get_snapshot()["race_count"] == 7
+
+    def test_new_day(self, events, monkeypatch):
+        assert statistics_service.get_snapshot()["event_count"] == 3
+
+        monkeypatch.setattr(timezone, "localdate", lambda: TODAY + timedelta(days=1))
+
+        assert statistics_service.get_snapshot()["event_count"] == 2
@@ -1,20 +1,164 @@
-from django.core.cache import cache
-from django.db.models.signals import pre_save, post_save, post_delete
+from django.db.models.signals import post_init, pre_save, post_save, post_delete
 
-from app.models import Review, Event
+from app.graphql import cache as graphql_cache
+from app.models import Review, Event, Race, Location, Organizer
+from app.services import EventChecker, organizer_matcher, sitemap_service
+
+
+def _review_location_id(review: Review):
+    if Review.event.is_cached(review):
+        return review.event.location_id
+    return (
+        Event.objects.filter(pk=review.event_id)
+        .values_list("location_id", flat=True)
+        .first()
+    )
+
+
+def _adjust_location_rating(location_id, rating, sign: int):
+    if location_id is None or rating is None:
+        return False
+    Location.adjust_rating_aggregates(location_id, sign, sign * rating)
+    return True
+
+
+def remember_review_rating(sender, instance: Review, **kwargs):
+    """Store the location and rating of a review before it is changed"""
+    instance._rating_before = None
+    if instance.pk:
+        instance._rating_before = (
+            Review.objects.filter(pk=instance.pk)
+            .values_list("event__location_id", "rating")
+            .first()
+        )
 
 
 def update_location_rating(sender, instance: Review, **kwargs):
-    """ Update location rating whenever a review is saved """
-    instance.event.location.update_average_rating()
+    """Update the rating totals of the location whenever a review is saved"""
+    before = getattr(instance, "_rating_before", None)
+    after = (_review_location_id(instance), instance.rating)
+    if before == after:
+        return
+    changed = False
+    if before:
+        changed |= _adjust_location_rating(*before, sign=-1)
+    changed |= _adjust_location_rating(*after, sign=1)
+    if changed:
+        # QuerySet.update() sends no post_save signal for the location
+        graphql_cache.invalidate(graphql_cache.LOCATIONS)
+
+
+def remove_location_rating(sender, instance: Review, **kwargs):
+    """Update the rating totals of the location whenever a review is deleted"""
+    if _adjust_location_rating(_review_location_id(instance), instance.rating, -1):
+        graphql_cache.invalidate(graphql_cache.LOCATIONS)
+
+
+def remember_event_location(sender, instance: Event, **kwargs):
+    # Reading a column left out by only() would cost a query per instance
+    if "location_id" not in instance.get_deferred_fields():
+        instance._loaded_location_id = instance.location_id
+
+
+def move_event_ratings(sender, instance: Event, created=False, **kwargs):
+    """Recompute the ratings of both locations when a rated event moves"""
+    before = getattr(instance, "_loaded_location_id", None)
+    instance._loaded_location_id = instance.location_id
+    if created or before == instance.location_id:
+        return
+    if instance.reviews.filter(rating__isnull=False).exists():
+        Location.recompute_rating_aggregates(
+            Location.objects.filter(pk__in=[before, instance.location_id])
+        )
+        graphql_cache.invalidate(graphql_cache.LOCATIONS)
+
+
+def _store_quality_score(event: Event):
+    score = EventChecker(event).get_rating()
+    if event.quality_score != score:
+        event.quality_score = score
+        # update() instead of save() so no further signals are sent
+        Event.objects.filter(pk=event.pk).update(quality_score=score)
+
+
+def update_event_quality_score(sender, instance: Event, raw=False, **kwargs):
+    """Refresh the stored entry quality score of a saved event"""
+    if not raw:
+        _store_quality_score(instance)
+
+
+def update_race_event_quality_score(sender, instance: Race, raw=False, **kwargs):
+    """Refresh the score of the event whose race was saved or deleted"""
+    if raw:
+        return
+    event = (
+        Event.objects.select_related("location").filter(pk=instance.event_id).first()
+    )
+    if event:
+        _store_quality_score(event)
+
+
+def update_location_events_quality_score(
+    sender, instance: Location, raw=False, **kwargs
+):
+    """Refresh the scores of all events at a saved location"""
+    if not raw:
+        EventChecker.update_scores(Event.objects.filter(location=instance))
+
+
+def update_organizer_matcher(sender, instance: Organizer, raw=False, **kwargs):
+    """Keep the in-memory organizer name index in sync with renamed organizers"""
+    if not raw and organizer_matcher.organizer_matcher_loaded():
+        organizer_matcher.get_organizer_matcher().add(instance)
+
+
+def remove_from_organizer_matcher(sender, instance: Organizer, **kwargs):
+    if organizer_matcher.organizer_matcher_loaded():
+        organizer_matcher.get_organizer_matcher().remove(instance.pk)
 
 
 def clear_graphql_cache(sender, instance, **kwargs):
-    """Clear GraphQL cache when Event is modified"""
-    cache.clear()
+    """Invalidate cached GraphQL results depending on the modified model"""
+    graphql_cache.invalidate(*INVALIDATED_FAMILIES[sender])
+
+
+def mark_sitemap_stale(sender, instance, **kwargs):
+    """Have the affected child sitemap rebuilt on its next request"""
+    for section in SITEMAP_SECTIONS[sender]:
+        sitemap_service.mark_stale(section)
+
+
+# Child sitemaps listing the modified model
+SITEMAP_SECTIONS = {
+    Event: (sitemap_service.EVENTS, sitemap_service.ORGANIZERS),
+    Organizer: (sitemap_service.ORGANIZERS,),
+}
+
+
+# Entity families whose cached GraphQL results are stale after a change
+INVALIDATED_FAMILIES = {
+    Event: (graphql_cache.EVENTS,),
+    Race: (graphql_cache.EVENTS,),
+    Location: (graphql_cache.LOCATIONS,),
+    Organizer: (graphql_cache.ORGANIZERS,),
+}
 
+pre_save.connect(remember_review_rating, sender=Review)
+post_save.connect(update_location_rating, sender=Review)
+post_delete.connect(remove_location_rating, sender=Review)
+post_init.connect(remember_event_location, sender=Event)
+post_save.connect(update_event_quality_score, sender=Event)
+post_save.connect(update_race_event_quality_score, sender=Race)
+post_delete.connect(update_race_event_quality_score, sender=Race)
+post_save.connect(update_location_events_quality_score, sender=Location)
+post_save.connect(move_event_ratings, sender=Event)
+post_save.connect(update_organizer_matcher, sender=Organizer)
+post_delete.connect(remove_from_organizer_matcher, sender=Organizer)
 
-pre_save.connect(update_location_rating, sender=Review)
+for model in INVALIDATED_FAMILIES:
+    post_save.connect(clear_graphql_cache, sender=model)
+    post_delete.connect(clear_graphql_cache, sender=model)
 
-post_save.connect(clear_graphql_cache, sender=Event)
-post_delete.connect(clear_graphql_cache, sender=Event)
+for model in SITEMAP_SECTIONS:
+    post_save.connect(mark_sitemap_stale, sender=model)
+    post_delete.connect(mark_sitemap_stale, sender=model)
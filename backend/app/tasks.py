@@ -167,3 +167,18 @@ def verify_locations_async(location_ids=None, limit=None, dry_run=False):
         error_msg = f"Error verifying locations: {str(e)}"
         logger.error(error_msg)
         return error_msg
+
+
+def regenerate_sitemaps():
+    """
+    Re-render stale sitemap files ahead of crawler requests.
+    Scheduled daily through Django Q (see migration 0059_sitemap_schedule).
+
+    Returns:
+        str: Result message
+    """
+    from .services import sitemap_service
+
+    result = sitemap_service.regenerate_all()
+    logger.info(result)
+    return result
@@ -0,0 +1,207 @@
+"""
+Country, currency and language lookups shared by the crawler and commands.
+
+Country names coming out of the LLM extraction repeat constantly ("Germany",
+"Deutschland", "UK", ...). Instead of asking pycountry for every event, all
+known spellings are normalised into one name -> ISO code table when the
+module is imported: English, official and common names, ISO codes, the
+translated names in the languages we search in, and a few aliases pycountry
+does not know. Only unknown names fall back to pycountry's fuzzy search,
+whose results are memoised.
+"""
+import csv
+import gettext
+import logging
+import os
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+import pycountry
+
+logger = logging.getLogger(__name__)
+
+# Names pycountry does not resolve (or resolves to the wrong country)
+COUNTRY_ALIASES = {
+    "England": "GB",  # Part of the United Kingdom
+    "Scotland": "GB",  # Part of the United Kingdom
+    "Wales": "GB",  # Part of the United Kingdom
+    "Northern Ireland": "GB",
+    "Great Britain": "GB",
+    "UK": "GB",
+    "U.K.": "GB",
+    "USA": "US",
+    "U.S.A.": "US",
+    "U.S.": "US",
+    "United States": "US",
+    "America": "US",
+    "Czech Republic": "CZ",
+    "Holland": "NL",
+    "Turkey": "TR",
+    "Russia": "RU",
+    "South Korea": "KR",
+    "Korea": "KR",
+    "Vietnam": "VN",
+    "Taiwan": "TW",
+}
+
+# Countries searched by discover_event_urls and the languages to search in
+SEARCH_COUNTRIES = [
+    {"country": "Switzerland", "code": "CH", "languages": ["de", "fr", "it"]},
+    {"country": "Germany", "code": "DE", "languages": ["de"]},
+    {"country": "France", "code": "FR", "languages": ["fr"]},
+    {"country": "Italy", "code": "IT", "languages": ["it"]},
+    {"country": "Spain", "code": "ES", "languages": ["es"]},
+    {"country": "United Kingdom", "code": "GB", "languages": ["en"]},
+    {"country": "Austria", "code": "AT", "languages": ["de"]},
+    {"country": "Netherlands", "code": "NL", "languages": ["nl"]},
+    {"country": "Belgium", "code": "BE", "languages": ["nl", "fr"]},
+    {"country": "Portugal", "code": "PT", "languages": ["pt"]},
+    {"country": "Greece", "code": "GR", "languages": ["el"]},
+    {"country": "Croatia", "code": "HR", "languages": ["hr"]},
+    {"country": "Sweden", "code": "SE", "languages": ["sv"]},
+    {"country": "Denmark", "code": "DK", "languages": ["da"]},
+    {"country": "Norway", "code": "NO", "languages": ["no"]},
+    {"country": "Finland", "code": "FI", "languages": ["fi"]},
+    {"country": "Ireland", "code": "IE", "languages": ["en"]},
+    {"country": "Poland", "code": "PL", "languages": ["pl"]},
+    {"country": "Czech Republic", "code": "CZ", "languages": ["cs"]},
+    {"country": "Hungary", "code": "HU", "languages": ["hu"]},
+    {"country": "Slovenia", "code": "SI", "languages": ["sl"]},
+    {"country": "Malta", "code": "MT", "languages": ["mt", "en"]},
+    {"country": "Cyprus", "code": "CY", "languages": ["el", "tr"]},
+    {"country": "Morocco", "code": "MA", "languages": ["ar", "fr"]},
+    {"country": "Tunisia", "code": "TN", "languages": ["ar", "fr"]},
+    {"country": "Egypt", "code": "EG", "languages": ["ar", "en"]},
+    {"country": "United States", "code": "US", "languages": ["en"]},
+]
+
+# Languages whose country names are added to the lookup table: the languages
+# we search in plus the languages of the frontend. pycountry's catalogs use
+# "nb" for Norwegian.
+FRONTEND_LANGUAGES = ["de", "fr", "it", "es", "ru", "ja"]
+NAME_LANGUAGES = sorted(
+    (
+        {
+            "nb" if language == "no" else language
+            for country in SEARCH_COUNTRIES
+            for language in country["languages"]
+        }
+        | set(FRONTEND_LANGUAGES)
+    )
+    - {"en"}
+)
+
+CURRENCY_MAPPING_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    "data",
+    "country-code-to-currency-code-mapping.csv",
+)
+
+
+def normalize_name(name: str) -> str:
+    """Casefold, strip accents and punctuation ("Côte d'Ivoire" -> "cote d ivoire")"""
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    return re.sub(r"[\W_]+", " ", name.casefold()).strip()
+
+
+def _country_names(country) -> Iterable[str]:
+    for attr in ("name", "official_name", "common_name"):
+        value = getattr(country, attr, None)
+        if value:
+            yield value
+
+
+def _build_name_table() -> Dict[str, str]:
+    table = {}
+    for country in pycountry.countries:
+        for name in (*_country_names(country), country.alpha_2, country.alpha_3):
+            table.setdefault(normalize_name(name), country.alpha_2)
+
+    for name, code in COUNTRY_ALIASES.items():
+        table[normalize_name(name)] = code
+
+    # Translated names never override an English name or alias
+    for language in NAME_LANGUAGES:
+        try:
+            translation = gettext.translation(
+                "iso3166-1", pycountry.LOCALES_DIR, languages=[language]
+            )
+        except OSError:
+            logger.warning(f"No country name translations for language {language}")
+            continue
+        for country in pycountry.countries:
+            for name in _country_names(country):
+                table.setdefault(
+                    normalize_name(translation.gettext(name)), country.alpha_2
+                )
+
+    table.pop("", None)
+    return table
+
+
+_NAME_TABLE = _build_name_table()
+_ALPHA_2_CODES = frozenset(country.alpha_2 for country in pycountry.countries)
+
+
+@lru_cache(maxsize=1024)
+def _fuzzy_country_code(name: str) -> Optional[str]:
+    try:
+        countries = pycountry.countries.search_fuzzy(name)
+    except LookupError:
+        return None
+    return countries[0].alpha_2 if countries else None
+
+
+def resolve_country_code(name: Optional[str]) -> Optional[str]:
+    """
+    Return the ISO 3166 alpha-2 code of a country given by code or by name
+    (in English or one of NAME_LANGUAGES), or None if it cannot be resolved.
+    """
+    if not name or not isinstance(name, str):
+        return None
+    name = name.strip()
+    if len(name) == 2 and name.isupper() and name in _ALPHA_2_CODES:
+        return name
+
+    code = _NAME_TABLE.get(normalize_name(name))
+    if code:
+        return code
+    return _fuzzy_country_code(name)
+
+
+@lru_cache(maxsize=None)
+def _currency_table() -> Dict[str, str]:
+    table = {}
+    try:
+        with open(CURRENCY_MAPPING_PATH, "r") as f:
+            for row in csv.DictReader(f):
+                country_code = row.get("CountryCode")
+                currency_code = row.get("Code")
+                if country_code and currency_code:
+                    table[country_code] = currency_code
+    except OSError as e:
+        logger.error(f"Error reading currency mapping file: {e}")
+    return table
+
+
+def country_currencies() -> Dict[str, str]:
+    """Mapping of country code to ISO 4217 currency code"""
+    return _currency_table()
+
+
+def get_currency(country_code: str) -> Optional[str]:
+    """Currency code of a country, e.g. "CH" -> "CHF" """
+    return _currency_table().get(country_code)
+
+
+def get_search_countries(
+    country_codes: Optional[Iterable[str]] = None,
+) -> List[Dict[str, Any]]:
+    """SEARCH_COUNTRIES entries, optionally restricted to the given codes"""
+    if country_codes:
+        codes = {resolve_country_code(code) or code for code in country_codes}
+        return [c for c in SEARCH_COUNTRIES if c["code"] in codes]
+    return SEARCH_COUNTRIES
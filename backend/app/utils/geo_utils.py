@@ -0,0 +1,185 @@
+"""
+Geographic helpers shared by the location/event de-duplication commands and
+the radius searches (MCP tools, crawler location dedup).
+
+The grid index buckets points into cells of roughly ``cell_km`` so that
+neighbour searches only compare points in adjacent cells, and all distances
+are computed with NumPy instead of one Python haversine call per pair.
+
+Radius queries against the database first restrict lat/lng to a bounding box
+(served by the composite (lat, lng) index on Location) and then compute exact
+distances for the remaining rows in one vectorised call.
+"""
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+from django.db.models import Q
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km_array(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """
+    Vectorised Haversine distance in km. Arguments are array-likes in degrees
+    and follow NumPy broadcasting rules.
+    """
+    lat1, lng1, lat2, lng2 = (
+        np.radians(np.asarray(v, dtype=float)) for v in (lat1, lng1, lat2, lng2)
+    )
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class GridIndex:
+    """
+    Uniform lat/lng grid over a fixed set of points.
+
+    Cells are ``cell_km`` tall. Because meridians converge, a radius of
+    ``cell_km`` spans more longitude cells towards the poles; the neighbour
+    search widens the column range per row accordingly and wraps around the
+    antimeridian.
+    """
+
+    def __init__(self, lats: Sequence[float], lngs: Sequence[float], cell_km: float):
+        self.lats = np.asarray(lats, dtype=float)
+        self.lngs = np.asarray(lngs, dtype=float)
+        self.cell_deg = max(cell_km / KM_PER_DEGREE_LAT, 1e-6)
+        self.n_cols = max(int(math.ceil(360 / self.cell_deg)), 1)
+
+        rows = np.floor((self.lats + 90) / self.cell_deg).astype(int)
+        cols = np.floor((self.lngs + 180) / self.cell_deg).astype(int) % self.n_cols
+        self.cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for i, cell in enumerate(zip(rows.tolist(), cols.tolist())):
+            self.cells[cell].append(i)
+
+    def _column_span(self, row: int) -> int:
+        """Number of columns on each side to scan for rows around ``row``."""
+        # Use the most poleward latitude of the three scanned rows
+        edge_lat = max(
+            abs((row - 1) * self.cell_deg - 90), abs((row + 2) * self.cell_deg - 90)
+        )
+        cos_lat = math.cos(math.radians(min(edge_lat, 90)))
+        if cos_lat < 1e-9:
+            return self.n_cols
+        # One extra column absorbs the curvature error of the flat estimate
+        return int(math.ceil(1 / cos_lat)) + 1
+
+    def _candidate_indices(self, row: int, col: int) -> np.ndarray:
+        span = self._column_span(row)
+        if 2 * span + 1 >= self.n_cols:
+            cols = range(self.n_cols)
+        else:
+            cols = [(col + dc) % self.n_cols for dc in range(-span, span + 1)]
+        candidates = []
+        for r in (row - 1, row, row + 1):
+            for c in cols:
+                candidates.extend(self.cells.get((r, c), ()))
+        return np.asarray(sorted(candidates), dtype=int)
+
+    def neighbours_within(self, max_km: float) -> List[List[Tuple[int, float]]]:
+        """
+        For every point, return ``(index, distance_km)`` of all other points
+        within ``max_km``, ordered by index. ``max_km`` must not exceed the
+        cell size the index was built with.
+        """
+        neighbours: List[List[Tuple[int, float]]] = [[] for _ in range(len(self.lats))]
+        for (row, col), members in self.cells.items():
+            candidates = self._candidate_indices(row, col)
+            members = np.asarray(members, dtype=int)
+            # |members| x |candidates| distance matrix for the whole cell
+            distances = haversine_km_array(
+                self.lats[members][:, None],
+                self.lngs[members][:, None],
+                self.lats[candidates][None, :],
+                self.lngs[candidates][None, :],
+            )
+            for m, i in enumerate(members.tolist()):
+                hits = np.nonzero(distances[m] <= max_km)[0]
+                neighbours[i] = [
+                    (j, float(distances[m, h]))
+                    for h, j in zip(hits.tolist(), candidates[hits].tolist())
+                    if j != i
+                ]
+        return neighbours
+
+
+def bounding_box(
+    lat: float, lng: float, radius_km: float
+) -> Tuple[float, float, List[Tuple[float, float]]]:
+    """
+    Smallest lat/lng box containing every point within ``radius_km``.
+
+    Returns ``(min_lat, max_lat, lng_ranges)``. The longitude half-width is
+    scaled by the cosine of the most poleward latitude in the box; a box that
+    reaches a pole spans all longitudes, and one crossing the antimeridian is
+    split into two longitude ranges.
+    """
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    min_lat, max_lat = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+
+    cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if max_lat >= 90.0 or min_lat <= -90.0 or cos_lat < 1e-9:
+        return min_lat, max_lat, [(-180.0, 180.0)]
+    dlng = dlat / cos_lat
+    if dlng >= 180.0:
+        return min_lat, max_lat, [(-180.0, 180.0)]
+
+    west, east = lng - dlng, lng + dlng
+    if west < -180.0:
+        return min_lat, max_lat, [(west + 360.0, 180.0), (-180.0, east)]
+    if east > 180.0:
+        return min_lat, max_lat, [(west, 180.0), (-180.0, east - 360.0)]
+    return min_lat, max_lat, [(west, east)]
+
+
+def bounding_box_q(
+    lat: float,
+    lng: float,
+    radius_km: float,
+    lat_field: str = "lat",
+    lng_field: str = "lng",
+) -> Q:
+    """Filter for the rows inside bounding_box()"""
+    min_lat, max_lat, lng_ranges = bounding_box(lat, lng, radius_km)
+    lng_q = Q()
+    for west, east in lng_ranges:
+        lng_q |= Q(**{f"{lng_field}__gte": west, f"{lng_field}__lte": east})
+    return Q(**{f"{lat_field}__gte": min_lat, f"{lat_field}__lte": max_lat}) & lng_q
+
+
+def within_radius(
+    items: Iterable, lat: float, lng: float, radius_km: float
+) -> List[Tuple[float, object]]:
+    """
+    ``(distance_km, item)`` of the items with ``lat``/``lng`` attributes
+    within ``radius_km`` of the point, closest first.
+    """
+    items = [item for item in items if item.lat is not None and item.lng is not None]
+    if not items:
+        return []
+    distances = haversine_km_array(
+        lat, lng, [item.lat for item in items], [item.lng for item in items]
+    )
+    order = np.argsort(distances, kind="stable")
+    return [
+        (float(distances[i]), items[i])
+        for i in order.tolist()
+        if distances[i] <= radius_km
+    ]
+
+
+def nearby(
+    queryset, lat: float, lng: float, radius_km: float
+) -> List[Tuple[float, object]]:
+    """
+    Radius query over a queryset of objects with ``lat``/``lng`` fields:
+    bounding box in the database, exact distances in NumPy.
+    """
+    candidates = queryset.filter(bounding_box_q(lat, lng, radius_km))
+    return within_radius(candidates, lat, lng, radius_km)
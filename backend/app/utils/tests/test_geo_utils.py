@@ -0,0 +1,72 @@
+"""
+Tests for the geographic helpers behind the radius searches and de-duplication.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils.geo_utils import (
+    GridIndex,
+    bounding_box,
+    haversine_km_array,
+    within_radius,
+)
+
+
+class TestHaversineKmArray:
+    def test_broadcasts(self):
+        distances = haversine_km_array(
+            47.3769, 8.5417, [47.3769, 46.9480], [8.5417, 7.4474]
+        )
+        assert distances[0] == 0.0
+        assert 90 < distances[1] < 100
+
+
+class TestGridIndex:
+    def test_neighbours_within(self):
+        # Zürich, Zürich Enge, Bern
+        index = GridIndex([47.3769, 47.3650, 46.9480], [8.5417, 8.5300, 7.4474], 5.0)
+        neighbours = index.neighbours_within(5.0)
+        assert [j for j, _ in neighbours[0]] == [1]
+        assert [j for j, _ in neighbours[1]] == [0]
+        assert neighbours[2] == []
+        assert neighbours[0][0][1] == pytest.approx(neighbours[1][0][1])
+
+    def test_wraps_at_antimeridian(self):
+        index = GridIndex([-17.7, -17.7], [179.99, -179.99], 5.0)
+        assert [j for j, _ in index.neighbours_within(5.0)[0]] == [1]
+
+
+class TestBoundingBox:
+    """Tests for the radius search bounding box."""
+
+    def test_longitude_widens_with_latitude(self):
+        _, _, [(west_eq, east_eq)] = bounding_box(0.0, 10.0, 100.0)
+        _, _, [(west_north, east_north)] = bounding_box(70.0, 10.0, 100.0)
+        assert east_north - west_north > 2.5 * (east_eq - west_eq)
+
+    def test_contains_point_at_radius(self):
+        # Bern is ~95 km from Zürich
+        min_lat, max_lat, lng_ranges = bounding_box(47.3769, 8.5417, 100.0)
+        assert min_lat <= 46.9480 <= max_lat
+        assert any(west <= 7.4474 <= east for west, east in lng_ranges)
+
+    def test_antimeridian_is_split(self):
+        _, _, lng_ranges = bounding_box(-17.7, 179.9, 50.0)
+        assert len(lng_ranges) == 2
+        assert any(west <= -179.9 <= east for west, east in lng_ranges)
+
+    def test_pole_spans_all_longitudes(self):
+        _, max_lat, lng_ranges = bounding_box(89.9, 0.0, 50.0)
+        assert max_lat == 90.0
+        assert lng_ranges == [(-180.0, 180.0)]
+
+    def test_within_radius_sorted_and_filtered(self):
+        items = [
+            SimpleNamespace(city="Bern", lat=46.9480, lng=7.4474),
+            SimpleNamespace(city="Zürich", lat=47.3540, lng=8.5510),
+            SimpleNamespace(city="Nowhere", lat=None, lng=None),
+        ]
+        result = within_radius(items, 47.3769, 8.5417, 50.0)
+        assert [loc.city for _, loc in result] == ["Zürich"]
+        assert result[0][0] < 5.0
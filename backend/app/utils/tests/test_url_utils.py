@@ -0,0 +1,99 @@
+"""
+Tests for the URL index used to skip URLs of events already in the database.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from app.models import Event, Location, Organizer
+from app.utils.url_utils import URLIndex, URLUtils
+
+FUTURE = date.today() + timedelta(days=30)
+PAST = date.today() - timedelta(days=30)
+
+
+class TestURLIndex:
+    index = URLIndex(["swim.example.com/2026", "lake.example.org"])
+
+    def test_exact_match(self):
+        assert self.index.find_related("lake.example.org") == "lake.example.org"
+
+    def test_indexed_url_is_a_prefix(self):
+        assert (
+            self.index.find_related("lake.example.org/results")
+            == "lake.example.org"
+        )
+
+    def test_indexed_url_extends_the_query(self):
+        assert self.index.find_related("swim.example.com") == "swim.example.com/2026"
+
+    def test_unrelated(self):
+        assert self.index.find_related("river.example.net") is None
+        assert self.index.find_related("") is None
+
+
+@pytest.fixture
+def event(db):
+    location = Location.objects.create(city="Zurich", country="CH")
+    organizer = Organizer.objects.create(name="Swim Club", website="https://x")
+    return Event.objects.create(
+        name="Lake Swim",
+        website="https://www.lake.example.org/",
+        location=location,
+        organizer=organizer,
+        date_start=FUTURE,
+        date_end=FUTURE,
+    )
+
+
+def _remaining(urls):
+    return [
+        url_data["url"]
+        for url_data in URLUtils.filter_existing_urls([{"url": url} for url in urls])
+    ]
+
+
+class TestFilterExistingUrls:
+    def test_skips_urls_of_future_events(self, event):
+        assert _remaining(
+            ["http://lake.example.org/register", "https://river.example.net"]
+        ) == ["https://river.example.net"]
+
+    def test_skips_blocked_domains(self, event):
+        assert _remaining(["https://www.facebook.com/events/1"]) == []
+
+    def test_keeps_urls_of_past_events(self, event):
+        event.date_start = event.date_end = PAST
+        event.save()
+        assert _remaining(["https://lake.example.org"]) == ["https://lake.example.org"]
+
+    def test_url_sets(self, event):
+        url_sets = [
+            ["https://river.example.net", "https://lake.example.org/info"],
+            ["https://river.example.net"],
+        ]
+        assert URLUtils.filter_existing_url_sets(url_sets) == [
+            ["https://river.example.net"]
+        ]
+
+
+class TestFutureEventIndexCache:
+    def test_reused_while_events_are_unchanged(self, event):
+        first = URLUtils._future_event_index()
+        assert URLUtils._future_event_index() is first
+
+    def test_rebuilt_when_a_website_changes(self, event):
+        _remaining(["https://lake.example.org"])
+        event.website = "https://river.example.net"
+        event.save()
+        assert _remaining(["https://lake.example.org"]) == ["https://lake.example.org"]
+        assert _remaining(["https://river.example.net"]) == []
+
+    def test_rebuilt_when_an_event_is_replaced(self, event):
+        _remaining(["https://lake.example.org"])
+        replacement = Event.objects.get(pk=event.pk)
+        event.delete()
+        replacement.pk = None
+        replacement.website = "https://river.example.net"
+        replacement.save()
+        assert _remaining(["https://lake.example.org"]) == ["https://lake.example.org"]
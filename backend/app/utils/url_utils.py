@@ -1,7 +1,9 @@
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
+from bisect import bisect_left
 from datetime import date
 from urllib.parse import urlparse
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +56,44 @@ BLOCKED_DOMAINS = {
 }
 
 
+class URLIndex:
+    """
+    Index of normalized URLs answering "is an indexed URL a prefix or an
+    extension of this URL" without scanning every entry.
+
+    Indexed URLs that are a prefix of the query are found by looking up each
+    prefix of the query in a set; indexed URLs that extend the query are found
+    by binary search in the sorted list of entries.
+    """
+
+    def __init__(self, normalized_urls: Iterable[str]):
+        self._urls: Set[str] = {url for url in normalized_urls if url}
+        self._sorted: List[str] = sorted(self._urls)
+        self._lengths: List[int] = sorted({len(url) for url in self._urls})
+
+    def __len__(self):
+        return len(self._urls)
+
+    def find_related(self, normalized_url: str) -> Optional[str]:
+        """Return an indexed URL that is a prefix or extension of the given one."""
+        if not normalized_url:
+            return None
+
+        # Indexed URL is a prefix of (or equal to) the query
+        for length in self._lengths:
+            if length > len(normalized_url):
+                break
+            prefix = normalized_url[:length]
+            if prefix in self._urls:
+                return prefix
+
+        # Indexed URL extends the query
+        i = bisect_left(self._sorted, normalized_url)
+        if i < len(self._sorted) and self._sorted[i].startswith(normalized_url):
+            return self._sorted[i]
+        return None
+
+
 class URLUtils:
     """
     Utility class for URL operations like normalization and checking for existing URLs.
@@ -92,40 +132,65 @@ class URLUtils:
 
         return url.lower()
 
+    # Index of future visible event websites, reused between calls as long as
+    # the events it was built from have not changed (see _future_event_index)
+    _index_lock = threading.Lock()
+    _index_cache: Tuple[Any, Optional[URLIndex]] = (None, None)
+
     @classmethod
-    def filter_existing_urls(
-        cls, urls: List[Dict[str, Any]], stdout=None, stderr=None
-    ) -> List[Dict[str, Any]]:
+    def _future_event_index(cls, stdout=None) -> URLIndex:
         """
-        Filter out URLs that already have a future event in the database.
-        URLs with only past events are NOT filtered (they may have a new edition).
+        Return the URL index of future visible events.
+
+        Commands call the filters once per crawled page, thousands of times per
+        run, so the index is kept between calls. A cheap aggregate query
+        detects events created, deleted or edited in the meantime (e.g. by the
+        crawl itself) and triggers a rebuild; Event.save() always sets
+        edited_at, so changed websites, dates or visibility are noticed too.
         """
+        from django.db.models import Count, Max
         from app.models import Event
 
-        new_urls = []
-        today = date.today()
+        # Fetch only future visible events
+        # (we want to allow re-crawling past events and hidden/copied events)
+        future_events = Event.objects.filter(
+            date_start__gte=date.today(), invisible=False
+        ).exclude(website="")
+        aggregates = future_events.aggregate(
+            count=Count("id"), last_id=Max("id"), last_edit=Max("edited_at")
+        )
+        fingerprint = (date.today(), tuple(aggregates.values()))
+
+        with cls._index_lock:
+            cached_fingerprint, index = cls._index_cache
+            if index is not None and cached_fingerprint == fingerprint:
+                return index
 
-        try:
-            # Fetch only future visible events
-            # (we want to allow re-crawling past events and hidden/copied events)
             if stdout:
                 stdout.write("Fetching future visible events from database...")
-            future_events = list(
-                Event.objects.filter(date_start__gte=today, invisible=False)
+            index = URLIndex(
+                cls.normalize_url(website)
+                for website in future_events.values_list("website", flat=True)
             )
-            if stdout:
-                stdout.write(f"Found {len(future_events)} future visible events in database")
-
-            # Create a set of normalized website URLs for future events only
-            existing_urls = set()
-            for event in future_events:
-                if event.website:
-                    existing_urls.add(cls.normalize_url(event.website))
-
             if stdout:
                 stdout.write(
-                    f"Found {len(existing_urls)} unique website URLs with future visible events"
+                    f"Found {len(index)} unique website URLs with future visible events"
                 )
+            cls._index_cache = (fingerprint, index)
+            return index
+
+    @classmethod
+    def filter_existing_urls(
+        cls, urls: List[Dict[str, Any]], stdout=None, stderr=None
+    ) -> List[Dict[str, Any]]:
+        """
+        Filter out URLs that already have a future event in the database.
+        URLs with only past events are NOT filtered (they may have a new edition).
+        """
+        new_urls = []
+
+        try:
+            existing_urls = cls._future_event_index(stdout)
 
             # Filter URLs
             for url_data in urls:
@@ -139,13 +204,7 @@ class URLUtils:
                 normalized_url = cls.normalize_url(url)
 
                 # Check if this URL has a future event in the database
-                has_future_event = False
-                for existing_url in existing_urls:
-                    if existing_url in normalized_url or normalized_url in existing_url:
-                        has_future_event = True
-                        break
-
-                if not has_future_event:
+                if not existing_urls.find_related(normalized_url):
                     new_urls.append(url_data)
 
         except Exception as e:
@@ -174,32 +233,10 @@ class URLUtils:
         Filter out URL sets that already have a future event in the database.
         URLs with only past events are NOT filtered (they may have a new edition).
         """
-        from app.models import Event
-
         new_url_sets = []
-        today = date.today()
 
         try:
-            # Fetch only future visible events
-            # (we want to allow re-crawling past events and hidden/copied events)
-            if stdout:
-                stdout.write("Fetching future visible events from database...")
-            future_events = list(
-                Event.objects.filter(date_start__gte=today, invisible=False)
-            )
-            if stdout:
-                stdout.write(f"Found {len(future_events)} future visible events in database")
-
-            # Create a set of normalized website URLs for future events only
-            existing_urls = set()
-            for event in future_events:
-                if event.website:
-                    existing_urls.add(cls.normalize_url(event.website))
-
-            if stdout:
-                stdout.write(
-                    f"Found {len(existing_urls)} unique website URLs with future visible events"
-                )
+            existing_urls = cls._future_event_index(stdout)
 
             # Filter URL sets
             for urls in url_sets:
@@ -214,17 +251,10 @@ class URLUtils:
                 # Check if any URL in this set has a future event in the database
                 has_future_event = False
                 for url in urls:
-                    normalized_url = cls.normalize_url(url)
-                    for existing_url in existing_urls:
-                        if (
-                            existing_url in normalized_url
-                            or normalized_url in existing_url
-                        ):
-                            has_future_event = True
-                            if stdout:
-                                stdout.write(f"Skipping URL (future event exists): {url}")
-                            break
-                    if has_future_event:
+                    if existing_urls.find_related(cls.normalize_url(url)):
+                        has_future_event = True
+                        if stdout:
+                            stdout.write(f"Skipping URL (future event exists): {url}")
                         break
 
                 if not has_future_event:
@@ -1,18 +1,26 @@
-from datetime import datetime
-from urllib.parse import urljoin
+import gzip
 
 from django.contrib.auth import login
 from django.contrib.auth.models import User
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.utils import timezone
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.dateparse import parse_date
+from django.utils.http import http_date
 from django.utils.translation import gettext as _
 from django.views.decorators.clickjacking import xframe_options_exempt
-from django_sitemaps import Sitemap
+from django.views.decorators.http import require_GET
 
-from app import models
 from app.models import ClaimToken
-from owswims import settings
+from app.services import map_markers, sitemap_service
+
+# Browsers and CDNs may reuse a marker payload this long without revalidating
+MAP_MARKERS_MAX_AGE = 300
 
 
 @xframe_options_exempt
@@ -20,70 +28,104 @@ def index(request):
     return render(request, template_name="index.html")
 
 
-def sitemap(request):
-    sitemap = Sitemap(
-        build_absolute_uri=request.build_absolute_uri,
+def _gzip_response(request, content, content_type):
+    """Serve gzip-compressed content, decompressed for clients without gzip"""
+    if "gzip" in request.META.get("HTTP_ACCEPT_ENCODING", ""):
+        response = HttpResponse(content, content_type=content_type)
+        response["Content-Encoding"] = "gzip"
+    else:
+        response = HttpResponse(gzip.decompress(content), content_type=content_type)
+    patch_vary_headers(response, ["Accept-Encoding"])
+    return response
+
+
+def _serve_sitemap_file(request, sitemap_file, content_type, gzip_encoded=False):
+    """Serve a pre-rendered sitemap file with ETag/Last-Modified validation"""
+    rendered_at = sitemap_file.rendered_at.timestamp()
+    etag = f'"{int(rendered_at * 1e6):x}"'
+    last_modified = int(rendered_at)
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
     )
+    if not_modified is not None:
+        return not_modified
+
+    content = sitemap_service.read(sitemap_file)
+    if gzip_encoded:
+        response = _gzip_response(request, content, content_type)
+    else:
+        response = HttpResponse(content, content_type=content_type)
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["X-Robot-Tag"] = "noindex, noodp, noarchive"
+    return response
+
 
-    # needs to correspond to the frontend
-    other_languages = ["de", "fr", "it", "es", "ru", "ja"]
+def _sitemap_base_url(request):
+    return request.build_absolute_uri("/")
 
-    # Homepage
-    sitemap.add(
-        "/en/",
-        changefreq="monthly",
-        priority=1,
-        alternates={code: urljoin("/", code) for code in other_languages},
+
+def sitemap(request):
+    """Sitemap index pointing to the child sitemaps (see sitemap_service)"""
+    sitemap_file = sitemap_service.get_index(_sitemap_base_url(request))
+    return _serve_sitemap_file(
+        request, sitemap_file, "application/xml", gzip_encoded=True
     )
 
-    # Info pages
-    info_tabs = ["help", "organizers", "contributors", "partners", "imprint"]
-    for tab in info_tabs:
-        url = f"/en/info/{tab}"
-        sitemap.add(
-            url,
-            changefreq="yearly",
-            priority=0.3,
-            alternates={
-                code: f"/{code}/info/{tab}" for code in other_languages
-            },
-        )
 
-    # Eventpages
-    events = models.Event.objects.filter(date_start__gte=datetime.now())
-    for event in events:
-        url = f"/en/event/{event.slug}"
-        sitemap.add(
-            url,
-            changefreq="monthly",
-            priority=0.5,
-            alternates={
-                code: f"/{code}/event/{event.slug}" for code in other_languages
-            },
-            lastmod=event.edited_at,
-        )
+def sitemap_section(request, section):
+    sitemap_file = sitemap_service.get_section(section, _sitemap_base_url(request))
+    return _serve_sitemap_file(request, sitemap_file, "application/x-gzip")
 
-    # Organizer pages
-    organizers = models.Organizer.objects.filter(
-        events__date_start__gte=datetime.now()
-    ).distinct()
-    for organizer in organizers:
-        if organizer.slug:  # Only add if organizer has a slug
-            url = f"/en/organizer/{organizer.slug}"
-            sitemap.add(
-                url,
-                changefreq="monthly",
-                priority=0.7,
-                alternates={
-                    code: f"/{code}/organizer/{organizer.slug}"
-                    for code in other_languages
-                },
-            )
 
-    return sitemap.response(
-        # pretty_print is False by default
-        pretty_print=settings.DEBUG,
+def _parse_param(params, name, parse):
+    if not params.get(name):
+        return None
+    value = parse(params[name])
+    if value is None:
+        raise ValueError(f"Invalid {name}: {params[name]}")
+    return value
+
+
+@require_GET
+def map_markers_view(request):
+    """
+    Packed marker arrays for the map (see app/services/map_markers.py).
+    Takes the filters of locationsFiltered as snake_case query parameters.
+    """
+    params = request.GET
+    try:
+        filters = {
+            "date_from": _parse_param(params, "date_from", parse_date),
+            "date_to": _parse_param(params, "date_to", parse_date),
+            "race_distance_gte": _parse_param(params, "race_distance_gte", float),
+            "race_distance_lte": _parse_param(params, "race_distance_lte", float),
+        }
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    filters.update(
+        keyword=params.get("keyword", ""),
+        organizer_slug=params.get("organizer_slug") or None,
+        organizer_id=params.get("organizer_id") or None,
     )
+    encoding = params.get("encoding", "json")
+    if encoding not in map_markers.ENCODINGS:
+        return JsonResponse({"error": f"Unknown encoding: {encoding}"}, status=400)
+
+    try:
+        etag, content = map_markers.get_markers(encoding, **filters)
+    except ValueError:
+        # A malformed organizer_id
+        return JsonResponse({"error": "Invalid organizer_id"}, status=400)
+
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is None:
+        response = _gzip_response(request, content, "application/json")
+    else:
+        response = not_modified
+    response["ETag"] = etag
+    patch_cache_control(response, public=True, max_age=MAP_MARKERS_MAX_AGE)
+    return response
 
 
 def claim_organizer(request, token):
@@ -51,6 +51,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # "django.contrib.gis",
     "graphql_auth",
     "graphql_jwt.refresh_token.apps.RefreshTokenConfig",
@@ -198,13 +199,37 @@ WHITENOISE_ROOT = STATIC_ROOT
 STATICFILES_DIRS = []
 
 # Cache settings
+# Use a shared backend in production so all gunicorn workers see the same
+# GraphQL cache entries and invalidation counters (app/graphql/cache.py),
+# e.g. CACHE_URL=redis://redis:6379/1 or CACHE_URL=dbcache://graphql_cache
 CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-        "LOCATION": "locations-filtered-cache",
-        "TIMEOUT": 3600,  # 1 hour cache timeout
-    }
+    "default": env.cache_url(
+        "CACHE_URL", default="locmemcache://locations-filtered-cache"
+    ),
 }
+CACHES["default"].setdefault("TIMEOUT", 3600)  # 1 hour cache timeout
+
+# On-disk cache for Firecrawl scrapes (app/services/scrape_cache.py)
+SCRAPE_CACHE_ENABLED = env.bool("SCRAPE_CACHE_ENABLED", True)
+SCRAPE_CACHE_PATH = env.str(
+    "SCRAPE_CACHE_PATH", os.path.join(BASE_DIR, ".cache", "scrape_cache.sqlite3")
+)
+SCRAPE_CACHE_TTL_HOURS = env.float("SCRAPE_CACHE_TTL_HOURS", 24)
+SCRAPE_CACHE_MAX_MB = env.int("SCRAPE_CACHE_MAX_MB", 500)
+
+# Stored LLM extraction results (app/services/extraction_cache.py)
+EXTRACTION_CACHE_ENABLED = env.bool("EXTRACTION_CACHE_ENABLED", True)
+EXTRACTION_CACHE_PATH = env.str(
+    "EXTRACTION_CACHE_PATH",
+    os.path.join(BASE_DIR, ".cache", "extraction_cache.sqlite3"),
+)
+EXTRACTION_CACHE_MAX_AGE_DAYS = env.int("EXTRACTION_CACHE_MAX_AGE_DAYS", 90)
+# "No event found" and target year results may depend on linked pages
+EXTRACTION_CACHE_RECHECK_DAYS = env.int("EXTRACTION_CACHE_RECHECK_DAYS", 3)
+
+# Directory of the pre-rendered sitemap files in the default file storage
+# (app/services/sitemap_service.py)
+SITEMAP_STORAGE_DIR = env.str("SITEMAP_STORAGE_DIR", "sitemaps")
 
 GOOGLE_MAPS_API_KEY = env.str("GOOGLE_MAPS_API_KEY")
 
@@ -253,6 +278,10 @@ FIRECRAWL_API_KEY = env.str("FIRECRAWL_API_KEY", "")
 
 # Google Analytics 4 configuration
 GA_PROPERTY_ID = env.str("GA_PROPERTY_ID", "")
+# Last GA4 page report, so fetch_analytics --from-snapshot can re-run offline
+GA_SNAPSHOT_PATH = env.str(
+    "GA_SNAPSHOT_PATH", os.path.join(BASE_DIR, ".cache", "ga_page_active_users.json")
+)
 
 SENTRY_DSN = env.str("SENTRY_DSN", "")
 if SENTRY_DSN:
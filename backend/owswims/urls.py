@@ -19,7 +19,7 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, re_path
 from django_sitemaps import robots_txt
-from app.views import index, sitemap, claim_organizer
+from app.views import index, sitemap, sitemap_section, claim_organizer, map_markers_view
 from app.organizer_admin import organizer_admin_site
 from graphene_django.views import GraphQLView
 
@@ -33,7 +33,11 @@ urlpatterns = [
         "graphql",
         GraphQLView.as_view(graphiql=settings.DEBUG),
     ),
+    path("api/map-markers", map_markers_view, name="map_markers"),
     re_path(r"^sitemap\.xml$", sitemap),
+    re_path(
+        r"^sitemap-(?P<section>static|events|organizers)\.xml\.gz$", sitemap_section
+    ),
     re_path(r"^robots\.txt$", robots_txt(timeout=86400)),
     re_path(r"^.*/$", index, name="index"),
 ] + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)